@@ -0,0 +1,281 @@
+# analytics.py
+# Estatísticas das sessões gravadas pela telemetria (telemetry.py), por sessão e
+# por perfil: número de sopros, duração dos sopros sustentados, pico em relação à
+# calibração e moedas por fase. As colunas são abertas com memmap e processadas
+# com NumPy vetorizado, um processo por arquivo; o cache guarda o resultado de
+# cada sessão, então rodar de novo só processa as sessões novas.
+# Uso: python analytics.py [--dir telemetry] [--threshold 0.15] [--csv sessoes.csv] [--profiles-csv perfis.csv]
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import settings
+from telemetry import EVENT_FLAGS, META_FILE, load_session
+
+CACHE_FILE = "analytics_cache.json"
+CACHE_VERSION = 1
+
+
+def find_sessions(base_dir):
+    """Pastas de sessão (com meta.json) dentro de base_dir, em ordem"""
+    if not os.path.isdir(base_dir):
+        return []
+    return sorted(os.path.join(base_dir, name) for name in os.listdir(base_dir)
+                  if os.path.isfile(os.path.join(base_dir, name, META_FILE)))
+
+
+def session_signature(path):
+    """Muda quando a sessão muda (meta reescrito ou mais registros gravados)"""
+    meta = os.stat(os.path.join(path, META_FILE))
+    tick_path = os.path.join(path, "tick.bin")
+    size = os.path.getsize(tick_path) if os.path.exists(tick_path) else 0
+    return [meta.st_mtime_ns, size]
+
+
+def breath_runs(active):
+    """(início, fim) de cada trecho contínuo em que active é True (fim exclusivo)"""
+    edges = np.diff(np.concatenate(([0], active.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def session_stats(path, threshold=0.15, min_breath=0.3, sustained=1.0):
+    """Estatísticas de uma sessão (tudo vetorizado sobre as colunas em memmap)"""
+    columns, meta = load_session(path)
+    info = meta.get('metadata', {})
+    hz = info.get('simulation_hz', settings.SIMULATION_HZ)
+    max_breath_rms = float(info.get('max_breath_rms', 1.0))
+    ticks = len(columns['tick'])
+
+    stats = {
+        'session': os.path.basename(path),
+        'profile': info.get('profile', ''),
+        'started_at': info.get('started_at', ''),
+        'max_breath_rms': max_breath_rms,
+        'ticks': ticks,
+        'duration': ticks / hz,
+        'breaths': 0,
+        'breath_mean': 0.0,
+        'breath_max': 0.0,
+        'sustained_breaths': 0,
+        'blowing_fraction': 0.0,
+        'peak_breath': 0.0,
+        'peak_ratio': 0.0,
+        'effort_p95': 0.0,
+        'coins': 0,
+        'coins_per_phase': {},
+        'finished': False,
+    }
+    if not ticks:
+        return stats
+
+    effort = np.asarray(columns['effort'])
+    breath = np.asarray(columns['breath'])
+    events = np.asarray(columns['events'])
+    phase = np.asarray(columns['phase'])
+
+    # Sopros: trechos acima do limiar, ignorando picos mais curtos que min_breath
+    starts, ends = breath_runs(effort > threshold)
+    lengths = (ends - starts) / hz
+    lengths = lengths[lengths >= min_breath]
+    if len(lengths):
+        stats['breaths'] = int(len(lengths))
+        stats['breath_mean'] = float(lengths.mean())
+        stats['breath_max'] = float(lengths.max())
+        stats['sustained_breaths'] = int(np.count_nonzero(lengths >= sustained))
+        stats['blowing_fraction'] = float(lengths.sum() * hz / ticks)
+
+    # Pico do sopro em relação ao máximo da calibração (>1: passou do calibrado)
+    stats['peak_breath'] = float(breath.max())
+    stats['peak_ratio'] = stats['peak_breath'] / max_breath_rms if max_breath_rms > 0 else 0.0
+    stats['effort_p95'] = float(np.percentile(effort, 95))
+
+    # Moedas ganhas em cada passo (a máscara de eventos não conta várias no mesmo passo)
+    gained = np.diff(np.asarray(columns['coins']), prepend=0)
+    per_phase = np.bincount(phase, weights=gained).astype(np.int64)
+    stats['coins'] = int(per_phase.sum())
+    stats['coins_per_phase'] = {str(p): int(n) for p, n in enumerate(per_phase.tolist()) if n}
+    stats['finished'] = bool(np.any(events & EVENT_FLAGS['finish']))
+    return stats
+
+
+def _session_job(args):
+    path, options = args
+    try:
+        return path, session_stats(path, **options)
+    except (OSError, ValueError, KeyError) as e:
+        return path, {'error': str(e)}
+
+
+def _run_jobs(jobs, workers=None):
+    """Uma sessão por tarefa, em paralelo (um processo por núcleo por padrão)"""
+    if workers == 1 or len(jobs) == 1:
+        return [_session_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_session_job, jobs, chunksize=max(1, len(jobs) // 64)))
+
+
+def load_cache(path, options):
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    # Mudou o limiar/versão: todas as sessões precisam ser refeitas
+    if cache.get('version') != CACHE_VERSION or cache.get('options') != options:
+        return {}
+    return cache.get('sessions', {})
+
+
+def save_cache(path, options, sessions):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({'version': CACHE_VERSION, 'options': options, 'sessions': sessions}, f)
+    os.replace(tmp_path, path)
+
+
+def analyze(base_dir, options, workers=None, cache_path=None):
+    """Estatísticas de todas as sessões; devolve (lista, sessões processadas agora)"""
+    cache_path = cache_path or os.path.join(base_dir, CACHE_FILE)
+    cached = load_cache(cache_path, options)
+    sessions = {}
+    pending = []
+    for path in find_sessions(base_dir):
+        name = os.path.basename(path)
+        signature = session_signature(path)
+        entry = cached.get(name)
+        if entry is not None and entry['signature'] == signature:
+            sessions[name] = entry
+        else:
+            pending.append((path, signature))
+
+    if pending:
+        signatures = dict(pending)
+        for path, stats in _run_jobs([(path, options) for path, _ in pending], workers):
+            if 'error' in stats:
+                print(f"Sessão ignorada ({path}): {stats['error']}")
+                continue
+            sessions[os.path.basename(path)] = {'signature': signatures[path], 'stats': stats}
+        save_cache(cache_path, options, sessions)
+    return [sessions[name]['stats'] for name in sorted(sessions)], len(pending)
+
+
+def profile_stats(sessions):
+    """Agrega as sessões por perfil (arrays + bincount, sem laço por sessão)"""
+    if not sessions:
+        return []
+    names, index = np.unique([s['profile'] for s in sessions], return_inverse=True)
+    count = np.bincount(index)
+
+    def total(key):
+        return np.bincount(index, weights=np.array([s[key] for s in sessions], dtype=np.float64))
+
+    def per_profile_max(key):
+        values = np.array([s[key] for s in sessions], dtype=np.float64)
+        result = np.full(len(names), -np.inf)
+        np.maximum.at(result, index, values)
+        return result
+
+    duration = total('duration')
+    breaths = total('breaths')
+    # Média da duração ponderada pelo número de sopros de cada sessão
+    breath_time = np.bincount(index, weights=np.array([s['breath_mean'] * s['breaths'] for s in sessions]))
+    peak_ratio = per_profile_max('peak_ratio')
+    breath_max = per_profile_max('breath_max')
+    sustained_breaths = total('sustained_breaths')
+    coins = total('coins')
+    finished = total('finished')
+    # Tendência: pico relativo da última sessão menos o da primeira, por data de início
+    order = np.argsort([s['started_at'] for s in sessions], kind='stable')
+    ratios = np.array([s['peak_ratio'] for s in sessions])[order]
+    grouped = index[order]
+    first = ratios[np.unique(grouped, return_index=True)[1]]
+    last = ratios[::-1][np.unique(grouped[::-1], return_index=True)[1]]
+
+    coins_per_phase = [{} for _ in names]
+    for s, i in zip(sessions, index.tolist()):
+        for phase, collected in s['coins_per_phase'].items():
+            coins_per_phase[i][phase] = coins_per_phase[i].get(phase, 0) + collected
+
+    return [{
+        'profile': str(names[i]),
+        'sessions': int(count[i]),
+        'duration': float(duration[i]),
+        'breaths': int(breaths[i]),
+        'breaths_per_minute': float(breaths[i] / duration[i] * 60) if duration[i] else 0.0,
+        'breath_mean': float(breath_time[i] / breaths[i]) if breaths[i] else 0.0,
+        'breath_max': float(breath_max[i]),
+        'sustained_breaths': int(sustained_breaths[i]),
+        'peak_ratio': float(peak_ratio[i]),
+        'peak_ratio_trend': float(last[i] - first[i]),
+        'coins': int(coins[i]),
+        'coins_per_phase': dict(sorted(coins_per_phase[i].items())),
+        'finished': int(finished[i]),
+    } for i in range(len(names))]
+
+
+def _format_phases(coins_per_phase):
+    return " ".join(f"F{phase}:{coins}" for phase, coins in coins_per_phase.items()) or "—"
+
+
+def print_profiles(profiles):
+    print(f"{'perfil':<16} {'sessões':>7} {'tempo min':>9} {'sopros':>6} {'/min':>5} {'médio s':>7} "
+          f"{'máx s':>6} {'longos':>6} {'pico':>5} {'tend.':>6} {'moedas':>6}  por fase")
+    for p in profiles:
+        print(f"{p['profile']:<16} {p['sessions']:>7} {p['duration'] / 60:>9.1f} {p['breaths']:>6} "
+              f"{p['breaths_per_minute']:>5.1f} {p['breath_mean']:>7.2f} {p['breath_max']:>6.2f} "
+              f"{p['sustained_breaths']:>6} {p['peak_ratio']:>5.2f} {p['peak_ratio_trend']:>+6.2f} "
+              f"{p['coins']:>6}  {_format_phases(p['coins_per_phase'])}")
+
+
+SESSION_COLUMNS = ['session', 'profile', 'started_at', 'duration', 'breaths', 'breath_mean', 'breath_max',
+                   'sustained_breaths', 'blowing_fraction', 'peak_breath', 'max_breath_rms', 'peak_ratio',
+                   'effort_p95', 'coins', 'coins_per_phase', 'finished']
+PROFILE_COLUMNS = ['profile', 'sessions', 'duration', 'breaths', 'breaths_per_minute', 'breath_mean',
+                   'breath_max', 'sustained_breaths', 'peak_ratio', 'peak_ratio_trend', 'coins',
+                   'coins_per_phase', 'finished']
+
+
+def save_csv(rows, columns, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([json.dumps(row[c]) if isinstance(row[c], dict) else row[c] for c in columns])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estatísticas das sessões gravadas")
+    parser.add_argument('--dir', default=settings.TELEMETRY_DIR, help="Pasta das sessões (TELEMETRY_DIR)")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Esforço normalizado a partir do qual conta como sopro")
+    parser.add_argument('--min-breath', type=float, default=0.3, help="Duração mínima de um sopro (s)")
+    parser.add_argument('--sustained', type=float, default=1.0, help="Duração de um sopro sustentado (s)")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: um por núcleo)")
+    parser.add_argument('--csv', help="Salva as estatísticas por sessão em CSV")
+    parser.add_argument('--profiles-csv', help="Salva as estatísticas por perfil em CSV")
+    args = parser.parse_args()
+
+    options = {'threshold': args.threshold, 'min_breath': args.min_breath, 'sustained': args.sustained}
+    start = time.perf_counter()
+    sessions, processed = analyze(args.dir, options, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(sessions)} sessões ({processed} processadas agora, {len(sessions) - processed} do cache) "
+          f"em {elapsed:.2f} s")
+
+    profiles = profile_stats(sessions)
+    print_profiles(profiles)
+    if args.csv:
+        save_csv(sessions, SESSION_COLUMNS, args.csv)
+        print(f"Sessões salvas em {args.csv}")
+    if args.profiles_csv:
+        save_csv(profiles, PROFILE_COLUMNS, args.profiles_csv)
+        print(f"Perfis salvos em {args.profiles_csv}")
+
+
+if __name__ == '__main__':
+    main()
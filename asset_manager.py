@@ -0,0 +1,141 @@
+# asset_manager.py
+# Imagens carregadas e convertidas uma única vez, com cache das versões
+# redimensionadas. A leitura/decodificação dos arquivos da próxima cena pode
+# ser feita em segundo plano, para a troca de cena não travar o jogo.
+import threading
+
+import pygame
+
+
+class AssetManager:
+    """Cache de superfícies por (caminho, alfa, tamanho).
+
+    A thread de pré-carregamento só lê e redimensiona os arquivos; convert()
+    depende da janela e é feito na thread principal, no primeiro image().
+    As superfícies retornadas são compartilhadas: quem usa não deve desenhar nelas.
+    """
+
+    def __init__(self):
+        self._surfaces = {}  # (caminho, alfa, tamanho) -> superfície convertida
+        self._decoded = {}  # (caminho, tamanho) -> superfície lida em segundo plano, ainda sem convert
+        self._loading = {}  # caminho -> Event, enquanto a thread lê o arquivo
+        self._missing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.preloaded = 0
+
+    def image(self, path, alpha=False, size=None, fallback_color=(255, 255, 255)):
+        """Superfície convertida (e redimensionada para size, se dado).
+
+        Se o arquivo não existir ou não abrir, retorna uma superfície sólida
+        de fallback_color no tamanho pedido (e avisa uma única vez).
+        """
+        size = tuple(size) if size is not None else None
+        key = (path, alpha, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        decoded = self._take_decoded(path, size)
+        if decoded is not None:
+            surface = decoded.convert_alpha() if alpha else decoded.convert()
+        elif size is not None:
+            # O original só fica no cache se alguém pedir o tamanho original
+            base = self._surfaces.get((path, alpha, None)) or self._load(path, alpha, fallback_color)
+            surface = base if base.get_size() == size else pygame.transform.scale(base, size)
+        else:
+            surface = self._load(path, alpha, fallback_color)
+        # Sob o lock: preload() percorre _surfaces na thread de pré-carregamento
+        with self._lock:
+            self._surfaces[key] = surface
+        return surface
+
+    def _load(self, path, alpha, fallback_color):
+        try:
+            surface = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            if path not in self._missing:
+                self._missing.add(path)
+                print(f"Imagem não encontrada ({path}): {e}")
+            surface = pygame.Surface((1, 1))
+            surface.fill(fallback_color)
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _take_decoded(self, path, size):
+        """Resultado do pré-carregamento (espera a thread se o arquivo ainda está sendo lido)"""
+        event = self._loading.get(path)
+        if event is not None:
+            event.wait(2.0)
+        with self._lock:
+            return self._decoded.pop((path, size), None)
+
+    def preload(self, requests):
+        """Lê e redimensiona em segundo plano uma lista de (caminho, tamanho)"""
+        pending = {}
+        with self._lock:
+            for path, size in requests:
+                size = tuple(size) if size is not None else None
+                if path in self._missing or path in self._loading or (path, size) in self._decoded:
+                    continue
+                if any(key[0] == path and key[2] == size for key in self._surfaces):
+                    continue
+                pending.setdefault(path, []).append(size)
+            for path in pending:
+                self._loading[path] = threading.Event()
+        if pending:
+            threading.Thread(target=self._preload_worker, args=(pending,), daemon=True).start()
+
+    def _preload_worker(self, pending):
+        for path, sizes in pending.items():
+            try:
+                surface = pygame.image.load(path)
+                for size in sizes:
+                    if size is not None and surface.get_size() != size:
+                        scaled = pygame.transform.scale(surface, size)
+                    else:
+                        scaled = surface
+                    with self._lock:
+                        self._decoded[(path, size)] = scaled
+                        self.preloaded += 1
+            except (pygame.error, FileNotFoundError):
+                pass  # O image() da cena tenta de novo e usa o fallback
+            finally:
+                with self._lock:
+                    event = self._loading.pop(path, None)
+                if event is not None:
+                    event.set()
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self._decoded.clear()
+
+    def stats(self):
+        with self._lock:
+            surfaces = list(self._surfaces.values()) + list(self._decoded.values())
+        memory = sum(surface.get_bytesize() * surface.get_width() * surface.get_height() for surface in surfaces)
+        return {
+            'entries': len(self._surfaces),
+            'pending': len(self._decoded),
+            'hits': self.hits,
+            'misses': self.misses,
+            'preloaded': self.preloaded,
+            'bytes': memory,
+        }
+
+
+asset_manager = AssetManager()
+
+
+def load_image(path, alpha=False, size=None, fallback_color=(255, 255, 255)):
+    """Imagem do cache global (ver AssetManager.image)"""
+    return asset_manager.image(path, alpha, size, fallback_color)
+
+
+def preload_scene(scene_class):
+    """Pré-carrega os assets declarados pela cena (atributo de classe assets)"""
+    asset_manager.preload([(path, size) for path, _, size in getattr(scene_class, 'assets', ())])
@@ -0,0 +1,77 @@
+# benchmarks/bench_analytics.py
+# Gera sessões de telemetria sintéticas e mede analytics.analyze: primeira
+# passada (todas as sessões), nova passada só com o cache e passada incremental
+# depois de gravar algumas sessões novas.
+# Uso: python -m benchmarks.bench_analytics [--sessions 500] [--minutes 5] [--workers 4]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import analytics
+from input_backends import breath_envelope
+from telemetry import EVENT_FLAGS, TelemetryRecorder
+
+HZ = 60
+
+
+def write_session(base_dir, index, minutes, rng):
+    """Uma sessão com ciclos respiratórios de período e força aleatórios"""
+    profile = f"paciente{index % 50}"
+    path = os.path.join(base_dir, f"{profile}_{index:06d}")
+    ticks = int(minutes * 60 * HZ)
+    t = np.arange(ticks) / HZ
+    effort = breath_envelope(t, rng.uniform(3.0, 6.0), rng.uniform(0.3, 0.6), rng.uniform(0.4, 1.2), 0.15)
+    coins = np.cumsum(rng.random(ticks) < 0.004)
+    phase = np.minimum(1 + coins // 5, 3)
+    recorder = TelemetryRecorder(path, {'profile': profile, 'max_breath_rms': 2.0, 'simulation_hz': HZ,
+                                        'started_at': f"2026-01-01T00:00:{index % 60:02d}"},
+                                 chunk_records=4096)
+    events = np.where(np.diff(coins, prepend=0) > 0, EVENT_FLAGS['coin'], 0)
+    for i, (e, c, p, ev) in enumerate(zip(effort.tolist(), coins.tolist(), phase.tolist(), events.tolist())):
+        recorder.record(i, 0.0, e * 2.0, e, 0.0, i * 1.5, 300.0, 1.5, 0.0, c, p, ev)
+    recorder.close()
+
+
+def timed(base_dir, options, workers):
+    start = time.perf_counter()
+    sessions, processed = analytics.analyze(base_dir, options, workers)
+    return time.perf_counter() - start, len(sessions), processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das estatísticas offline")
+    parser.add_argument('--sessions', type=int, default=500)
+    parser.add_argument('--minutes', type=float, default=5.0, help="Duração de cada sessão")
+    parser.add_argument('--new', type=int, default=10, help="Sessões novas na passada incremental")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    options = {'threshold': 0.15, 'min_breath': 0.3, 'sustained': 1.0}
+    with tempfile.TemporaryDirectory() as base_dir:
+        start = time.perf_counter()
+        for index in range(args.sessions):
+            write_session(base_dir, index, args.minutes, rng)
+        records = int(args.sessions * args.minutes * 60 * HZ)
+        print(f"{args.sessions} sessões, {records} registros gerados em {time.perf_counter() - start:.1f} s")
+
+        for label in ("primeira passada", "só cache"):
+            elapsed, total, processed = timed(base_dir, options, args.workers)
+            print(f"{label:<18} {elapsed * 1000:>8.0f} ms  ({processed}/{total} sessões processadas)")
+
+        for index in range(args.sessions, args.sessions + args.new):
+            write_session(base_dir, index, args.minutes, rng)
+        elapsed, total, processed = timed(base_dir, options, args.workers)
+        print(f"{'incremental':<18} {elapsed * 1000:>8.0f} ms  ({processed}/{total} sessões processadas)")
+
+        sessions, _ = analytics.analyze(base_dir, options, args.workers)
+        start = time.perf_counter()
+        profiles = analytics.profile_stats(sessions)
+        print(f"{'agregação perfis':<18} {(time.perf_counter() - start) * 1000:>8.1f} ms  ({len(profiles)} perfis)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_audio_latency.py
+# Compara os perfis de latência do microfone (settings.AUDIO_LATENCY_PROFILES) com
+# sopros sintéticos: custo do callback frente à duração do bloco e atraso entre o
+# início do sopro e o bloco em que ele é detectado (buffer + média móvel).
+# Com --device abre o microfone real e mostra duração, jitter e estouros do callback.
+# Uso: python -m benchmarks.bench_audio_latency [--seconds 120] [--device [--profile low]]
+import argparse
+import time
+
+import numpy as np
+
+import settings
+from input_backends import SoundDeviceAudioBackend, SyntheticBreathAudioBackend, breath_envelope
+from input_manager import InputManager
+from latency_monitor import STAGE_AUDIO_CALLBACK
+
+
+def simulate(profile, seconds):
+    """Passa blocos sintéticos pelo _audio_callback do InputManager sem esperar o relógio"""
+    backend = SyntheticBreathAudioBackend(profile['samplerate'], profile['blocksize'], speed=0)
+    input_manager = InputManager(audio_backend=backend, video_backend=None,
+                                 mic_downsample=profile['downsample'], mic_smoothing=profile['smoothing'])
+    period = input_manager.mic_block_period
+    block = np.zeros((profile['blocksize'], 1), dtype=np.float32)
+    detected_at = {}
+    for index in range(int(seconds / period)):
+        backend._fill_block(block)
+        input_manager._audio_callback(block, profile['blocksize'], None, None)
+        if input_manager.breath_processor.blowing:
+            # O bloco só chega ao callback quando termina de ser gravado
+            block_end = (index + 1) * period
+            detected_at.setdefault(int(block_end // backend.period), block_end)
+
+    # Início de cada sopro: primeiro instante em que o envelope passa de 10% do pico
+    t = np.arange(0.0, backend.period, 1e-4)
+    onset = t[np.argmax(breath_envelope(t, backend.period, backend.exhale, 1.0) > 0.1)]
+    delays = [(end - cycle * backend.period - onset) * 1000 for cycle, end in detected_at.items()]
+    return input_manager, period, delays
+
+
+def run_device(profile, seconds):
+    """Mede o callback com o microfone real (confirma que não há estouros no hardware da clínica)"""
+    backend = SoundDeviceAudioBackend(settings.MIC_DEVICE_ID, profile['samplerate'], profile['blocksize'],
+                                      profile['latency'])
+    input_manager = InputManager(audio_backend=backend, video_backend=None,
+                                 mic_downsample=profile['downsample'], mic_smoothing=profile['smoothing'])
+    input_manager._start_mic(timeout=3.0)
+    time.sleep(seconds)
+    input_manager.stop()
+    for line in input_manager.latency.format_lines():
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos perfis de latência do microfone")
+    parser.add_argument('--seconds', type=float, default=120.0, help="Áudio simulado (ou gravado) por perfil")
+    parser.add_argument('--device', action='store_true', help="Usa o microfone real em vez de sopros sintéticos")
+    parser.add_argument('--profile', default=None, help="Só este perfil (padrão: todos)")
+    args = parser.parse_args()
+
+    names = [args.profile] if args.profile else list(settings.AUDIO_LATENCY_PROFILES)
+    if args.device:
+        for name in names:
+            print(f"Perfil {name}: gravando {args.seconds:.0f} s do microfone...")
+            run_device(settings.AUDIO_LATENCY_PROFILES[name], args.seconds)
+        return
+
+    print(f"{'perfil':<11} {'taxa':>10} {'bloco':>8} {'callback p50/p99':>17} {'folga':>7} "
+          f"{'detecção p50/máx':>17} {'sopros':>7}")
+    for name in names:
+        profile = settings.AUDIO_LATENCY_PROFILES[name]
+        input_manager, period, delays = simulate(profile, args.seconds)
+        stats = input_manager.latency.report()[STAGE_AUDIO_CALLBACK]
+        rate = f"{profile['samplerate'] // profile['downsample']}/{profile['samplerate']}"
+        detection = f"{np.median(delays):.0f}/{max(delays):.0f} ms" if delays else "-"
+        print(f"{name:<11} {rate:>10} {period * 1000:>5.1f} ms {stats['p50']:>7.3f}/{stats['p99']:.3f} ms "
+              f"{period * 1000 / stats['p99']:>6.0f}x {detection:>17} {len(delays):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_breath.py
+# Mede a vazão do processamento de sopro em blocos sintéticos e quanto o
+# classificador espectral aceita de cada classe de sinal (sopro, voz, ventilador...).
+# Uso: python -m benchmarks.bench_breath [--blocks 5000] [--blocksize 1024]
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+import settings
+from breath_processor import BreathProcessor
+
+
+def breath_noise(rng, blocksize, strength):
+    """Sopro: ruído com filtro passa-baixa (média móvel curta)"""
+    noise = rng.normal(0, 1.0, blocksize + 16)
+    return np.convolve(noise, np.ones(16) / 16, mode='valid')[:blocksize] * strength
+
+
+def fan_hum(t):
+    """Ventilador: tom fixo com harmônicos"""
+    return 0.12 * sum(np.sin(2 * np.pi * 120 * k * t) / k for k in range(1, 6))
+
+
+def clap(rng, t):
+    """Palma: transiente curto no meio de um bloco quase silencioso"""
+    block = np.zeros(t.size)
+    start = min(600, max(0, t.size - 100))
+    block[start:start + 100] = rng.normal(0, 1.5, min(100, t.size))
+    return block
+
+
+# (classe, é sopro, gerador(rng, t)) — o gerador recebe os instantes das amostras do bloco
+SIGNALS = [
+    ("silêncio", False, lambda rng, t: rng.normal(0, 0.01, t.size)),
+    ("sopro", True, lambda rng, t: breath_noise(rng, t.size, 0.8)),
+    ("voz", False, lambda rng, t: sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 12)) * 0.3),
+    ("palmas", False, clap),
+    ("ventilador", False, lambda rng, t: fan_hum(t) + rng.normal(0, 0.005, t.size)),
+    ("sopro+ventilador", True, lambda rng, t: breath_noise(rng, t.size, 0.8) + fan_hum(t)),
+    ("sopro fraco+vent.", True, lambda rng, t: breath_noise(rng, t.size, 0.5) + fan_hum(t)),
+    ("chiado agudo", False, lambda rng, t: rng.normal(0, 0.2, t.size)),
+]
+
+
+def make_blocks(count, blocksize, samplerate, seed=0):
+    """Gera blocos (frames, 1) float32 alternando as classes de SIGNALS; retorna (blocos, classes)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(blocksize) / samplerate
+    blocks = []
+    kinds = []
+    for i in range(count):
+        kind = i % len(SIGNALS)
+        block = SIGNALS[kind][2](rng, t + i * blocksize / samplerate)
+        blocks.append(block.astype(np.float32).reshape(-1, 1))
+        kinds.append(kind)
+    return blocks, kinds
+
+
+def report_classifier(blocks, kinds, samplerate, blocksize):
+    """Aceitação do classificador espectral por classe de sinal (blocos acima do limiar de ruído)"""
+    processor = BreathProcessor(samplerate, blocksize=blocksize, spectral_gate=True)
+    accepted = np.zeros(len(SIGNALS))
+    loud = np.zeros(len(SIGNALS))
+    for block, kind in zip(blocks, kinds):
+        # Cada classe avaliada sozinha: sem herdar a média de planura da classe anterior
+        processor.reset()
+        processor.process(block[:, 0])
+        if processor.rms > processor.noise_threshold:
+            loud[kind] += 1
+            accepted[kind] += processor.is_breath
+    print(f"{'classe':<18} {'blocos':>7} {'aceitos':>8} {'rejeitados':>10}")
+    for (name, is_breath, _), count, ok in zip(SIGNALS, loud, accepted):
+        if not count:
+            print(f"{name:<18} {0:>7} {'-':>8} {'-':>10}  (abaixo do limiar de ruído)")
+            continue
+        rate = ok / count
+        expected = "deveria aceitar" if is_breath else "deveria rejeitar"
+        print(f"{name:<18} {int(count):>7} {rate * 100:>7.1f}% {(1 - rate) * 100:>9.1f}%  ({expected})")
+
+
+class LegacyBreathFilter:
+    """Implementação anterior do _audio_callback, para comparação"""
+
+    def __init__(self):
+        self.noise_threshold = 0.05
+        self.breath_history = []
+        self.history_size = 8
+        self.breath_intensity = 0.0
+
+    def process(self, indata):
+        rms = np.sqrt(np.mean(indata**2))
+        if rms > self.noise_threshold:
+            self.breath_history.append(rms)
+            if len(self.breath_history) > self.history_size:
+                self.breath_history.pop(0)
+            filtered_rms = np.mean(self.breath_history)
+            if filtered_rms > 0.1:
+                self.breath_intensity = float(filtered_rms)
+            else:
+                self.breath_intensity = max(0, self.breath_intensity * 0.8)
+        else:
+            self.breath_intensity = max(0, self.breath_intensity * 0.7)
+            if self.breath_intensity < 0.001:
+                self.breath_history.clear()
+
+
+def run(name, callback, blocks, samplerate, blocksize):
+    # Aquecimento
+    for block in blocks[:50]:
+        callback(block)
+
+    durations = np.empty(len(blocks))
+    start = time.perf_counter()
+    for i, block in enumerate(blocks):
+        t0 = time.perf_counter()
+        callback(block)
+        durations[i] = time.perf_counter() - t0
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for block in blocks[:200]:
+        callback(block)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    budget_ms = blocksize / samplerate * 1000.0
+    per_block_us = durations * 1e6
+    print(f"{name:>12}: {len(blocks) / total:10.0f} blocos/s  "
+          f"média {per_block_us.mean():7.1f} us  p99 {np.percentile(per_block_us, 99):7.1f} us  "
+          f"max {per_block_us.max():7.1f} us  pico alocado {peak / 1024:6.1f} KiB  "
+          f"(orçamento {budget_ms:.1f} ms/bloco)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do processamento de sopro")
+    parser.add_argument('--blocks', type=int, default=5000)
+    parser.add_argument('--blocksize', type=int, default=settings.MIC_BLOCK_SIZE)
+    parser.add_argument('--samplerate', type=int, default=settings.MIC_SAMPLE_RATE)
+    args = parser.parse_args()
+
+    blocks, kinds = make_blocks(args.blocks, args.blocksize, args.samplerate)
+
+    legacy = LegacyBreathFilter()
+    run("legado", legacy.process, blocks, args.samplerate, args.blocksize)
+
+    processor = BreathProcessor(args.samplerate, blocksize=args.blocksize, spectral_gate=False)
+    run("ring", lambda block: processor.process(block[:, 0]), blocks, args.samplerate, args.blocksize)
+
+    spectral = BreathProcessor(args.samplerate, blocksize=args.blocksize, spectral_gate=True)
+    run("ring+fft", lambda block: spectral.process(block[:, 0]), blocks, args.samplerate, args.blocksize)
+
+    print()
+    report_classifier(blocks, kinds, args.samplerate, args.blocksize)
+
+
+if __name__ == '__main__':
+    main()
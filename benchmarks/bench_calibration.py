@@ -0,0 +1,147 @@
+# benchmarks/bench_calibration.py
+# Calibração contínua com o BreathProcessor real: uma sessão sintética em que a
+# sala fica barulhenta (ventilador) e o paciente cansa. Mostra se o limiar de
+# ruído e o p95 do sopro acompanham cada trecho, e o custo de update() por bloco.
+# Falha se o limiar não seguir o ventilador em MAX_REACTION_SECONDS, se pausas
+# forem detectadas como sopro, se sopros se perderem, ou se a CalibrationScene
+# saturar num sopro forte.
+# Uso: python -m benchmarks.bench_calibration [--seconds 60] [--blocksize 1024]
+import argparse
+import time
+
+import numpy as np
+
+import settings
+from breath_calibration import BreathCalibrator, DecayingHistogram
+from breath_processor import BreathProcessor
+from scenes.calibration_scene import CalibrationScene
+
+# (nome, ruído branco RMS, zumbido do ventilador, força do sopro)
+SEGMENTS = [
+    ("sala silenciosa", 0.005, 0.0, 0.8),
+    ("ventilador ligado", 0.005, 0.12, 0.8),
+    ("paciente cansado", 0.005, 0.12, 0.5),
+    ("ventilador desligado", 0.005, 0.0, 0.5),
+]
+
+
+def make_block(rng, t, blocksize, noise, hum, breath):
+    block = rng.normal(0, noise, blocksize)
+    if hum:
+        # Ventilador: tom fixo com harmônicos (não é sopro para o classificador espectral)
+        block += hum * sum(np.sin(2 * np.pi * 120 * k * t) / k for k in range(1, 6))
+    if breath:
+        source = rng.normal(0, 1.0, blocksize + 16)
+        block += np.convolve(source, np.ones(16) / 16, mode='valid')[:blocksize] * breath
+    return block
+
+
+MAX_REACTION_SECONDS = 8.0  # O limiar precisa seguir o ventilador ligando/desligando neste tempo
+MAX_FALSE_RATE = 0.01  # Blocos de pausa marcados como sopro
+MIN_HIT_RATE = 0.95  # Blocos de sopro detectados
+
+
+def reaction_time(thresholds, block_rate):
+    """Segundos até o limiar chegar a 80% da mudança do trecho (None se quase não mudou)"""
+    first, last = thresholds[0], thresholds[-1]
+    if abs(last - first) < 0.2 * first:
+        return None
+    done = np.abs(np.asarray(thresholds) - last) <= 0.2 * abs(last - first)
+    # Primeiro bloco a partir do qual o limiar não sai mais de perto do valor final
+    settled = len(done) - int(np.argmin(done[::-1])) if not done.all() else 0
+    return settled / block_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da calibração contínua do sopro")
+    parser.add_argument('--seconds', type=float, default=60.0, help="Duração de cada trecho")
+    parser.add_argument('--blocksize', type=int, default=settings.MIC_BLOCK_SIZE)
+    parser.add_argument('--samplerate', type=int, default=settings.MIC_SAMPLE_RATE)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    block_rate = args.samplerate / args.blocksize
+    processor = BreathProcessor(args.samplerate, args.blocksize, noise_threshold=settings.NOISE_GATE_RANGE[0])
+    calibrator = BreathCalibrator(block_rate, noise_margin=settings.NOISE_GATE_MARGIN,
+                                  threshold_range=settings.NOISE_GATE_RANGE,
+                                  noise_half_life=settings.NOISE_HALF_LIFE,
+                                  breath_half_life=settings.BREATH_HALF_LIFE,
+                                  noise_quantile=settings.NOISE_QUANTILE)
+    t_block = np.arange(args.blocksize) / args.samplerate
+    blocks = int(args.seconds * block_rate)
+
+    print(f"{'trecho':<22} {'piso':>7} {'limiar':>7} {'reação':>7} {'sopro p50':>9} {'sopro p95':>9} "
+          f"{'detectados':>11} {'falsos':>11}")
+    durations = []
+    failures = []
+    previous_hum = 0.0
+    for name, noise, hum, breath in SEGMENTS:
+        hits = expected = false = pauses = 0
+        thresholds = [calibrator.noise_threshold]
+        for i in range(blocks):
+            # Ciclos de 4 s: 2 s soprando, 2 s de pausa
+            blowing = (i / block_rate) % 4.0 < 2.0
+            t = t_block + i * args.blocksize / args.samplerate
+            block = make_block(rng, t, args.blocksize, noise, hum, breath if blowing else 0.0)
+            processor.process(block)
+            start = time.perf_counter()
+            calibrator.update(processor)
+            durations.append(time.perf_counter() - start)
+            thresholds.append(calibrator.noise_threshold)
+            if blowing:
+                expected += 1
+                hits += processor.blowing
+            else:
+                pauses += 1
+                false += processor.blowing
+        estimate = calibrator.estimate
+        reaction = reaction_time(thresholds, block_rate)
+        print(f"{name:<22} {estimate.noise_floor:>7.3f} {estimate.noise_threshold:>7.3f} "
+              f"{'-' if reaction is None else f'{reaction:.1f} s':>7} "
+              f"{estimate.breath_p50:>9.3f} {estimate.breath_p95:>9.3f} {hits:>5}/{expected:<5} {false:>5}/{pauses:<5}")
+
+        if hum != previous_hum:
+            rose = thresholds[-1] > thresholds[0]
+            if rose != (hum > previous_hum) or reaction is None:
+                failures.append(f"{name}: o limiar não acompanhou o ventilador "
+                                f"({thresholds[0]:.3f} -> {thresholds[-1]:.3f})")
+            elif reaction > MAX_REACTION_SECONDS:
+                failures.append(f"{name}: o limiar levou {reaction:.1f} s para acompanhar o ventilador")
+        previous_hum = hum
+        if false > MAX_FALSE_RATE * pauses:
+            failures.append(f"{name}: {false} blocos de pausa detectados como sopro")
+        if hits < MIN_HIT_RATE * expected:
+            failures.append(f"{name}: só {hits}/{expected} blocos de sopro detectados")
+
+    us = np.array(durations) * 1e6
+    print(f"update(): mediana {np.median(us):.2f} us, p99 {np.percentile(us, 99):.2f} us, máx {us.max():.1f} us "
+          f"(publicação a cada {calibrator.publish_every} blocos)")
+    failures += check_calibration_scene(rng, args, t_block, block_rate)
+    if failures:
+        raise SystemExit("ERRO:\n  " + "\n  ".join(failures))
+
+
+def check_calibration_scene(rng, args, t_block, block_rate, multiplier=50.0):
+    """Sopros fortes na calibração inicial: o máximo salvo precisa passar de 10 e crescer com o sopro.
+
+    Retorna a lista de falhas (vazia se passou).
+    """
+    peaks = []
+    for breath in (1.0, 1.5, 2.5):
+        processor = BreathProcessor(args.samplerate, args.blocksize, noise_threshold=settings.NOISE_GATE_RANGE[0])
+        levels = DecayingHistogram()
+        # Mesma duração da escuta da cena (4 s), soprando o tempo todo
+        for i in range(int(4 * block_rate)):
+            t = t_block + i * args.blocksize / args.samplerate
+            processor.process(make_block(rng, t, args.blocksize, 0.005, 0.0, breath))
+            if processor.breath_intensity > 0:
+                levels.add(processor.breath_intensity)
+        peaks.append(CalibrationScene.peak_breath(levels, multiplier))
+    print("calibração inicial (sopro forte): máximo " + ", ".join(f"{peak:.1f}" for peak in peaks))
+    if not (peaks[0] > 10.0 and peaks[0] < peaks[1] < peaks[2]):
+        return ["calibração inicial: o máximo saturou"]
+    return []
+
+
+if __name__ == '__main__':
+    main()
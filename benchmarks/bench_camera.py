@@ -0,0 +1,140 @@
+# benchmarks/bench_camera.py
+# Idade do frame processado quando a detecção é mais lenta que a câmera. Um driver
+# simulado enfileira frames como o V4L2 (fila cheia = frames novos perdidos); a
+# leitura direta processa os frames velhos da fila, a thread de captura do
+# OpenCVVideoBackend entrega sempre o mais novo.
+# Com --device mede a câmera real com as configurações de settings.py.
+# Uso: python -m benchmarks.bench_camera [--seconds 5] [--process-ms 45] [--device]
+import argparse
+import collections
+import threading
+import time
+
+import numpy as np
+
+import settings
+from input_backends import OpenCVVideoBackend
+
+
+class QueuedCamera:
+    """Imita cv2.VideoCapture de uma câmera: frames a cada 1/fps numa fila de queue frames.
+
+    Cada frame é um array (1, 1, 1) com o perf_counter em que a câmera o gerou.
+    """
+
+    def __init__(self, fps=30.0, queue=4):
+        self.period = 1.0 / fps
+        self.queue = collections.deque()
+        self.max_queue = queue
+        self.lost = 0
+        self._ready = threading.Condition()
+        self._opened = True
+        threading.Thread(target=self._produce, daemon=True).start()
+
+    def _produce(self):
+        next_frame = time.perf_counter()
+        while self._opened:
+            next_frame += self.period
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+            with self._ready:
+                if len(self.queue) < self.max_queue:
+                    self.queue.append(np.full((1, 1, 1), time.perf_counter()))
+                else:
+                    self.lost += 1
+                self._ready.notify()
+
+    def isOpened(self):
+        return self._opened
+
+    def read(self, image=None):
+        with self._ready:
+            if not self._ready.wait_for(lambda: self.queue or not self._opened, timeout=1.0) or not self.queue:
+                return False, None
+            return True, self.queue.popleft()
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        self._opened = False
+
+
+class SimulatedCameraBackend(OpenCVVideoBackend):
+    def __init__(self, camera):
+        super().__init__(0)
+        self.camera = camera
+
+    def _open_capture(self, cv2):
+        return self.camera
+
+
+def measure(read, seconds, process_seconds):
+    """Lê e "processa" frames por seconds; retorna idades (ms) no início do processamento"""
+    ages = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        ret, frame = read()
+        if not ret:
+            continue
+        ages.append((time.perf_counter() - float(frame[0, 0, 0])) * 1000)
+        time.sleep(process_seconds)
+    return np.array(ages)
+
+
+def run_device(seconds):
+    from motion_detector import create_motion_engine
+    backend = OpenCVVideoBackend(settings.CAM_DEVICE_ID, width=settings.CAM_FRAME_WIDTH,
+                                 height=settings.CAM_FRAME_HEIGHT, fps=settings.CAM_FPS,
+                                 fourcc=settings.CAM_FOURCC, buffer_size=settings.CAM_BUFFER_SIZE)
+    if not backend.open():
+        print("Não foi possível abrir a câmera")
+        return
+    detector = create_motion_engine(settings.MOTION_ENGINE, settings.MOTION_PROCESSING_WIDTH)
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        ret, frame = backend.read()
+        if ret:
+            detector.process(frame)
+    stats = backend.stats.summary()
+    backend.release()
+    print(f"{stats['fps']:.1f} fps, {stats['dropped']}/{stats['captured']} frames descartados, "
+          f"idade média {stats['age'] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da captura da câmera com detecção lenta")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--fps', type=float, default=30.0, help="fps da câmera simulada")
+    parser.add_argument('--queue', type=int, default=4, help="Frames na fila do driver simulado")
+    parser.add_argument('--process-ms', type=float, default=45.0, help="Duração simulada da detecção por frame")
+    parser.add_argument('--device', action='store_true', help="Mede a câmera real (settings.py)")
+    args = parser.parse_args()
+
+    if args.device:
+        run_device(args.seconds)
+        return
+
+    process_seconds = args.process_ms / 1000.0
+    print(f"Câmera simulada a {args.fps:.0f} fps, fila de {args.queue} frames, detecção de {args.process_ms:.0f} ms")
+    print(f"{'leitura':<20} {'idade p50':>10} {'idade p95':>10} {'processados/s':>14}")
+
+    camera = QueuedCamera(args.fps, args.queue)
+    ages = measure(camera.read, args.seconds, process_seconds)
+    camera.release()
+    print(f"{'direta (fila)':<20} {np.median(ages):>7.1f} ms {np.percentile(ages, 95):>7.1f} ms "
+          f"{len(ages) / args.seconds:>14.1f}")
+
+    backend = SimulatedCameraBackend(QueuedCamera(args.fps, args.queue))
+    backend.open()
+    ages = measure(backend.read, args.seconds, process_seconds)
+    stats = backend.stats.summary()
+    backend.release()
+    print(f"{'thread de captura':<20} {np.median(ages):>7.1f} ms {np.percentile(ages, 95):>7.1f} ms "
+          f"{len(ages) / args.seconds:>14.1f}  ({stats['dropped']} descartados, câmera a {stats['fps']:.1f} fps)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_input.py
+# Roda o InputManager completo (threads de microfone e câmera) com fontes sintéticas
+# ou gravadas, sem hardware, e mede a vazão de cada caminho de entrada.
+# Uso: python -m benchmarks.bench_input [--seconds 5] [--audio synthetic] [--video synthetic] [--speed 0]
+import argparse
+import time
+
+import settings
+from input_backends import VideoBackend, create_audio_backend, create_video_backend
+from input_manager import InputManager
+
+
+class CountingVideoBackend(VideoBackend):
+    """Envolve um VideoBackend contando os frames entregues"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.frames = 0
+
+    def open(self):
+        return self.backend.open()
+
+    def is_opened(self):
+        return self.backend.is_opened()
+
+    def read(self):
+        ret, frame = self.backend.read()
+        if ret:
+            self.frames += 1
+        return ret, frame
+
+    def release(self):
+        self.backend.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do caminho de entrada sem hardware")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--audio', default='synthetic', help="'synthetic' ou caminho .wav/.npy")
+    parser.add_argument('--video', default='synthetic', help="'synthetic', 'none' ou caminho .npy/vídeo")
+    parser.add_argument('--speed', type=float, default=0.0, help="1 = tempo real, 0 = o mais rápido possível")
+    args = parser.parse_args()
+
+    audio_backend = create_audio_backend(args.audio, samplerate=settings.MIC_SAMPLE_RATE,
+                                         blocksize=settings.MIC_BLOCK_SIZE, speed=args.speed)
+    video_backend = CountingVideoBackend(create_video_backend(args.video, speed=args.speed))
+    input_manager = InputManager(audio_backend=audio_backend, video_backend=video_backend)
+
+    blocks = [0]
+    max_breath = [0.0]
+    callback = input_manager._audio_callback
+
+    def counting_callback(indata, frames, time_info, status):
+        callback(indata, frames, time_info, status)
+        blocks[0] += 1
+        max_breath[0] = max(max_breath[0], input_manager.get_breath_intensity())
+
+    input_manager._audio_callback = counting_callback
+
+    start = time.perf_counter()
+    input_manager.start()
+    time.sleep(args.seconds)
+    input_manager.stop()
+    elapsed = time.perf_counter() - start
+
+    audio_seconds = blocks[0] * audio_backend.blocksize / audio_backend.samplerate
+    print(f"Áudio: {blocks[0]} blocos ({blocks[0] / elapsed:.0f}/s, {audio_seconds / elapsed:.1f}x tempo real), "
+          f"sopro máximo {max_breath[0]:.1f}")
+    print(f"Câmera: {video_backend.frames} frames ({video_backend.frames / elapsed:.1f} fps), "
+          f"última intensidade de movimento {input_manager.get_motion_intensity():.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_motion.py
+# Compara os motores de detecção de movimento: custo por frame e concordância.
+# Com o clipe sintético a referência é o gabarito do gerador; com clipes gravados,
+# o motor 'diff' em resolução cheia (o comportamento original do jogo).
+# Uso: python -m benchmarks.bench_motion [--clip synthetic|arquivo.npy|video.mp4] [--frames 300]
+#                                        [--widths full,320,160] [--threshold 30]
+import argparse
+import time
+
+import numpy as np
+
+from input_backends import SyntheticVideoBackend, create_video_backend
+from motion_detector import MOTION_ENGINES, create_motion_engine
+
+
+def load_clip(spec, frames):
+    """Decodifica o clipe antes de medir, para o custo de captura não entrar na conta"""
+    if spec == 'synthetic':
+        backend = SyntheticVideoBackend(speed=0)
+    else:
+        backend = create_video_backend(spec, speed=0)
+    if not backend.open():
+        raise SystemExit(f"Não foi possível abrir o clipe: {spec}")
+
+    clip = []
+    truth = []
+    while len(clip) < frames:
+        ret, frame = backend.read()
+        if not ret:
+            break
+        clip.append(frame)
+        truth.append(getattr(backend, 'motion_ground_truth', None))
+    backend.release()
+    if spec != 'synthetic':
+        truth = None
+    return clip, truth
+
+
+def run_engine(engine, clip):
+    intensities = np.zeros(len(clip))
+    durations = np.zeros(len(clip))
+    for i, frame in enumerate(clip):
+        start = time.perf_counter()
+        intensity = engine.process(frame)
+        durations[i] = time.perf_counter() - start
+        intensities[i] = intensity or 0.0
+    return intensities, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de detecção de movimento")
+    parser.add_argument('--clip', default='synthetic')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--widths', default='full,320,160',
+                        help="Larguras de processamento separadas por vírgula ('full' = original)")
+    parser.add_argument('--engines', default=','.join(MOTION_ENGINES))
+    parser.add_argument('--threshold', type=float, default=30.0, help="Limiar de movimento (como no jogo)")
+    args = parser.parse_args()
+
+    clip, truth = load_clip(args.clip, args.frames)
+    height, width = clip[0].shape[:2]
+    print(f"Clipe: {args.clip} ({len(clip)} frames {width}x{height})")
+
+    # Primeiro frame de cada motor não tem referência: fica fora da comparação
+    if truth is not None:
+        reference = np.array(truth[1:], dtype=bool)
+        reference_name = "gabarito"
+    else:
+        intensities, _ = run_engine(create_motion_engine('diff'), clip)
+        reference = intensities[1:] > args.threshold
+        reference_name = "diff/full"
+
+    print(f"{'motor':>8} {'largura':>8} {'ms/frame':>9} {'p95 ms':>8} {'concordância':>13} {'detecções':>10}")
+    for name in args.engines.split(','):
+        for width_spec in args.widths.split(','):
+            # 0 = resolução original (None usaria o padrão do motor)
+            processing_width = 0 if width_spec == 'full' else int(width_spec)
+            engine = create_motion_engine(name, processing_width)
+            intensities, durations = run_engine(engine, clip)
+            detected = intensities[1:] > args.threshold
+            agreement = np.mean(detected == reference) * 100.0
+            ms = durations[1:] * 1000.0
+            print(f"{name:>8} {width_spec:>8} {ms.mean():9.2f} {np.percentile(ms, 95):8.2f} "
+                  f"{agreement:12.1f}% {int(detected.sum()):10d}")
+    print(f"Concordância medida contra: {reference_name} ({int(reference.sum())} frames com movimento)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_pickups.py
+# Custo por frame de colisão + recorte de visibilidade das moedas em função do
+# total de moedas na fase: lista de dicts (versão original) x PickupField.
+# Uso: python -m benchmarks.bench_pickups [--counts 100,1000,10000,50000] [--frames 600]
+import argparse
+import time
+
+import numpy as np
+import pygame
+
+from pickup_field import PickupField
+
+SCREEN_WIDTH = 1280
+COIN_STEP = 60
+BOAT_WIDTH, BOAT_HEIGHT = 100, 80
+
+
+def make_coins(count, seed=0):
+    rng = np.random.default_rng(seed)
+    xs = 150.0 + np.arange(count) * COIN_STEP
+    ys = 520.0 + np.sin((xs - 150.0) * 0.01) * 80 + rng.integers(-40, 41, count)
+    return xs, ys
+
+
+def boat_path(frames, count):
+    """Barco percorrendo a fase inteira, sempre na altura das moedas"""
+    xs = np.linspace(100.0, 150.0 + count * COIN_STEP, frames)
+    ys = 520.0 + np.sin((xs - 100.0) * 0.01) * 80 - BOAT_HEIGHT / 2
+    return xs.tolist(), ys.tolist()
+
+
+def run_legacy(xs, ys, path):
+    coins = [{'x': x, 'y': y, 'collected': False, 'radius': 15} for x, y in zip(xs.tolist(), ys.tolist())]
+    durations = []
+    collected = 0
+    for boat_x, boat_y in zip(*path):
+        start = time.perf_counter()
+        boat_rect = pygame.Rect(boat_x, boat_y, BOAT_WIDTH, BOAT_HEIGHT)
+        for coin in coins:
+            if not coin['collected']:
+                coin_rect = pygame.Rect(coin['x'] - coin['radius'], coin['y'] - coin['radius'],
+                                        coin['radius'] * 2, coin['radius'] * 2)
+                if boat_rect.colliderect(coin_rect):
+                    coin['collected'] = True
+                    collected += 1
+        # O draw original percorria todas as moedas; aqui só conta as que estão na tela
+        view_left = boat_x - 100
+        visible = 0
+        for coin in coins:
+            if not coin['collected'] and view_left - 15 <= coin['x'] <= view_left + SCREEN_WIDTH + 15:
+                visible += 1
+        durations.append(time.perf_counter() - start)
+    return np.array(durations), collected
+
+
+def run_field(xs, ys, path):
+    field = PickupField(xs, ys, 15)
+    durations = []
+    for boat_x, boat_y in zip(*path):
+        start = time.perf_counter()
+        field.collide_rect(boat_x, boat_y, BOAT_WIDTH, BOAT_HEIGHT)
+        view_left = boat_x - 100
+        field.visible(view_left, view_left + SCREEN_WIDTH)
+        durations.append(time.perf_counter() - start)
+    return np.array(durations), field.collected_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da colisão/recorte de moedas")
+    parser.add_argument('--counts', default='100,1000,10000,50000')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help="Maior total medido na versão original (é lenta)")
+    args = parser.parse_args()
+
+    print(f"{'moedas':>8} {'versão':>12} {'us/frame':>9} {'p95 us':>8} {'coletadas':>10}")
+    for count in (int(c) for c in args.counts.split(',')):
+        xs, ys = make_coins(count)
+        path = boat_path(args.frames, count)
+        runs = [('PickupField', run_field)]
+        if count <= args.legacy_max:
+            runs.insert(0, ('lista', run_legacy))
+        for name, run in runs:
+            durations, collected = run(xs, ys, path)
+            us = durations * 1e6
+            print(f"{count:>8} {name:>12} {us.mean():>9.1f} {np.percentile(us, 95):>8.1f} {collected:>10}")
+
+
+if __name__ == '__main__':
+    main()
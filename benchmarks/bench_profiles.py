@@ -0,0 +1,86 @@
+# benchmarks/bench_profiles.py
+# Custo de salvar/carregar perfis visto pela thread do jogo, com centenas de
+# pacientes: um arquivo JSON por perfil (versão original) x ProfileStore (SQLite).
+# Uso: python -m benchmarks.bench_profiles [--profiles 500] [--saves 2000]
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from profile_manager import Profile
+from profile_store import ProfileStore
+
+
+def profile_data(name, rng):
+    profile = Profile(name)
+    profile.is_calibrated = True
+    profile.calibration_data['max_breath_rms'] = rng.uniform(0.2, 3.0)
+    profile.progress['achievements'] = [f"conquista{i}" for i in range(rng.randint(0, 20))]
+    return profile.to_dict()
+
+
+def legacy_save(directory, name, data):
+    with open(os.path.join(directory, f"profile_{name}.json"), "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def legacy_load(directory, name):
+    with open(os.path.join(directory, f"profile_{name}.json"), "r") as f:
+        return json.load(f)
+
+
+def measure(call, args_list):
+    durations = []
+    for args in args_list:
+        start = time.perf_counter()
+        call(*args)
+        durations.append(time.perf_counter() - start)
+    return np.array(durations) * 1e6
+
+
+def report(name, operation, us):
+    print(f"{name:>12} {operation:>8} {np.median(us):>9.1f} {np.percentile(us, 99):>9.1f} {us.max():>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do armazenamento de perfis")
+    parser.add_argument('--profiles', type=int, default=500)
+    parser.add_argument('--saves', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [f"paciente{i}" for i in range(args.profiles)]
+    data = {name: profile_data(name, rng) for name in names}
+    saves = [rng.choice(names) for _ in range(args.saves)]
+    loads = [rng.choice(names) for _ in range(args.saves)]
+
+    print(f"{args.profiles} perfis, {args.saves} operações (us)")
+    print(f"{'formato':>12} {'operação':>8} {'mediana':>9} {'p99':>9} {'máx':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        # Os dois formatos começam com todos os perfis já gravados
+        for name in names:
+            legacy_save(directory, name, data[name])
+        report('JSON', 'save', measure(legacy_save, [(directory, name, data[name]) for name in saves]))
+        report('JSON', 'load', measure(legacy_load, [(directory, name) for name in loads]))
+
+        store = ProfileStore(os.path.join(directory, "profiles.db"))
+        for name in names:
+            store.save(name, data[name])
+        store.flush(30.0)
+        store.writes = 0
+        store.write_time = 0.0
+        report('SQLite', 'save', measure(store.save, [(name, data[name]) for name in saves]))
+        start = time.perf_counter()
+        store.flush(30.0)
+        print(f"{'':>12} fila gravada em {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"({store.writes} linhas, {store.write_time * 1000:.1f} ms na thread de escrita)")
+        report('SQLite', 'load', measure(store.load, [(name,) for name in loads]))
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
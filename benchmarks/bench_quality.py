@@ -0,0 +1,78 @@
+# benchmarks/bench_quality.py
+# Roda o QualityGovernor sobre uma sessão simulada: o custo de cada frame é a soma
+# das partes ligadas no nível atual, com ruído, e no meio da sessão aparece uma
+# carga extra (outro programa, câmera mais pesada). Compara fps e frames atrasados
+# com e sem o governador e mostra cada mudança de nível.
+# Uso: python -m benchmarks.bench_quality [--seconds 120] [--load-ms 9]
+import argparse
+
+import numpy as np
+
+import settings
+from quality_governor import QualityGovernor, build_levels
+
+# Custo (ms por frame) de cada parte na qualidade máxima
+BASE_MS = 3.0  # Física, entradas, HUD e apresentação
+MOTION_MS = 4.0  # Detecção de movimento disputando o GIL (metade com largura/ritmo reduzidos)
+PREVIEW_MS = 1.5  # Conversão e desenho da prévia da câmera
+EFFECTS_MS = 1.5  # Nuvens, guia do caminho, contorno das moedas
+
+
+def frame_cost(level, rng):
+    cost = BASE_MS + PREVIEW_MS * level.camera_preview + EFFECTS_MS * level.effects
+    cost += MOTION_MS / level.motion_stride * (0.5 if level.motion_width else 1.0)
+    return cost * rng.lognormal(0.0, 0.15)
+
+
+def simulate(seconds, load_ms, load_window, use_governor, seed=0):
+    """Retorna (fps médio, fração de frames atrasados, segundos por nível)"""
+    rng = np.random.default_rng(seed)
+    levels = build_levels(settings.QUALITY_MOTION_WIDTH, settings.QUALITY_MOTION_STRIDE,
+                          settings.QUALITY_RENDER_DIVISOR)
+    governor = QualityGovernor(settings.FPS, levels, window=settings.QUALITY_WINDOW_FRAMES,
+                               downgrade_at=settings.QUALITY_DOWNGRADE_AT, upgrade_at=settings.QUALITY_UPGRADE_AT,
+                               recover_seconds=settings.QUALITY_RECOVER_SECONDS) if use_governor else None
+    level = levels[0]
+    now = 0.0
+    frames = 0
+    late = 0
+    while now < seconds:
+        work = frame_cost(level, rng)
+        if load_window[0] <= now < load_window[1]:
+            work += load_ms * rng.lognormal(0.0, 0.3)
+        work /= 1000.0
+        period = level.render_divisor / settings.FPS
+        late += work > period
+        frames += 1
+        now += max(work, period)
+        if governor is not None:
+            changed = governor.record(work, now)
+            if changed is not None:
+                level = changed
+    times = governor.time_at_levels(now) if governor is not None else [now] + [0.0] * (len(levels) - 1)
+    return frames / now, late / frames, levels, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do governador de qualidade")
+    parser.add_argument('--seconds', type=float, default=120.0)
+    parser.add_argument('--load-ms', type=float, default=9.0, help="Carga extra por frame no meio da sessão")
+    parser.add_argument('--load-start', type=float, default=30.0)
+    parser.add_argument('--load-end', type=float, default=80.0)
+    args = parser.parse_args()
+
+    window = (args.load_start, args.load_end)
+    print(f"Carga extra de {args.load_ms:.0f} ms/frame entre {window[0]:.0f} s e {window[1]:.0f} s "
+          f"(orçamento {1000 / settings.FPS:.1f} ms)")
+    results = []
+    for use_governor in (False, True):
+        fps, late, levels, times = simulate(args.seconds, args.load_ms, window, use_governor)
+        results.append((use_governor, fps, late, levels, times))
+    for use_governor, fps, late, levels, times in results:
+        spent = ", ".join(f"{level.name} {seconds:.0f} s" for level, seconds in zip(levels, times) if seconds >= 0.5)
+        print(f"{'com governador' if use_governor else 'sem governador':<15} {fps:5.1f} fps médios, "
+              f"{late * 100:4.1f}% frames atrasados  ({spent})")
+
+
+if __name__ == '__main__':
+    main()
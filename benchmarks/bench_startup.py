@@ -0,0 +1,100 @@
+# benchmarks/bench_startup.py
+# Tempo de inicialização do jogo, fase por fase, em processos novos (imports frios):
+# imports, janela, construção do Game, primeiro frame na tela e cada etapa da
+# inicialização em segundo plano (OpenCV, microfone, câmera).
+# Uso: python -m benchmarks.bench_startup [--runs 5] [--audio synthetic] [--video synthetic]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def child():
+    """Uma inicialização completa; imprime os tempos (s desde o início) em JSON"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    timings = {}
+    start = time.perf_counter()
+
+    def mark(label):
+        timings[label] = time.perf_counter() - start
+
+    import pygame
+    mark("import pygame")
+    import settings
+    import text_cache  # noqa: F401
+    import asset_manager  # noqa: F401
+    mark("import settings/cache")
+    import input_manager  # noqa: F401
+    mark("import input_manager")
+    import scene_manager  # noqa: F401
+    mark("import scene_manager")
+    import main
+    mark("import main")
+    game = main.Game()
+    mark("Game() (janela + cena inicial)")
+    # O OpenCV só pode chegar pela thread de inicialização, depois da janela
+    cv2_loaded = 'cv2' in sys.modules
+
+    game.initializer.start()
+    game.input_manager.poll()
+    game.scene_manager.update(0.0)
+    game.screen.fill(settings.BLACK)
+    game.scene_manager.draw(game.screen)
+    game._draw_startup_progress()
+    pygame.display.flip()
+    mark("primeiro frame")
+
+    game.initializer.wait(30.0)
+    mark("dispositivos prontos")
+    game.input_manager.stop()
+
+    print(json.dumps({
+        'timings': timings,
+        'steps': game.initializer.timings,
+        'errors': {label: str(e) for label, e in game.initializer.errors.items()},
+        'cv2_before_window': cv2_loaded,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--audio', default='synthetic', help="Backend de áudio (AETHERIA_AUDIO_BACKEND)")
+    parser.add_argument('--video', default='synthetic', help="Backend de vídeo (AETHERIA_VIDEO_BACKEND)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    env = dict(os.environ, AETHERIA_AUDIO_BACKEND=args.audio, AETHERIA_VIDEO_BACKEND=args.video,
+               PYGAME_HIDE_SUPPORT_PROMPT='1')
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--child'],
+                                env=env, capture_output=True, text=True, check=True).stdout
+        # O jogo imprime mensagens próprias; o resultado é a última linha
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'fase':<36} {'mediana ms':>10} {'mín ms':>8} {'máx ms':>8}")
+    for section in ('timings', 'steps'):
+        if section == 'steps':
+            print("-- etapas em segundo plano (duração) --")
+        for label in runs[0][section]:
+            values = np.array([run[section][label] for run in runs]) * 1000
+            print(f"{label:<36} {np.median(values):>10.1f} {values.min():>8.1f} {values.max():>8.1f}")
+    errors = {label for run in runs for label in run['errors']}
+    if errors:
+        print(f"Etapas com falha: {', '.join(sorted(errors))}")
+    if any(run['cv2_before_window'] for run in runs):
+        print("Aviso: OpenCV foi importado antes da janela aparecer")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_telemetry.py
+# Custo de TelemetryRecorder.record na thread do jogo (por chamada, incluindo as
+# trocas de buffer) e vazão da thread de escrita; confere a sessão relida por memmap.
+# Uso: python -m benchmarks.bench_telemetry [--records 200000] [--chunk 1024] [--rate 0]
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from telemetry import TelemetryRecorder, load_session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do gravador de telemetria")
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--chunk', type=int, default=1024)
+    parser.add_argument('--buffers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help="Registros por segundo (0 = o mais rápido possível, estressa o pool)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    breath = rng.random(args.records).astype(np.float32).tolist()
+    interval = 1.0 / args.rate if args.rate else 0.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = TelemetryRecorder(directory, {'bench': True}, chunk_records=args.chunk, buffers=args.buffers)
+        durations = np.empty(args.records)
+        start = time.perf_counter()
+        for i, value in enumerate(breath):
+            if interval:
+                while time.perf_counter() - start < i * interval:
+                    pass
+            t0 = time.perf_counter()
+            recorder.record(i, t0, value, value * 2, 0.0, i * 1.5, 300.0, 1.5, -0.5, i // 100, 1, i % 7 == 0)
+            durations[i] = time.perf_counter() - t0
+        elapsed = time.perf_counter() - start
+        close_start = time.perf_counter()
+        recorder.close()
+        close_time = time.perf_counter() - close_start
+
+        us = durations * 1e6
+        stats = recorder.stats()
+        print(f"{args.records} registros, blocos de {args.chunk}, {args.buffers} buffers")
+        print(f"record(): mediana {np.median(us):.2f} us, p99 {np.percentile(us, 99):.2f} us, "
+              f"p99.9 {np.percentile(us, 99.9):.2f} us, máx {us.max():.1f} us")
+        print(f"{args.records / elapsed:.0f} registros/s na thread do jogo; "
+              f"escrita: {stats['chunks']} blocos em {stats['write_time'] * 1000:.1f} ms, close() {close_time * 1000:.1f} ms")
+        print(f"gravados {stats['written']}, descartados {stats['dropped']}")
+
+        columns, meta = load_session(directory)
+        written = np.asarray(columns['breath'])
+        kept = np.asarray(columns['tick'])
+        ok = np.array_equal(written, np.asarray(breath, dtype=np.float32)[kept])
+        print(f"releitura por memmap: {len(kept)} registros, {'confere' if ok else 'DIVERGE'} "
+              f"(meta: {meta['records']} registros)")
+
+
+if __name__ == '__main__':
+    main()
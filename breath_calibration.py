@@ -0,0 +1,203 @@
+# breath_calibration.py
+# Calibração contínua do sopro, na thread de áudio: estima o piso de ruído da sala
+# e os percentis da força do sopro com memória fixa, para o limiar de ruído e a
+# normalização do esforço acompanharem o ambiente e o paciente durante a sessão.
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+class DecayingHistogram:
+    """Quantis aproximados de um fluxo de valores positivos, com esquecimento exponencial.
+
+    As faixas são logarítmicas e fixas entre low e high. Em vez de multiplicar
+    todas as faixas pelo decaimento a cada passo, o peso das próximas amostras
+    cresce na razão inversa e tudo é renormalizado de vez em quando: add() e
+    tick() são O(1) e a memória não cresce. O tempo anda em tick(), não em add():
+    half_life é em ticks (None = sem esquecer), então quem chama tick() a cada
+    bloco de áudio esquece pelo relógio, mesmo que só alguns blocos entrem.
+    """
+
+    def __init__(self, low=1e-4, high=10.0, bins=96, half_life=None):
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self._log_low = math.log(low)
+        self._scale = bins / (math.log(high) - self._log_low)
+        self._growth = 2.0 ** (1.0 / half_life) if half_life else 1.0
+        self.counts = np.zeros(bins, dtype=np.float64)
+        self._weight = 1.0
+        self._total = 0.0
+        self.samples = 0
+
+    def add(self, value):
+        if value <= self.low:
+            index = 0
+        elif value >= self.high:
+            index = self.bins - 1
+        else:
+            index = int((math.log(value) - self._log_low) * self._scale)
+        self.counts[index] += self._weight
+        self._total += self._weight
+        self.samples += 1
+
+    def tick(self):
+        """Avança um passo de tempo: o que já foi adicionado passa a pesar menos"""
+        self._weight *= self._growth
+        if self._weight > 1e100:
+            self._renormalize()
+
+    def _renormalize(self):
+        self.counts /= self._weight
+        self._total /= self._weight
+        self._weight = 1.0
+
+    @property
+    def count(self):
+        """Número efetivo de amostras lembradas (as antigas pesam menos)"""
+        return self._total / self._weight
+
+    def quantile(self, q):
+        """Valor abaixo do qual fica a fração q das amostras (None se vazio)"""
+        if self._total <= 0.0:
+            return None
+        cumulative = np.cumsum(self.counts)
+        target = q * self._total
+        index = min(int(np.searchsorted(cumulative, target)), self.bins - 1)
+        previous = cumulative[index - 1] if index else 0.0
+        fraction = (target - previous) / self.counts[index] if self.counts[index] > 0 else 0.5
+        # Interpola dentro da faixa em escala log
+        return math.exp(self._log_low + (index + min(max(fraction, 0.0), 1.0)) / self._scale)
+
+    def clear(self):
+        self.counts[:] = 0.0
+        self._weight = 1.0
+        self._total = 0.0
+        self.samples = 0
+
+    def state(self):
+        """Contagens normalizadas (para salvar no perfil)"""
+        return (self.counts / self._weight).tolist()
+
+    def load_state(self, counts):
+        if len(counts) != self.bins:
+            return  # Salvo com outra configuração: começa do zero
+        self.counts[:] = counts
+        self._weight = 1.0
+        self._total = float(self.counts.sum())
+
+
+@dataclass(frozen=True, slots=True)
+class CalibrationEstimate:
+    """Estimativa publicada pela thread de áudio (RMS bruto, sem o multiplicador)"""
+
+    noise_floor: float = 0.0
+    noise_threshold: float = 0.05
+    breath_p50: float = 0.0
+    breath_p95: float = 0.0
+    breath_count: float = 0.0  # Blocos de sopro lembrados (peso efetivo)
+
+
+class BreathCalibrator:
+    """Atualizado a cada bloco de áudio depois do BreathProcessor.
+
+    Blocos abaixo do limiar ou que não parecem sopro alimentam o piso de ruído;
+    blocos de sopro alimentam os percentis do sopro. O piso é um quantil baixo
+    (as pausas entre sopros), porque um sopro fraco barrado pelo limiar também
+    cai no histograma de ruído e não pode puxar o limiar para cima. Os dois
+    histogramas esquecem pelo tempo (meias-vidas em segundos), então o piso segue
+    a sala no mesmo ritmo qualquer que seja a fração de sopro. A cada publish_every blocos
+    o limiar de ruído do processador é ajustado e uma CalibrationEstimate nova é
+    publicada (trocada de uma vez só, quem lê nunca vê valores misturados).
+    """
+
+    def __init__(self, block_rate, noise_margin=1.25, threshold_range=(0.05, 0.3),
+                 noise_half_life=2.0, breath_half_life=120.0, noise_quantile=0.25, min_noise_seconds=0.5,
+                 publish_every=8):
+        self.noise_margin = noise_margin
+        self.noise_quantile = noise_quantile
+        # Sem pausas medidas recentemente (peso efetivo, que também decai) o limiar fica onde está
+        self.min_noise_blocks = min_noise_seconds * block_rate
+        self.min_threshold, self.max_threshold = threshold_range
+        self.noise = DecayingHistogram(half_life=noise_half_life * block_rate)
+        self.breath = DecayingHistogram(half_life=breath_half_life * block_rate)
+        self.publish_every = publish_every
+        self.noise_threshold = self.min_threshold
+        self.estimate = CalibrationEstimate(noise_threshold=self.min_threshold)
+        self._blocks = 0
+        # Estado carregado do perfil, aplicado pela própria thread de áudio no próximo bloco
+        self._pending_state = None
+
+    def update(self, processor):
+        if self._pending_state is not None:
+            state, self._pending_state = self._pending_state, None
+            self._apply_state(state)
+
+        rms = processor.rms
+        if processor.blowing:
+            self.breath.add(processor.filtered_rms)
+        elif rms > 0.0 and (rms <= self.noise_threshold or not processor.is_breath):
+            self.noise.add(rms)
+        # Os dois esquecem pelo relógio (um tick por bloco), não pelo número de amostras
+        # que recebem: senão a meia-vida do ruído esticaria com a fração de blocos de sopro
+        self.noise.tick()
+        self.breath.tick()
+
+        self._blocks += 1
+        if self._blocks % self.publish_every == 0:
+            self._publish()
+            processor.noise_threshold = self.noise_threshold
+
+    def _publish(self):
+        noise_floor = self.noise.quantile(self.noise_quantile)
+        if noise_floor is not None and self.noise.count >= self.min_noise_blocks:
+            self.noise_threshold = min(max(noise_floor * self.noise_margin, self.min_threshold), self.max_threshold)
+        self.estimate = CalibrationEstimate(
+            noise_floor=noise_floor or 0.0,
+            noise_threshold=self.noise_threshold,
+            breath_p50=self.breath.quantile(0.5) or 0.0,
+            breath_p95=self.breath.quantile(0.95) or 0.0,
+            breath_count=self.breath.count,
+        )
+
+    def load(self, calibration_data):
+        """Retoma as estimativas salvas no perfil (aplicado na thread de áudio)"""
+        self._pending_state = dict(calibration_data)
+
+    def reset_breath(self):
+        """Esquece os sopros (depois de uma calibração nova); o piso de ruído continua"""
+        self._pending_state = {'breath_histogram': [0.0] * self.breath.bins}
+
+    def _apply_state(self, state):
+        if 'noise_histogram' in state:
+            self.noise.load_state(state['noise_histogram'])
+        if 'breath_histogram' in state:
+            self.breath.load_state(state['breath_histogram'])
+        self._publish()
+
+    def calibration_data(self, include_breath=True):
+        """Campos para Profile.calibration_data"""
+        estimate = self.estimate
+        data = {
+            'noise_floor': estimate.noise_floor,
+            'noise_threshold': estimate.noise_threshold,
+            'noise_histogram': self.noise.state(),
+        }
+        if include_breath:
+            data['breath_p50'] = estimate.breath_p50
+            data['breath_p95'] = estimate.breath_p95
+            data['breath_histogram'] = self.breath.state()
+        return data
+
+
+def blended_max_breath(calibrated_max, estimate, multiplier, min_count):
+    """Máximo usado para normalizar o esforço (mesma unidade de max_breath_rms).
+
+    Começa no valor da CalibrationScene e passa para o p95 contínuo do sopro à
+    medida que os blocos de sopro se acumulam (min_count blocos = só o contínuo).
+    """
+    if estimate.breath_p95 <= 0.0 or min_count <= 0:
+        return calibrated_max
+    confidence = min(1.0, estimate.breath_count / min_count)
+    return calibrated_max + (estimate.breath_p95 * multiplier - calibrated_max) * confidence
@@ -0,0 +1,236 @@
+# breath_processor.py
+import numpy as np
+
+# numpy >= 2.0 aceita 'out' nas funções de FFT, evitando alocar o espectro a cada bloco
+try:
+    np.fft.rfft(np.zeros(4), out=np.zeros(3, dtype=np.complex128))
+    _RFFT_SUPPORTS_OUT = True
+except TypeError:
+    _RFFT_SUPPORTS_OUT = False
+
+
+class RingBuffer:
+    """Buffer circular pré-alocado com soma corrente (média em O(1))"""
+
+    def __init__(self, size):
+        self.size = size
+        self._data = np.zeros(size, dtype=np.float64)
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def push(self, value):
+        if self._count == self.size:
+            self._sum -= self._data[self._pos]
+        else:
+            self._count += 1
+        self._data[self._pos] = value
+        self._sum += value
+        self._pos += 1
+        if self._pos == self.size:
+            self._pos = 0
+            # Recalcula a soma a cada volta completa para não acumular erro de arredondamento
+            if self._count == self.size:
+                self._sum = float(self._data.sum())
+
+    def mean(self):
+        if self._count == 0:
+            return 0.0
+        return self._sum / self._count
+
+    def values(self):
+        """View dos valores armazenados (fora de ordem quando o buffer já deu a volta)"""
+        return self._data[:self._count]
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def __len__(self):
+        return self._count
+
+
+class Decimator:
+    """Reduz a taxa de amostragem de um bloco por um fator inteiro.
+
+    Cada grupo de factor amostras vira a sua média (um passa-baixa simples antes de
+    descartar amostras, suficiente para as bandas do sopro). A saída é um buffer
+    pré-alocado reaproveitado a cada bloco.
+    """
+
+    def __init__(self, blocksize, factor):
+        self.factor = factor
+        self._out = np.zeros(blocksize // factor, dtype=np.float64)
+        self._scale = 1.0 / factor
+
+    def process(self, samples):
+        factor = self.factor
+        if factor == 1:
+            return samples
+        n = min(samples.shape[0] // factor, self._out.shape[0])
+        out = self._out[:n]
+        # reshape de um bloco contíguo é uma view: a soma por grupo vai direto para o buffer
+        np.add.reduce(samples[:n * factor].reshape(n, factor), axis=1, out=out)
+        out *= self._scale
+        return out
+
+
+# Duração de bloco para a qual os decaimentos do sopro foram ajustados (1024 amostras a 44.1 kHz)
+REFERENCE_BLOCK_SECONDS = 1024 / 44100
+
+
+class BreathProcessor:
+    """Processa blocos de áudio do microfone e estima a intensidade do sopro.
+
+    Todos os buffers são alocados na construção; cada bloco é processado sem
+    criar arrays temporários do tamanho do bloco.
+    """
+
+    def __init__(self, samplerate, blocksize=1024, history_size=8, noise_threshold=0.05,
+                 spectral_gate=True):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.noise_threshold = noise_threshold
+        self.spectral_gate = spectral_gate
+        # Decaimentos por bloco equivalentes aos originais em tempo, qualquer que seja o bloco
+        block_scale = (blocksize / samplerate) / REFERENCE_BLOCK_SECONDS
+        self._weak_decay = 0.8 ** block_scale
+        self._silence_decay = 0.7 ** block_scale
+
+        # Médias móveis em buffers circulares
+        self.history_size = history_size
+        self._rms_history = RingBuffer(history_size)  # Mesmo papel do antigo breath_history
+        self._flatness_history = RingBuffer(4)
+
+        # Buffers da análise espectral
+        self._window = np.hanning(blocksize)
+        self._windowed = np.zeros(blocksize, dtype=np.float64)
+        self._spectrum = np.zeros(blocksize // 2 + 1, dtype=np.complex128)
+        self._power = np.zeros(blocksize // 2 + 1, dtype=np.float64)
+        self._log_power = np.zeros(blocksize // 2 + 1, dtype=np.float64)
+        freqs = np.fft.rfftfreq(blocksize, 1.0 / samplerate)
+        self._freqs = freqs
+        # Máscaras como float para usar np.dot (soma de banda sem indexação que aloca)
+        # O sopro no microfone concentra energia turbulenta em baixas frequências
+        self._low_band = (freqs < 500.0).astype(np.float64)
+        # A voz tem harmônicos fortes entre 100 Hz e 4 kHz; ventiladores têm tons fixos
+        self._voice_band = ((freqs >= 100.0) & (freqs < 4000.0)).astype(np.float64)
+        self._voice_band_size = max(1.0, float(self._voice_band.sum()))
+
+        # Limiares do classificador de sopro (ajustados nos sinais de benchmarks/bench_breath.py)
+        self.min_flatness = 0.03  # Sopro é ruidoso (espectro plano); voz e ventilador ficam abaixo de 0.01
+        # Sopro tem muita energia grave: ao menos 4x a fração que o ruído branco teria abaixo
+        # de 500 Hz nesta taxa e neste bloco (um limiar fixo mudaria com o perfil de latência)
+        white_low_share = float(self._low_band.sum()) / self._low_band.size
+        self.min_low_band_ratio = 4.0 * white_low_share
+        self.max_crest_factor = 6.0  # Palmas são transientes com pico muito acima do RMS
+
+        # Saída
+        self.rms = 0.0
+        self.filtered_rms = 0.0
+        self.breath_intensity = 0.0
+        self.spectral_centroid = 0.0
+        self.spectral_flatness = 0.0
+        self.low_band_ratio = 0.0
+        self.crest_factor = 0.0
+        self.is_breath = False
+        self.blowing = False  # Este bloco contou como sopro (breath_intensity = filtered_rms)
+
+    def process(self, samples):
+        """Processa um bloco mono (array 1D) e retorna a intensidade do sopro"""
+        n = samples.shape[0]
+        if n == 0:
+            return self.breath_intensity
+
+        # RMS sem temporários: o produto escalar não aloca o array elevado ao quadrado
+        energy = float(np.dot(samples, samples))
+        rms = (energy / n) ** 0.5
+        self.rms = rms
+
+        if rms > self.noise_threshold:
+            self._rms_history.push(rms)
+
+            if self.spectral_gate:
+                self._analyze_spectrum(samples, rms)
+                self._flatness_history.push(self.spectral_flatness)
+                self.is_breath = self._classify()
+            else:
+                self.is_breath = True
+
+            # Média móvel para suavizar o sinal
+            self.filtered_rms = self._rms_history.mean()
+
+            # Só considera sopros mais fortes e com assinatura espectral de sopro
+            self.blowing = self.is_breath and self.filtered_rms > 0.1
+            if self.blowing:
+                self.breath_intensity = self.filtered_rms
+            else:
+                # Para sopros muito fracos (ou ruídos que não são sopro), diminui gradualmente
+                self.breath_intensity = max(0.0, self.breath_intensity * self._weak_decay)
+        else:
+            self.is_breath = False
+            self.blowing = False
+            # Se abaixo do threshold, diminui mais rapidamente
+            self.breath_intensity = max(0.0, self.breath_intensity * self._silence_decay)
+            # Limpa o histórico quando não há sopro
+            if self.breath_intensity < 0.001:
+                self._rms_history.clear()
+                self._flatness_history.clear()
+
+        return self.breath_intensity
+
+    def _analyze_spectrum(self, samples, rms):
+        """Calcula as features espectrais do bloco nos buffers pré-alocados"""
+        n = min(samples.shape[0], self.blocksize)
+        windowed = self._windowed
+        # Copia primeiro (converte float32 -> float64 no próprio buffer) e janela no lugar:
+        # multiplicar float32 pela janela float64 alocaria uma cópia convertida do bloco
+        windowed[:n] = samples[:n]
+        windowed[:n] *= self._window[:n]
+        if n < self.blocksize:
+            windowed[n:] = 0.0
+
+        if _RFFT_SUPPORTS_OUT:
+            np.fft.rfft(windowed, out=self._spectrum)
+            spectrum = self._spectrum
+        else:
+            spectrum = np.fft.rfft(windowed)
+
+        power = self._power
+        np.abs(spectrum, out=power)
+        np.multiply(power, power, out=power)
+        power += 1e-12
+
+        total = float(power.sum())
+        self.spectral_centroid = float(np.dot(power, self._freqs)) / total
+        self.low_band_ratio = float(np.dot(power, self._low_band)) / total
+
+        # Planura espectral: média geométrica / média aritmética (1 = ruído branco, 0 = tom puro)
+        np.log(power, out=self._log_power)
+        log_mean = float(np.dot(self._log_power, self._voice_band)) / self._voice_band_size
+        arithmetic_mean = float(np.dot(power, self._voice_band)) / self._voice_band_size
+        self.spectral_flatness = float(np.exp(log_mean)) / arithmetic_mean if arithmetic_mean > 0 else 0.0
+
+        peak = max(float(samples.max()), -float(samples.min()))
+        self.crest_factor = peak / rms if rms > 0 else 0.0
+
+    def _classify(self):
+        """Diferencia sopro de voz, palmas e ruído de ventilador"""
+        flatness = self._flatness_history.mean()
+        if self.crest_factor > self.max_crest_factor:
+            return False  # Transiente (palma, batida)
+        if flatness < self.min_flatness:
+            return False  # Espectro harmônico (voz)
+        if self.low_band_ratio < self.min_low_band_ratio:
+            return False  # Chiado agudo sem a energia grave do sopro
+        return True
+
+    def reset(self):
+        self._rms_history.clear()
+        self._flatness_history.clear()
+        self.rms = 0.0
+        self.filtered_rms = 0.0
+        self.breath_intensity = 0.0
+        self.is_breath = False
+        self.blowing = False
@@ -0,0 +1,145 @@
+# frame_buffer.py
+import threading
+
+import numpy as np
+
+# Layout do array de controle (float64)
+_WRITE = 0  # Slot do produtor
+_READY = 1  # Slot com o frame completo mais novo
+_READ = 2  # Slot em uso pelo consumidor
+_FRESH = 3  # 1 quando READY tem um frame que o consumidor ainda não pegou
+_SEQ = 4  # Último número de sequência publicado
+_SLOT_META = 5  # Por slot: seq, timestamp, altura, largura
+_META_FIELDS = 4
+CONTROL_SIZE = _SLOT_META + 3 * _META_FIELDS
+
+
+class LatestFrameBuffer:
+    """Triple buffer de frames com um único produtor e um único consumidor.
+
+    O produtor (thread/processo de captura) escreve sempre em um slot próprio e,
+    ao terminar, troca-o com o slot "pronto". O consumidor pega o slot pronto
+    trocando-o com o seu. As trocas são só de índices (seção crítica mínima),
+    então nenhum lado espera o outro terminar de copiar um frame, e o frame
+    retornado ao consumidor não é sobrescrito até a próxima chamada de latest().
+
+    Os slots e o controle podem morar em memória local ou compartilhada
+    (ver from_buffer); nesse caso o lock deve ser um multiprocessing.Lock.
+    """
+
+    def __init__(self, max_height=None, max_width=None, channels=3, slots=None, control=None, lock=None):
+        self.channels = channels
+        if slots is None and max_height is not None:
+            slots = [np.zeros((max_height, max_width, channels), dtype=np.uint8) for _ in range(3)]
+        # Sem tamanho máximo, os slots são alocados no primeiro frame (só em memória local)
+        self._slots = slots if slots is not None else [None, None, None]
+        self._fixed_size = slots is not None
+        initialize = control is None
+        if initialize:
+            control = np.zeros(CONTROL_SIZE, dtype=np.float64)
+        self._control = control
+        self._lock = lock if lock is not None else threading.Lock()
+        self._last = (0, 0.0, None)
+        if initialize:
+            self.reset()
+
+    @staticmethod
+    def buffer_size(max_height, max_width, channels=3):
+        return CONTROL_SIZE * 8 + 3 * max_height * max_width * channels
+
+    @classmethod
+    def from_buffer(cls, buffer, offset, max_height, max_width, lock, channels=3, initialize=False):
+        """Cria o triple buffer sobre um buffer existente (ex.: SharedMemory.buf)"""
+        control = np.ndarray((CONTROL_SIZE,), dtype=np.float64, buffer=buffer, offset=offset)
+        offset += CONTROL_SIZE * 8
+        slot_bytes = max_height * max_width * channels
+        slots = []
+        for i in range(3):
+            slots.append(np.ndarray((max_height, max_width, channels), dtype=np.uint8,
+                                    buffer=buffer, offset=offset + i * slot_bytes))
+        frame_buffer = cls(slots=slots, control=control, lock=lock, channels=channels)
+        if initialize:
+            frame_buffer.reset()
+        return frame_buffer
+
+    def _meta(self, slot):
+        return _SLOT_META + slot * _META_FIELDS
+
+    def publish(self, frame, timestamp):
+        """Copia o frame para o slot do produtor e o torna o mais novo (só o produtor chama)"""
+        control = self._control
+        slot = int(control[_WRITE])
+        height, width = frame.shape[:2]
+        target = self._slots[slot]
+        if self._fixed_size:
+            if height > target.shape[0] or width > target.shape[1]:
+                raise ValueError(f"Frame {width}x{height} maior que o buffer "
+                                 f"{target.shape[1]}x{target.shape[0]}")
+            target[:height, :width] = frame
+        else:
+            # O slot do produtor é só dele: pode ser realocado se o tamanho do frame mudar
+            if target is None or target.shape != frame.shape:
+                target = np.empty_like(frame)
+                self._slots[slot] = target
+            np.copyto(target, frame)
+
+        meta = self._meta(slot)
+        with self._lock:
+            seq = control[_SEQ] + 1
+            control[_SEQ] = seq
+            control[meta] = seq
+            control[meta + 1] = timestamp
+            control[meta + 2] = height
+            control[meta + 3] = width
+            control[_WRITE], control[_READY] = control[_READY], slot
+            control[_FRESH] = 1
+
+    def latest(self):
+        """Retorna (seq, timestamp, frame) do frame mais novo, ou (0, 0.0, None) se não houver.
+
+        O frame é uma view do slot do consumidor (sem cópia), válida até a próxima chamada.
+        """
+        control = self._control
+        # Timeout curto: se um produtor em outro processo morrer segurando o lock,
+        # o consumidor continua com o último frame em vez de travar o jogo
+        if not self._lock.acquire(timeout=0.005):
+            return self._last
+        try:
+            if control[_FRESH]:
+                control[_READ], control[_READY] = control[_READY], control[_READ]
+                control[_FRESH] = 0
+            slot = int(control[_READ])
+            meta = self._meta(slot)
+            seq = int(control[meta])
+            timestamp = control[meta + 1]
+            height = int(control[meta + 2])
+            width = int(control[meta + 3])
+        finally:
+            self._lock.release()
+        if seq == 0:
+            return 0, 0.0, None
+        frame = self._slots[slot]
+        if self._fixed_size:
+            frame = frame[:height, :width]
+        self._last = (seq, timestamp, frame)
+        return self._last
+
+    @property
+    def seq(self):
+        """Sequência do último frame publicado (leitura barata, sem trocar slots)"""
+        return int(self._control[_SEQ])
+
+    def reset(self, lock=None):
+        """Volta ao estado inicial (ex.: após reiniciar um produtor que morreu no meio de uma troca)"""
+        control = self._control
+        control[:] = 0.0
+        control[_WRITE], control[_READY], control[_READ] = 0, 1, 2
+        if lock is not None:
+            self._lock = lock
+        self._last = (0, 0.0, None)
+
+    def detach(self):
+        """Solta as views (necessário antes de fechar uma memória compartilhada)"""
+        self._slots = [None, None, None]
+        self._control = None
+        self._last = (0, 0.0, None)
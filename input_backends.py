@@ -0,0 +1,559 @@
+# input_backends.py
+# Fontes de entrada do InputManager: dispositivos reais, replay de arquivos gravados
+# e geradores sintéticos (para rodar sem microfone/câmera).
+import math
+import threading
+import time
+import wave
+
+import numpy as np
+
+from breath_processor import RingBuffer
+from frame_buffer import LatestFrameBuffer
+
+
+class Pacer:
+    """Controla o ritmo de entrega de blocos/frames.
+
+    speed = 1.0 entrega em tempo real, 4.0 quatro vezes mais rápido e
+    speed <= 0 entrega o mais rápido possível (sem dormir).
+    """
+
+    def __init__(self, period, speed=1.0):
+        self.period = period
+        self.speed = speed
+        self._next = None
+
+    def wait(self):
+        if self.speed <= 0:
+            return
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        delay = self._next - now
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -0.25:
+            # Atrasou demais (ex.: processo suspenso): recomeça a contagem em vez de disparar em rajada
+            self._next = now
+        self._next += self.period / self.speed
+
+    def reset(self):
+        self._next = None
+
+
+# --- Áudio -----------------------------------------------------------------
+
+class AudioBackend:
+    """Fonte de áudio: chama callback(indata, frames, time, status) como o sounddevice.
+
+    indata tem formato (frames, canais) em float32 no intervalo [-1, 1].
+    """
+
+    def __init__(self, samplerate, blocksize):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+
+    def run(self, callback, is_running):
+        """Entrega blocos até is_running() retornar False ou a fonte acabar"""
+        raise NotImplementedError
+
+    def stop(self):
+        """Pede para run() terminar (as fontes em Python já checam is_running a cada bloco)"""
+
+
+class SoundDeviceAudioBackend(AudioBackend):
+    """Microfone real via sounddevice.
+
+    latency é a dica passada ao PortAudio ('low', 'high' ou segundos). Enquanto
+    o stream roda, a thread fica bloqueada num Event (sem acordar periodicamente),
+    liberado por stop() ou quando o stream termina sozinho (dispositivo removido).
+    """
+
+    def __init__(self, device=None, samplerate=44100, blocksize=1024, latency=None):
+        super().__init__(samplerate, blocksize)
+        self.device = device
+        self.latency = latency
+        self.stream_latency = None  # Latência de entrada informada pelo PortAudio (s)
+        self._stopped = threading.Event()
+
+    def run(self, callback, is_running):
+        import sounddevice as sd
+        self._stopped.clear()
+        options = {} if self.latency is None else {'latency': self.latency}
+        with sd.InputStream(device=self.device, channels=1, callback=callback,
+                            samplerate=self.samplerate, blocksize=self.blocksize,
+                            finished_callback=self._stopped.set, **options) as stream:
+            self.stream_latency = stream.latency
+            print(f"Microfone aberto: {self.samplerate} Hz, blocos de {self.blocksize} amostras "
+                  f"({self.blocksize / self.samplerate * 1000:.1f} ms), latência do dispositivo "
+                  f"{stream.latency * 1000:.1f} ms")
+            if is_running():
+                self._stopped.wait()
+
+    def stop(self):
+        self._stopped.set()
+
+
+class _BlockAudioBackend(AudioBackend):
+    """Base para fontes que produzem blocos em Python (arquivos e geradores)"""
+
+    def __init__(self, samplerate, blocksize, speed=1.0):
+        super().__init__(samplerate, blocksize)
+        self.speed = speed
+        self._block = np.zeros((blocksize, 1), dtype=np.float32)
+
+    def _fill_block(self, block):
+        """Preenche o bloco; retorna False quando a fonte terminou"""
+        raise NotImplementedError
+
+    def run(self, callback, is_running):
+        pacer = Pacer(self.blocksize / self.samplerate, self.speed)
+        block = self._block
+        while is_running():
+            if not self._fill_block(block):
+                break
+            pacer.wait()
+            callback(block, self.blocksize, None, None)
+
+
+class FileAudioBackend(_BlockAudioBackend):
+    """Replay de áudio gravado em WAV (PCM) ou NPY (float, mono ou (n, canais))"""
+
+    def __init__(self, path, blocksize=1024, speed=1.0, loop=False, npy_samplerate=44100):
+        samples, samplerate = load_audio_file(path, npy_samplerate)
+        super().__init__(samplerate, blocksize, speed)
+        self.path = path
+        self.loop = loop
+        self.samples = samples
+        self._pos = 0
+
+    def _fill_block(self, block):
+        total = self.samples.shape[0]
+        if self._pos >= total:
+            if not self.loop or total == 0:
+                return False
+            self._pos = 0
+        end = min(self._pos + self.blocksize, total)
+        count = end - self._pos
+        block[:count, 0] = self.samples[self._pos:end]
+        block[count:, 0] = 0.0
+        self._pos = end
+        return True
+
+
+def load_audio_file(path, npy_samplerate=44100):
+    """Carrega WAV ou NPY como array mono float32; retorna (amostras, samplerate)"""
+    if path.endswith('.npy'):
+        data = np.load(path, mmap_mode='r')
+        if data.ndim > 1:
+            data = data[:, 0]
+        # NPY não guarda a taxa de amostragem: usa a informada
+        return np.asarray(data, dtype=np.float32), npy_samplerate
+
+    with wave.open(path, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        samplerate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"WAV com {width * 8} bits não suportado: {path}")
+    if channels > 1:
+        data = data.reshape(-1, channels)[:, 0].copy()
+    return data, samplerate
+
+
+def breath_envelope(t, period=4.0, exhale=0.5, peak=1.0, ramp=0.15):
+    """Envelope de um ciclo respiratório: sopro suave de 'exhale' do período, depois pausa.
+
+    t pode ser escalar ou array (segundos). Retorna valores em [0, peak].
+    """
+    phase = np.mod(t, period) / period
+    # Janela com subida/descida em cosseno levantado
+    rise = np.clip(phase / ramp, 0.0, 1.0)
+    fall = np.clip((exhale - phase) / ramp, 0.0, 1.0)
+    shape = 0.5 - 0.5 * np.cos(np.pi * np.minimum(rise, fall))
+    return peak * np.where(phase < exhale, shape, 0.0)
+
+
+class SyntheticBreathAudioBackend(_BlockAudioBackend):
+    """Gera sopros sintéticos: ruído grave modulado por breath_envelope"""
+
+    def __init__(self, samplerate=44100, blocksize=1024, speed=1.0, period=4.0, exhale=0.5,
+                 peak=0.6, noise_floor=0.005, seed=0):
+        super().__init__(samplerate, blocksize, speed)
+        self.period = period
+        self.exhale = exhale
+        self.peak = peak
+        self.noise_floor = noise_floor
+        self._rng = np.random.default_rng(seed)
+        self._time = 0.0
+        self._noise = np.zeros(blocksize + 16, dtype=np.float32)
+        self._kernel = np.ones(16, dtype=np.float32) / 16.0
+
+    def _fill_block(self, block):
+        # Ruído filtrado por média móvel curta: energia concentrada em baixas frequências, como o sopro
+        self._noise[:] = self._rng.standard_normal(self._noise.shape[0])
+        turbulence = np.convolve(self._noise, self._kernel, mode='valid')[:self.blocksize] * 4.0
+        level = float(breath_envelope(self._time, self.period, self.exhale, self.peak))
+        block[:, 0] = turbulence * level + self._noise[:self.blocksize] * self.noise_floor
+        self._time += self.blocksize / self.samplerate
+        return True
+
+
+# --- Vídeo -----------------------------------------------------------------
+
+class CaptureStats:
+    """Ritmo real da câmera, frames descartados e idade do frame quando é entregue.
+
+    Descartado é um frame que chegou do driver mas foi substituído por um mais novo
+    antes de ser processado. Médias em janelas curtas (O(1) por frame).
+    """
+
+    def __init__(self, window=60):
+        self.captured = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._intervals = RingBuffer(window)
+        self._ages = RingBuffer(window)
+        self._last_capture = None
+
+    def on_capture(self, timestamp):
+        if self._last_capture is not None:
+            self._intervals.push(timestamp - self._last_capture)
+        self._last_capture = timestamp
+        self.captured += 1
+
+    def on_deliver(self, skipped, age):
+        self.delivered += 1
+        self.dropped += skipped
+        self._ages.push(age)
+
+    @property
+    def fps(self):
+        interval = self._intervals.mean()
+        return 1.0 / interval if interval > 0 else 0.0
+
+    @property
+    def frame_age(self):
+        """Idade média (s) do frame entregue: da chegada do driver até read()"""
+        return self._ages.mean()
+
+    def summary(self):
+        return {'fps': self.fps, 'captured': self.captured, 'dropped': self.dropped, 'age': self.frame_age}
+
+
+class VideoBackend:
+    """Fonte de frames BGR uint8 no formato (altura, largura, 3)"""
+
+    stats = None  # CaptureStats quando a fonte mede a captura
+    captured_at = None  # perf_counter da chegada do último frame entregue (None = instante do read)
+
+    def open(self):
+        """Abre a fonte; retorna True se estiver pronta"""
+        raise NotImplementedError
+
+    def is_opened(self):
+        raise NotImplementedError
+
+    def read(self):
+        """Retorna (ok, frame) como cv2.VideoCapture.read"""
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class NullVideoBackend(VideoBackend):
+    """Sem câmera: o jogo roda apenas com o microfone"""
+
+    def open(self):
+        return False
+
+    def is_opened(self):
+        return False
+
+    def read(self):
+        return False, None
+
+
+class OpenCVVideoBackend(VideoBackend):
+    """Câmera (índice do dispositivo) ou arquivo de vídeo via cv2.VideoCapture.
+
+    Numa câmera, width/height/fps/fourcc/buffer_size são pedidos ao driver (que pode
+    ignorar alguns) e uma thread própria lê todos os frames assim que chegam, para
+    a fila do driver nunca acumular frames velhos. read() espera o próximo frame e
+    entrega sempre o mais novo; os que chegaram enquanto o anterior era processado
+    são descartados e contados em stats.
+    """
+
+    def __init__(self, source=0, speed=1.0, loop=False, width=None, height=None, fps=None,
+                 fourcc=None, buffer_size=None):
+        self.source = source
+        self.speed = speed
+        self.loop = loop
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.capture = None
+        self._pacer = None
+        self._finished = False
+        # Thread de captura (criada em open: o backend é enviado ao processo de movimento antes)
+        self._frames = None
+        self._fresh = None
+        self._stop_grabbing = None
+        self._grabber = None
+        self._delivered_seq = 0
+
+    @property
+    def is_file(self):
+        return isinstance(self.source, str)
+
+    def _open_capture(self, cv2):
+        return cv2.VideoCapture(self.source)
+
+    def open(self):
+        import cv2
+        self.capture = self._open_capture(cv2)
+        self._finished = False
+        if not self.capture.isOpened():
+            return False
+        if self.is_file:
+            # Câmeras já entregam no ritmo do driver; arquivos precisam ser cadenciados
+            fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+            self._pacer = Pacer(1.0 / fps, self.speed)
+        else:
+            self._configure(cv2)
+            self._start_grabber()
+        return True
+
+    def _configure(self, cv2):
+        """Pede formato, resolução, fps e tamanho da fila ao driver e mostra o que foi aceito"""
+        capture = self.capture
+        if self.fourcc:
+            # No V4L2 o formato precisa vir antes da resolução (MJPG libera 30 fps em 720p via USB 2)
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width and self.height:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            capture.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size:
+            capture.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        code = int(capture.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)) if code else "?"
+        print(f"Câmera aberta: {int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+              f"{int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))} a {capture.get(cv2.CAP_PROP_FPS):.0f} fps, "
+              f"formato {fourcc}, fila {int(capture.get(cv2.CAP_PROP_BUFFERSIZE))}")
+
+    def _start_grabber(self):
+        self.stats = CaptureStats()
+        self._frames = LatestFrameBuffer()
+        self._fresh = threading.Event()
+        self._stop_grabbing = threading.Event()
+        self._delivered_seq = 0
+        self._grabber = threading.Thread(target=self._grab_loop, daemon=True)
+        self._grabber.start()
+
+    def _grab_loop(self):
+        """Lê cada frame assim que o driver o entrega (o read do OpenCV libera o GIL)"""
+        capture = self.capture
+        frame = None
+        while not self._stop_grabbing.is_set():
+            ret, frame = capture.read(frame)
+            if not ret:
+                if not capture.isOpened():
+                    break
+                time.sleep(0.005)
+                continue
+            now = time.perf_counter()
+            self._frames.publish(frame, now)
+            self.stats.on_capture(now)
+            self._fresh.set()
+        self._finished = True
+        self._fresh.set()
+
+    def _read_latest(self, timeout=0.5):
+        while True:
+            if not self._fresh.wait(timeout) or self._finished:
+                return False, None
+            self._fresh.clear()
+            seq, timestamp, frame = self._frames.latest()
+            if seq > self._delivered_seq:
+                break
+        self.stats.on_deliver(seq - self._delivered_seq - 1, time.perf_counter() - timestamp)
+        self._delivered_seq = seq
+        self.captured_at = timestamp
+        return True, frame
+
+    def is_opened(self):
+        return self.capture is not None and self.capture.isOpened() and not self._finished
+
+    def read(self):
+        if self._grabber is not None:
+            # O frame é do buffer da thread de captura: válido até o próximo read()
+            return self._read_latest()
+        ret, frame = self.capture.read()
+        if not ret and self.is_file:
+            if self.loop:
+                import cv2
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.capture.read()
+            else:
+                self._finished = True
+        if ret and self._pacer is not None:
+            self._pacer.wait()
+        return ret, frame
+
+    def release(self):
+        if self._grabber is not None:
+            self._stop_grabbing.set()
+            self._grabber.join(timeout=1.0)
+            self._grabber = None
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class NpyVideoBackend(VideoBackend):
+    """Replay de frames gravados em NPY com formato (n, altura, largura, 3)"""
+
+    def __init__(self, path, fps=30.0, speed=1.0, loop=False):
+        self.path = path
+        self.fps = fps
+        self.speed = speed
+        self.loop = loop
+        self.frames = None
+        self._index = 0
+        self._pacer = Pacer(1.0 / fps, speed)
+
+    def open(self):
+        self.frames = np.load(self.path, mmap_mode='r')
+        self._index = 0
+        return self.frames.ndim == 4 and self.frames.shape[0] > 0
+
+    def is_opened(self):
+        return self.frames is not None and (self.loop or self._index < self.frames.shape[0])
+
+    def read(self):
+        if self.frames is None:
+            return False, None
+        if self._index >= self.frames.shape[0]:
+            if not self.loop:
+                return False, None
+            self._index = 0
+        frame = np.ascontiguousarray(self.frames[self._index])
+        self._index += 1
+        self._pacer.wait()
+        return True, frame
+
+    def release(self):
+        self.frames = None
+
+
+class SyntheticVideoBackend(VideoBackend):
+    """Gera frames com formas em movimento sobre um fundo com ruído de sensor.
+
+    As formas se movem por move_seconds e ficam paradas por rest_seconds;
+    motion_ground_truth indica se o último frame entregue tinha movimento.
+    """
+
+    def __init__(self, width=640, height=480, fps=30.0, speed=1.0, shapes=1, radius=40,
+                 move_seconds=2.0, rest_seconds=2.0, noise=4, seed=0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.speed = speed
+        self.shapes = shapes
+        self.radius = radius
+        self.move_seconds = move_seconds
+        self.rest_seconds = rest_seconds
+        self.noise = noise
+        self._rng = np.random.default_rng(seed)
+        self._pacer = Pacer(1.0 / fps, speed)
+        self._opened = False
+        self._frame_index = 0
+        self.motion_ground_truth = False
+
+        self._background = None
+        self._noise_frames = None
+        self._phases = self._rng.uniform(0, 2 * math.pi, shapes)
+
+    def open(self):
+        # Fundo em gradiente e um pequeno banco de ruído reutilizado (gerar ruído por frame custa caro)
+        gradient = np.linspace(40, 120, self.width, dtype=np.float32)
+        self._background = np.repeat(gradient[None, :], self.height, axis=0).astype(np.uint8)
+        self._background = np.dstack([self._background] * 3)
+        self._noise_frames = [
+            self._rng.integers(0, self.noise + 1, (self.height, self.width, 1), dtype=np.uint8)
+            for _ in range(8)
+        ]
+        self._frame_index = 0
+        self._opened = True
+        return True
+
+    def is_opened(self):
+        return self._opened
+
+    def _moving_time(self, t):
+        """Tempo efetivo de movimento: só avança durante as janelas de movimento"""
+        cycle = self.move_seconds + self.rest_seconds
+        cycles, remainder = divmod(t, cycle)
+        return cycles * self.move_seconds + min(remainder, self.move_seconds), remainder < self.move_seconds
+
+    def read(self):
+        if not self._opened:
+            return False, None
+        import cv2
+        t = self._frame_index / self.fps
+        moving_t, moving = self._moving_time(t)
+        frame = self._background.copy()
+        frame += self._noise_frames[self._frame_index % len(self._noise_frames)]
+        for i in range(self.shapes):
+            phase = self._phases[i]
+            cx = int(self.width / 2 + math.sin(moving_t * 1.5 + phase) * self.width * 0.3)
+            cy = int(self.height / 2 + math.cos(moving_t * 1.1 + phase) * self.height * 0.25)
+            cv2.circle(frame, (cx, cy), self.radius, (230, 200, 180), -1)
+        self.motion_ground_truth = moving and self._frame_index > 0
+        self._frame_index += 1
+        self._pacer.wait()
+        return True, frame
+
+    def release(self):
+        self._opened = False
+
+
+# --- Fábrica a partir das configurações --------------------------------------
+
+def create_audio_backend(spec, device=None, samplerate=44100, blocksize=1024, speed=1.0, latency=None):
+    """spec: 'device', 'synthetic' ou caminho para .wav/.npy"""
+    if spec in (None, 'device'):
+        return SoundDeviceAudioBackend(device, samplerate, blocksize, latency)
+    if spec == 'synthetic':
+        return SyntheticBreathAudioBackend(samplerate, blocksize, speed=speed)
+    return FileAudioBackend(spec, blocksize=blocksize, speed=speed, npy_samplerate=samplerate)
+
+
+def create_video_backend(spec, device=0, speed=1.0, width=None, height=None, fps=None, fourcc=None,
+                         buffer_size=None):
+    """spec: 'device', 'synthetic', 'none' ou caminho para .npy/arquivo de vídeo"""
+    if spec in (None, 'device'):
+        return OpenCVVideoBackend(device, width=width, height=height, fps=fps, fourcc=fourcc,
+                                  buffer_size=buffer_size)
+    if spec == 'none':
+        return NullVideoBackend()
+    if spec == 'synthetic':
+        return SyntheticVideoBackend(speed=speed)
+    if spec.endswith('.npy'):
+        return NpyVideoBackend(spec, speed=speed)
+    return OpenCVVideoBackend(spec, speed=speed)
+
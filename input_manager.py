@@ -1,45 +1,176 @@
 # input_manager.py
-import cv2
-import sounddevice as sd
-import numpy as np
+# OpenCV (motion_detector) e o processo de movimento (motion_worker) só são
+# importados em start()/startup_steps(), fora do caminho até a janela aparecer.
 import threading
+import time
+import settings
+from breath_processor import BreathProcessor, Decimator
+from breath_calibration import BreathCalibrator
+from frame_buffer import LatestFrameBuffer
+from latency_monitor import LatencyMonitor
+from input_backends import SoundDeviceAudioBackend, OpenCVVideoBackend
+from input_snapshot import (InputSnapshot, DEVICE_STARTING, DEVICE_OK, DEVICE_UNAVAILABLE,
+                            DEVICE_ERROR, DEVICE_STOPPED)
 
 class InputManager:
-    def __init__(self, mic_id=None, mic_samplerate=44100, cam_id=0):
+    def __init__(self, mic_id=None, mic_samplerate=44100, cam_id=0, mic_blocksize=1024,
+                 audio_backend=None, video_backend=None, motion_process=False,
+                 motion_engine='diff', motion_processing_width=None, mic_downsample=1, mic_smoothing=None):
+        # Fontes de entrada: dispositivos reais por padrão, ou arquivos/geradores (ver input_backends)
+        if audio_backend is None:
+            audio_backend = SoundDeviceAudioBackend(mic_id, mic_samplerate, mic_blocksize)
+        if video_backend is None:
+            video_backend = OpenCVVideoBackend(cam_id)
+        self.audio_backend = audio_backend
+        self.video_backend = video_backend
+
         # Microfone
         self.mic_id = mic_id
-        self.mic_samplerate = mic_samplerate
-        self.breath_intensity = 0.0
+        self.mic_samplerate = audio_backend.samplerate
+        self.mic_blocksize = audio_backend.blocksize
+        self.mic_block_period = self.mic_blocksize / self.mic_samplerate
         self.breath_multiplier = 50.0  # Multiplicador reduzido para menos sensibilidade
         self._mic_thread = threading.Thread(target=self._listen_mic, daemon=True)
         self.mic_running = False
+        self.mic_status = DEVICE_STARTING
+        # Última amostra publicada pelo callback: (seq, timestamp, intensidade, é_sopro).
+        # Uma tupla é trocada de uma vez só, então quem lê nunca vê valores de blocos diferentes.
+        self._breath_sample = (0, 0.0, 0.0, False)
+        
+        # A análise do sopro pode rodar numa taxa menor que a do dispositivo (perfil de latência)
+        if mic_downsample < 1 or self.mic_blocksize % mic_downsample:
+            print(f"Fator de redução {mic_downsample} não divide o bloco de {self.mic_blocksize}; usando a taxa cheia")
+            mic_downsample = 1
+        self.decimator = Decimator(self.mic_blocksize, mic_downsample)
+        analysis_samplerate = self.mic_samplerate / mic_downsample
+        # Média móvel do RMS em segundos convertida em blocos (None = 8 blocos, o ajuste original)
+        history_size = 8 if mic_smoothing is None else max(1, round(mic_smoothing / self.mic_block_period))
         
-        # Filtro de ruído para microfone
-        self.noise_threshold = 0.05  # Threshold aumentado para filtrar mais ruído
-        self.breath_history = []  # Histórico para filtro de média móvel
-        self.history_size = 8  # Histórico maior para mais suavização
+        # Filtro de ruído e análise espectral do sopro (buffers pré-alocados)
+        self.breath_processor = BreathProcessor(
+            analysis_samplerate,
+            blocksize=self.mic_blocksize // mic_downsample,
+            history_size=history_size,  # Histórico maior para mais suavização
+            noise_threshold=settings.NOISE_GATE_RANGE[0],  # Sobe com o ruído da sala (ver calibrator)
+            spectral_gate=settings.BREATH_SPECTRAL_GATE,
+        )
+        # Piso de ruído e percentis do sopro estimados continuamente (ver breath_calibration)
+        self.calibrator = BreathCalibrator(
+            1.0 / self.mic_block_period,
+            noise_margin=settings.NOISE_GATE_MARGIN,
+            threshold_range=settings.NOISE_GATE_RANGE,
+            noise_half_life=settings.NOISE_HALF_LIFE,
+            breath_half_life=settings.BREATH_HALF_LIFE,
+            noise_quantile=settings.NOISE_QUANTILE,
+        )
         
         # Câmera e detecção de movimento
         self.cam_id = cam_id
         self.camera = None
-        self.motion_detected = False
-        self.motion_intensity = 0.0
+        self.camera_status = DEVICE_STARTING
+        # Último resultado de movimento: (seq, timestamp da captura, intensidade)
+        self._motion_sample = (0, 0.0, 0.0)
         self._camera_thread = threading.Thread(target=self._process_camera, daemon=True)
         self.camera_running = False
+        # A thread da câmera é a única que lê o dispositivo; o jogo pega o frame mais novo daqui
+        self.frame_buffer = LatestFrameBuffer()
         
         # Para detecção de movimento
-        self.prev_frame = None
+        self.motion_engine_name = motion_engine
+        self.motion_processing_width = motion_processing_width
+        self.motion_detector = None  # Criado em _load_motion_engine (importa o OpenCV)
+        # (largura de processamento, detecta 1 de cada N frames), ajustado pelo QualityGovernor
+        self._motion_quality = (motion_processing_width, 1)
         self.motion_threshold = 30
+        
+        # Detecção opcional em outro processo (libera o GIL do loop do jogo)
+        self.motion_process = motion_process
+        self.motion_worker = None
+        # stop() pode chegar com a inicialização (startup_steps) ainda rodando em outra thread:
+        # depois dele nenhuma etapa inicia thread ou processo (checado e marcado sob o lock)
+        self._start_lock = threading.Lock()
+        self._stopped = False
+        
+        # Snapshot publicado uma vez por tick do jogo (ver poll)
+        self.tick = 0
+        self.snapshot = InputSnapshot()
+        
+        # Latência da captura até a tela (alimentada pelas cenas e pelo loop do jogo)
+        self.latency = LatencyMonitor()
 
     def start(self):
-        self.mic_running = True
-        self.camera_running = True
-        self._mic_thread.start()
-        self._camera_thread.start()
+        """Inicia tudo na thread atual (o jogo usa startup_steps em segundo plano)"""
+        for _, step in self.startup_steps():
+            step()
+
+    def startup_steps(self, device_timeout=3.0):
+        """Etapas de inicialização como (rótulo, função), na ordem em que devem rodar"""
+        steps = [("Iniciando microfone", lambda: self._start_mic(device_timeout))]
+        if not self.motion_process:
+            # Com o processo separado, o OpenCV é importado lá
+            steps.insert(0, ("Carregando detecção de movimento", self._load_motion_engine))
+        steps.append(("Iniciando câmera", lambda: self._start_camera(device_timeout)))
+        return steps
+
+    def _load_motion_engine(self):
+        from motion_detector import create_motion_engine
+        self.motion_detector = create_motion_engine(self.motion_engine_name, self.motion_processing_width)
+        # Alguns motores têm largura padrão própria: é ela que vale como "configurada"
+        self.motion_processing_width = self.motion_detector.processing_width
+        self._motion_quality = (self.motion_processing_width, 1)
+
+    def _start_mic(self, timeout):
+        with self._start_lock:
+            if self._stopped:
+                return
+            self.mic_running = True
+            self._mic_thread.start()
+        self._wait_status(lambda: self.mic_status, timeout)
 
-    def stop(self):
+    def _start_camera(self, timeout):
+        if self.motion_process:
+            from motion_worker import MotionWorker
+        with self._start_lock:
+            if self._stopped:
+                return
+            self.camera_running = True
+            if self.motion_process:
+                self.motion_worker = MotionWorker(self.video_backend,
+                                                  max_height=settings.CAM_FRAME_HEIGHT,
+                                                  max_width=settings.CAM_FRAME_WIDTH,
+                                                  engine=self.motion_engine_name,
+                                                  processing_width=self.motion_processing_width)
+                self.motion_worker.start()
+            else:
+                self._camera_thread.start()
+        if self.motion_process:
+            self._wait_status(lambda: self._current_motion()[1], timeout)
+        else:
+            self._wait_status(lambda: self.camera_status, timeout)
+
+    def _wait_status(self, status, timeout):
+        """Espera o dispositivo sair de DEVICE_STARTING (para o progresso refletir a abertura real)"""
+        deadline = time.perf_counter() + timeout
+        while status() == DEVICE_STARTING and not self._stopped and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def stop(self, timeout=2.0):
+        with self._start_lock:
+            self._stopped = True
         self.mic_running = False
+        self.audio_backend.stop()
         self.camera_running = False
+        # Espera as threads saírem (a da câmera libera o backend de vídeo ao sair) antes do
+        # interpretador começar a finalizar: uma thread nativa ainda rodando derruba o processo
+        for thread in (self._mic_thread, self._camera_thread):
+            if thread.ident is not None:
+                thread.join(timeout)
+                if thread.is_alive():
+                    print(f"A thread {thread.name} não terminou em {timeout:.0f} s")
+        if self.motion_worker is not None:
+            self.motion_worker.stop()
+        self.mic_status = DEVICE_STOPPED
+        self.camera_status = DEVICE_STOPPED
 
     def set_breath_multiplier(self, multiplier):
         """Ajusta a sensibilidade do microfone (1.0 = normal, 2.0 = 2x mais sensível)"""
@@ -51,123 +182,165 @@ class InputManager:
         self.motion_threshold = threshold
         print(f"Sensibilidade do movimento ajustada para: {threshold}")
 
-    def _audio_callback(self, indata, frames, time, status):
+    def set_motion_quality(self, processing_width, stride):
+        """Resolução e ritmo da detecção de movimento (None = a largura configurada).
+
+        Nunca processa acima da largura configurada; aplicado pela thread da câmera
+        (ou pelo processo de movimento) no próximo frame.
+        """
+        if processing_width is None:
+            processing_width = self.motion_processing_width
+        elif self.motion_processing_width:
+            processing_width = min(processing_width, self.motion_processing_width)
+        self._motion_quality = (processing_width, stride)
+        if self.motion_worker is not None:
+            self.motion_worker.set_motion_quality(processing_width, stride)
+
+    def _audio_callback(self, indata, frames, time_info, status):
         if status:
             print(f"Erro no microfone: {status}")
         
-        # Calcula a RMS (Root Mean Square) como uma boa métrica de intensidade
-        rms = np.sqrt(np.mean(indata**2))
-        
-        # Aplica filtro de ruído mais rigoroso
-        if rms > self.noise_threshold:
-            # Adiciona ao histórico
-            self.breath_history.append(rms)
-            if len(self.breath_history) > self.history_size:
-                self.breath_history.pop(0)
-            
-            # Calcula média móvel para suavizar o sinal
-            filtered_rms = np.mean(self.breath_history)
-            
-            # Aplica um filtro adicional para reduzir picos
-            if filtered_rms > 0.1:  # Só considera sopros mais fortes
-                self.breath_intensity = float(filtered_rms)
-            else:
-                # Para sopros muito fracos, diminui gradualmente
-                self.breath_intensity = max(0, self.breath_intensity * 0.8)
-        else:
-            # Se abaixo do threshold, diminui mais rapidamente
-            self.breath_intensity = max(0, self.breath_intensity * 0.7)
-            # Limpa o histórico quando não há sopro
-            if self.breath_intensity < 0.001:
-                self.breath_history.clear()
+        captured_at = time.perf_counter()
+        self.latency.record_audio_device(time_info)
+        # Canal 0 como view (sem cópia); o processamento não aloca por bloco
+        processor = self.breath_processor
+        intensity = processor.process(self.decimator.process(indata[:, 0]))
+        self.calibrator.update(processor)
+        self._breath_sample = (self._breath_sample[0] + 1, captured_at, intensity, processor.is_breath)
+        self.mic_status = DEVICE_OK
+        self.latency.record_audio_callback(captured_at, time.perf_counter(), self.mic_block_period, status)
 
     def _listen_mic(self):
         try:
-            with sd.InputStream(device=self.mic_id, channels=1, callback=self._audio_callback,
-                                samplerate=self.mic_samplerate, blocksize=1024):
-                while self.mic_running:
-                    sd.sleep(100)
+            self.audio_backend.run(self._audio_callback, lambda: self.mic_running)
+            # Replays de arquivo terminam antes do jogo: zera o sopro em vez de congelar o último valor
+            self.breath_processor.reset()
+            self._breath_sample = (self._breath_sample[0] + 1, time.perf_counter(), 0.0, False)
+            self.mic_status = DEVICE_STOPPED
         except Exception as e:
             print(f"Não foi possível iniciar o microfone: {e}")
-            self.breath_intensity = -1 # Sinaliza erro
+            self.mic_status = DEVICE_ERROR if self._breath_sample[0] else DEVICE_UNAVAILABLE
 
     def _process_camera(self):
         """Processa a câmera para detecção de movimento"""
         try:
-            self.camera = cv2.VideoCapture(self.cam_id)
-            if not self.camera.isOpened():
+            if not self.video_backend.open():
                 print(f"Não foi possível abrir a câmera {self.cam_id}")
+                self.camera_status = DEVICE_UNAVAILABLE
                 return
+            self.camera = self.video_backend
+            self.camera_status = DEVICE_OK
+            frame_count = 0
                 
             while self.camera_running:
                 ret, frame = self.camera.read()
                 if not ret:
+                    if not self.camera.is_opened():
+                        break
                     continue
+                captured_at = self.camera.captured_at or time.perf_counter()
+                self.frame_buffer.publish(frame, captured_at)
                     
-                # Processa frame para detecção de movimento
-                self._detect_motion(frame)
+                # Processa frame para detecção de movimento (1 de cada stride com o governador reduzindo)
+                processing_width, stride = self._motion_quality
+                self.motion_detector.set_processing_width(processing_width)
+                frame_count += 1
+                if frame_count % stride == 0:
+                    self._detect_motion(frame, captured_at)
                 
-                # Pequena pausa para não sobrecarregar
-                cv2.waitKey(1)
+                # Pequena pausa para não sobrecarregar (cv2.waitKey falha no OpenCV headless)
+                time.sleep(0.001)
                 
+            if self.camera_status == DEVICE_OK:
+                self.camera_status = DEVICE_STOPPED
         except Exception as e:
             print(f"Erro na câmera: {e}")
+            self.camera_status = DEVICE_ERROR
         finally:
-            if self.camera:
-                self.camera.release()
+            self.video_backend.release()
 
-    def _detect_motion(self, frame):
+    def _detect_motion(self, frame, captured_at):
         """Detecta movimento usando diferença entre frames"""
-        # Converte para escala de cinza
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
-        
-        if self.prev_frame is None:
-            self.prev_frame = gray
+        intensity = self.motion_detector.process(frame)
+        if intensity is None:
             return
-        
-        # Calcula diferença entre frames
-        frame_delta = cv2.absdiff(self.prev_frame, gray)
-        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
-        
-        # Dilata para preencher buracos
-        thresh = cv2.dilate(thresh, None, iterations=2)
-        
-        # Encontra contornos
-        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Calcula intensidade do movimento
-        motion_area = 0
-        for contour in contours:
-            if cv2.contourArea(contour) > 500:  # Filtra ruído
-                motion_area += cv2.contourArea(contour)
-        
-        # Normaliza a intensidade do movimento
-        frame_area = frame.shape[0] * frame.shape[1]
-        self.motion_intensity = min(100.0, (motion_area / frame_area) * 10000)
-        
-        # Define se há movimento detectado
-        self.motion_detected = self.motion_intensity > self.motion_threshold
-        
-        # Atualiza frame anterior
-        self.prev_frame = gray
+        self._motion_sample = (self._motion_sample[0] + 1, captured_at, intensity)
+
+    def _current_motion(self):
+        """Retorna (seq, timestamp, intensidade) do movimento e o estado da câmera"""
+        worker = self.motion_worker
+        if worker is None:
+            return self._motion_sample, self.camera_status
+        sample = worker.read_result()
+        if worker.camera_failed:
+            status = DEVICE_UNAVAILABLE
+        elif worker.alive:
+            status = DEVICE_OK if sample[0] else DEVICE_STARTING
+        else:
+            status = DEVICE_STOPPED if self.camera_status == DEVICE_STOPPED else DEVICE_ERROR
+        return sample, status
+
+    def capture_stats(self):
+        """fps real da câmera, frames descartados e idade do frame (None se a fonte não mede)"""
+        if self.motion_worker is not None:
+            return self.motion_worker.capture_stats()
+        stats = self.video_backend.stats
+        return stats.summary() if stats is not None else None
+
+    def poll(self):
+        """Publica o snapshot do tick atual; chamado uma vez por frame pelo loop do jogo"""
+        breath_seq, breath_time, breath_raw, is_breath = self._breath_sample
+        (motion_seq, motion_time, motion_intensity), camera_status = self._current_motion()
+        self.tick += 1
+        self.snapshot = InputSnapshot(
+            tick=self.tick,
+            timestamp=time.perf_counter(),
+            breath_intensity=breath_raw * self.breath_multiplier,
+            breath_raw=breath_raw,
+            breath_is_breath=is_breath,
+            breath_seq=breath_seq,
+            breath_timestamp=breath_time,
+            mic_status=self.mic_status,
+            motion_detected=motion_intensity > self.motion_threshold,
+            motion_intensity=motion_intensity,
+            motion_seq=motion_seq,
+            motion_timestamp=motion_time,
+            camera_status=camera_status,
+        )
+        return self.snapshot
+
+    @property
+    def calibration(self):
+        """Última CalibrationEstimate publicada pela thread de áudio"""
+        return self.calibrator.estimate
+
+    def get_snapshot(self):
+        """Retorna o snapshot imutável publicado no tick atual"""
+        return self.snapshot
 
     def get_breath_intensity(self):
         """Retorna a intensidade do sopro com multiplicador ajustável"""
-        return self.breath_intensity * self.breath_multiplier
+        return self._breath_sample[2] * self.breath_multiplier
 
     def get_motion_detected(self):
         """Retorna se há movimento detectado"""
-        return self.motion_detected
+        return self._current_motion()[0][2] > self.motion_threshold
 
     def get_motion_intensity(self):
         """Retorna a intensidade do movimento (0-100)"""
-        return self.motion_intensity
+        return self._current_motion()[0][2]
+
+    def get_latest_frame(self):
+        """Retorna (seq, frame) do frame mais novo da câmera, sem bloquear nem copiar.
+
+        O frame só é válido até a próxima chamada; seq permite saber se ele mudou.
+        """
+        if self.motion_worker is not None:
+            seq, _, frame = self.motion_worker.read_preview()
+        else:
+            seq, _, frame = self.frame_buffer.latest()
+        return seq, frame
 
     def get_camera_frame(self):
         """Retorna o frame atual da câmera para exibição"""
-        if self.camera and self.camera.isOpened():
-            ret, frame = self.camera.read()
-            if ret:
-                return frame
-        return None
\ No newline at end of file
+        return self.get_latest_frame()[1]
\ No newline at end of file
@@ -0,0 +1,55 @@
+# input_snapshot.py
+from dataclasses import dataclass
+
+# Estados dos dispositivos de entrada
+DEVICE_STARTING = "starting"
+DEVICE_OK = "ok"
+DEVICE_UNAVAILABLE = "unavailable"  # Dispositivo não encontrado/não abriu
+DEVICE_ERROR = "error"  # Falhou durante o uso
+DEVICE_STOPPED = "stopped"  # Parado (fim do jogo ou fim de um replay)
+
+
+@dataclass(frozen=True, slots=True)
+class InputSnapshot:
+    """Leitura consistente de todas as entradas, publicada uma vez por tick do jogo.
+
+    Os timestamps são time.perf_counter() do momento da captura (bloco de áudio
+    ou frame da câmera); os seq contam blocos/frames processados, então uma
+    cena pode saber se o valor é novo desde o tick anterior.
+    """
+
+    tick: int = 0
+    timestamp: float = 0.0
+
+    # Sopro
+    breath_intensity: float = 0.0  # Já multiplicado pela sensibilidade (como get_breath_intensity)
+    breath_raw: float = 0.0  # RMS filtrado, sem multiplicador
+    breath_is_breath: bool = False  # Assinatura espectral de sopro no último bloco
+    breath_seq: int = 0
+    breath_timestamp: float = 0.0
+    mic_status: str = DEVICE_STARTING
+
+    # Movimento
+    motion_detected: bool = False
+    motion_intensity: float = 0.0
+    motion_seq: int = 0
+    motion_timestamp: float = 0.0
+    camera_status: str = DEVICE_STARTING
+
+    @property
+    def mic_ok(self):
+        return self.mic_status == DEVICE_OK
+
+    @property
+    def camera_ok(self):
+        return self.camera_status == DEVICE_OK
+
+    @property
+    def breath_age(self):
+        """Idade (s) do último bloco de áudio no momento do snapshot"""
+        return self.timestamp - self.breath_timestamp if self.breath_seq else 0.0
+
+    @property
+    def motion_age(self):
+        """Idade (s) do último frame analisado no momento do snapshot"""
+        return self.timestamp - self.motion_timestamp if self.motion_seq else 0.0
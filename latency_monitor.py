@@ -0,0 +1,165 @@
+# latency_monitor.py
+# Mede a latência de ponta a ponta: da captura (bloco de áudio / frame da câmera)
+# até o consumo na cena e até o frame aparecer na tela (pygame.display.flip).
+import json
+import time
+
+import numpy as np
+
+from breath_processor import RingBuffer
+
+# Etapas medidas (todas em segundos, relógio time.perf_counter)
+STAGE_AUDIO_DEVICE = "audio_device"  # ADC -> callback (quando o driver informa)
+STAGE_AUDIO_TO_UPDATE = "audio_to_update"  # callback -> consumo na cena
+STAGE_CAMERA_TO_UPDATE = "camera_to_update"  # captura do frame -> consumo na cena
+STAGE_UPDATE_TO_FLIP = "update_to_flip"  # consumo na cena -> flip
+STAGE_AUDIO_TO_FLIP = "audio_to_flip"  # callback -> flip (sopro até o barco se mover na tela)
+STAGE_CAMERA_TO_FLIP = "camera_to_flip"  # captura do frame -> flip
+STAGE_AUDIO_CALLBACK = "audio_callback"  # duração do processamento de um bloco no callback
+STAGE_AUDIO_JITTER = "audio_jitter"  # |intervalo entre callbacks - duração do bloco|
+
+STAGES = (
+    STAGE_AUDIO_DEVICE,
+    STAGE_AUDIO_TO_UPDATE,
+    STAGE_CAMERA_TO_UPDATE,
+    STAGE_UPDATE_TO_FLIP,
+    STAGE_AUDIO_TO_FLIP,
+    STAGE_CAMERA_TO_FLIP,
+    STAGE_AUDIO_CALLBACK,
+    STAGE_AUDIO_JITTER,
+)
+
+# Histograma exportado: faixas de 5 ms até 250 ms (a última faixa acumula o resto)
+HISTOGRAM_EDGES_MS = np.append(np.arange(0.0, 255.0, 5.0), np.inf)
+
+
+class LatencyMonitor:
+    """Guarda as últimas amostras de cada etapa em buffers circulares pré-alocados.
+
+    Cada etapa é escrita por uma única thread: a de áudio escreve audio_device,
+    audio_callback e audio_jitter (e os contadores de estouro); a principal escreve
+    as etapas de consumo e de flip. Gravar uma amostra custa uma atribuição.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._samples = {stage: RingBuffer(capacity) for stage in STAGES}
+        self._totals = dict.fromkeys(STAGES, 0)
+        self._last_breath_seq = 0
+        self._last_motion_seq = 0
+        self._pending = None  # (consumido_em, captura_áudio, captura_câmera) até o próximo flip
+        self._last_audio_callback = None
+        self.audio_overruns = 0  # Callbacks mais longos que o próprio bloco (o driver perderia amostras)
+        self.audio_overflows = 0  # Blocos que o driver marcou com input_overflow
+        self._report_cache = None
+        self._report_time = 0.0
+
+    def record(self, stage, seconds):
+        self._samples[stage].push(seconds)
+        self._totals[stage] += 1
+
+    def record_audio_device(self, time_info):
+        """Latência do driver a partir do time_info do callback do sounddevice"""
+        if time_info is None:
+            return
+        adc_time = getattr(time_info, 'inputBufferAdcTime', 0.0)
+        current_time = getattr(time_info, 'currentTime', 0.0)
+        if adc_time > 0 and current_time >= adc_time:
+            self.record(STAGE_AUDIO_DEVICE, current_time - adc_time)
+
+    def record_audio_callback(self, started, finished, period, status=None):
+        """Duração do callback e desvio do intervalo entre callbacks (só a thread de áudio chama)"""
+        duration = finished - started
+        self.record(STAGE_AUDIO_CALLBACK, duration)
+        if self._last_audio_callback is not None:
+            self.record(STAGE_AUDIO_JITTER, abs(started - self._last_audio_callback - period))
+        self._last_audio_callback = started
+        if duration > period:
+            self.audio_overruns += 1
+        if status is not None and getattr(status, 'input_overflow', False):
+            self.audio_overflows += 1
+
+    def mark_consumed(self, snapshot):
+        """Chamado pela cena quando usa as entradas do snapshot no update"""
+        now = time.perf_counter()
+        breath_time = None
+        motion_time = None
+        if snapshot.breath_seq and snapshot.breath_seq != self._last_breath_seq:
+            # Só amostras novas: repetir o mesmo bloco em vários frames inflaria a latência
+            self._last_breath_seq = snapshot.breath_seq
+            breath_time = snapshot.breath_timestamp
+            self.record(STAGE_AUDIO_TO_UPDATE, now - breath_time)
+        if snapshot.motion_seq and snapshot.motion_seq != self._last_motion_seq:
+            self._last_motion_seq = snapshot.motion_seq
+            motion_time = snapshot.motion_timestamp
+            self.record(STAGE_CAMERA_TO_UPDATE, now - motion_time)
+        if breath_time is not None or motion_time is not None:
+            self._pending = (now, breath_time, motion_time)
+
+    def mark_presented(self):
+        """Chamado logo após pygame.display.flip"""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        now = time.perf_counter()
+        consumed_at, breath_time, motion_time = pending
+        self.record(STAGE_UPDATE_TO_FLIP, now - consumed_at)
+        if breath_time is not None:
+            self.record(STAGE_AUDIO_TO_FLIP, now - breath_time)
+        if motion_time is not None:
+            self.record(STAGE_CAMERA_TO_FLIP, now - motion_time)
+
+    def report(self):
+        """Percentis por etapa em milissegundos (só etapas com amostras)"""
+        report = {}
+        for stage in STAGES:
+            values = self._samples[stage].values()
+            if len(values) == 0:
+                continue
+            ms = values * 1000.0
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            report[stage] = {
+                'count': self._totals[stage],
+                'mean': float(ms.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(ms.max()),
+            }
+        if STAGE_AUDIO_CALLBACK in report:
+            report[STAGE_AUDIO_CALLBACK]['overruns'] = self.audio_overruns
+            report[STAGE_AUDIO_CALLBACK]['overflows'] = self.audio_overflows
+        return report
+
+    def live_report(self, max_age=0.5):
+        """Relatório recalculado no máximo a cada max_age segundos (para o overlay)"""
+        now = time.perf_counter()
+        if self._report_cache is None or now - self._report_time > max_age:
+            self._report_cache = self.report()
+            self._report_time = now
+        return self._report_cache
+
+    def format_lines(self, report=None):
+        report = self.report() if report is None else report
+        lines = []
+        for stage, stats in report.items():
+            line = (f"{stage:<17} p50 {stats['p50']:6.1f}  p95 {stats['p95']:6.1f}  "
+                    f"p99 {stats['p99']:6.1f} ms  (n={stats['count']})")
+            if 'overruns' in stats:
+                line += f"  estouros {stats['overruns']}, overflows {stats['overflows']}"
+            lines.append(line)
+        return lines
+
+    def export(self, path):
+        """Grava percentis e histogramas (faixas de 5 ms) em JSON"""
+        report = self.report()
+        for stage, stats in report.items():
+            counts, _ = np.histogram(self._samples[stage].values() * 1000.0, bins=HISTOGRAM_EDGES_MS)
+            stats['histogram_ms'] = {
+                'edges': [float(edge) for edge in HISTOGRAM_EDGES_MS[:-1]],
+                'counts': counts.tolist(),
+            }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=4)
+        return report
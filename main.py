@@ -1,9 +1,15 @@
 # main.py
+import time
 import pygame
 import settings
+from text_cache import get_font, render_text, text_cache
+from asset_manager import asset_manager
 from input_manager import InputManager
+from input_backends import create_audio_backend, create_video_backend
 from scene_manager import SceneManager
 from profile_manager import ProfileManager
+from startup import BackgroundInitializer
+from quality_governor import QualityGovernor, build_levels
 
 class Game:
     def __init__(self):
@@ -14,33 +20,193 @@ class Game:
         pygame.display.set_caption(settings.TITLE)
         self.clock = pygame.time.Clock()
         
-        self.input_manager = InputManager(mic_id=settings.MIC_DEVICE_ID)
+        audio_backend = create_audio_backend(settings.AUDIO_BACKEND, settings.MIC_DEVICE_ID,
+                                             settings.MIC_SAMPLE_RATE, settings.MIC_BLOCK_SIZE,
+                                             speed=settings.INPUT_REPLAY_SPEED, latency=settings.MIC_LATENCY)
+        video_backend = create_video_backend(settings.VIDEO_BACKEND, settings.CAM_DEVICE_ID,
+                                             speed=settings.INPUT_REPLAY_SPEED,
+                                             width=settings.CAM_FRAME_WIDTH, height=settings.CAM_FRAME_HEIGHT,
+                                             fps=settings.CAM_FPS, fourcc=settings.CAM_FOURCC,
+                                             buffer_size=settings.CAM_BUFFER_SIZE)
+        self.input_manager = InputManager(mic_id=settings.MIC_DEVICE_ID,
+                                          cam_id=settings.CAM_DEVICE_ID,
+                                          audio_backend=audio_backend,
+                                          video_backend=video_backend,
+                                          motion_process=settings.MOTION_WORKER_PROCESS,
+                                          motion_engine=settings.MOTION_ENGINE,
+                                          motion_processing_width=settings.MOTION_PROCESSING_WIDTH,
+                                          mic_downsample=settings.MIC_DOWNSAMPLE,
+                                          mic_smoothing=settings.MIC_SMOOTHING)
         self.profile_manager = ProfileManager()
         self.scene_manager = SceneManager(self.input_manager, self.profile_manager)
+        
+        # OpenCV, microfone e câmera são preparados em segundo plano (ver run)
+        self.initializer = BackgroundInitializer(self.input_manager.startup_steps())
+        self.startup_overlay = True
+        
+        # Qualidade adaptativa para manter o fps (ver quality_governor)
+        self.quality = QualityGovernor(
+            settings.FPS,
+            build_levels(settings.QUALITY_MOTION_WIDTH, settings.QUALITY_MOTION_STRIDE,
+                         settings.QUALITY_RENDER_DIVISOR),
+            window=settings.QUALITY_WINDOW_FRAMES,
+            downgrade_at=settings.QUALITY_DOWNGRADE_AT,
+            upgrade_at=settings.QUALITY_UPGRADE_AT,
+            recover_seconds=settings.QUALITY_RECOVER_SECONDS,
+            log_path=settings.QUALITY_LOG_PATH,
+        ) if settings.QUALITY_GOVERNOR else None
+        self.frame_rate = settings.FPS
+        
+        self.show_latency = settings.LATENCY_OVERLAY
+        self.overlay_font = get_font(16)
+        self.screen_area = settings.SCREEN_WIDTH * settings.SCREEN_HEIGHT
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.skipped_updates = 0
 
     def run(self):
-        self.input_manager.start()
+        self.initializer.start()
+        previous = time.perf_counter()
         
         while self.scene_manager.running:
+            # Tempo real do frame; limitado para uma pausa longa (janela arrastada) não virar uma avalanche de passos
+            now = time.perf_counter()
+            frame_time = min(now - previous, 0.25)
+            previous = now
+            
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     self.scene_manager.quit_game()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_latency = not self.show_latency
+                    self.scene_manager.mark_dirty()
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    # A janela foi coberta/restaurada: o conteúdo precisa ser refeito
+                    self.scene_manager.mark_dirty()
+            
+            # Uma leitura consistente das entradas por tick, compartilhada por todas as cenas
+            self.input_manager.poll()
             
             self.scene_manager.handle_events(events)
-            self.scene_manager.update()
+            self.scene_manager.update(frame_time)
             
-            self.screen.fill(settings.BLACK)
+            dirty_mode = settings.DIRTY_RECT_RENDERING and self.scene_manager.supports_dirty_rects()
+            # Mais um redesenho completo depois de pronto apaga a barra de progresso
+            startup_overlay = self.startup_overlay
+            self.startup_overlay = not self.initializer.done
+            if startup_overlay and not self.startup_overlay:
+                print(f"Dispositivos prontos em {self.initializer.total_time:.2f} s")
+            if not dirty_mode or self.show_latency or startup_overlay:
+                # Sem retângulos sujos a cena redesenha tudo sobre a tela limpa
+                # (o overlay muda de tamanho a cada atualização e deixaria restos na tela)
+                self.scene_manager.mark_dirty()
+                self.screen.fill(settings.BLACK)
             self.scene_manager.draw(self.screen)
+            rects = self.scene_manager.consume_dirty_rects()
+            if self.show_latency:
+                self._draw_latency_overlay()
+            if self.startup_overlay:
+                self._draw_startup_progress()
             
-            pygame.display.flip()
-            self.clock.tick(settings.FPS)
+            self._present(rects)
+            # Trabalho do frame (sem a espera do clock): é o que o governador compara com o orçamento
+            if self.quality is not None and not startup_overlay:
+                level = self.quality.record(time.perf_counter() - now)
+                if level is not None:
+                    self._apply_quality(level)
+            self.clock.tick(self.frame_rate)
             
         self.quit()
 
+    def _apply_quality(self, level):
+        """Aplica um nível novo do QualityGovernor"""
+        self.input_manager.set_motion_quality(level.motion_width, level.motion_stride)
+        self.scene_manager.quality = level
+        self.scene_manager.mark_dirty()
+        self.frame_rate = settings.FPS // level.render_divisor
+
+    def _present(self, rects):
+        """Envia o frame para a tela: flip completo ou só as regiões alteradas"""
+        if rects is not None:
+            changed = sum(rect.width * rect.height for rect in rects)
+            if changed > self.screen_area * settings.DIRTY_RECT_MAX_COVERAGE:
+                rects = None  # Mudou muita coisa: um flip sai mais barato que várias cópias
+        if rects is None:
+            pygame.display.flip()
+            self.full_flips += 1
+        elif rects:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+        else:
+            # Nada mudou: nenhuma cópia para a janela neste frame
+            self.skipped_updates += 1
+            return
+        self.input_manager.latency.mark_presented()
+
+    def _draw_startup_progress(self):
+        """Barra de progresso da inicialização dos dispositivos no rodapé"""
+        initializer = self.initializer
+        bar = pygame.Rect(20, settings.SCREEN_HEIGHT - 30, 200, 8)
+        pygame.draw.rect(self.screen, settings.GREY, bar, 1)
+        pygame.draw.rect(self.screen, settings.WHITE, (bar.x, bar.y, bar.width * initializer.progress, bar.height))
+        label = initializer.current or "Pronto"
+        surf = render_text(self.overlay_font, f"{label}...", True, settings.WHITE)
+        self.screen.blit(surf, (bar.right + 10, bar.centery - surf.get_height() // 2))
+
+    def _draw_latency_overlay(self):
+        """Percentis de latência ao vivo no canto superior direito"""
+        lines = self.input_manager.latency.format_lines(self.input_manager.latency.live_report())
+        if not lines:
+            lines = ["Latência: aguardando amostras..."]
+        cache = text_cache.stats()
+        lines.append(f"Cache de texto: {cache['entries']} superfícies, "
+                     f"{cache['hit_rate'] * 100:.0f}% acertos, {cache['bytes'] / 1024:.0f} KiB")
+        assets = asset_manager.stats()
+        lines.append(f"Imagens: {assets['entries']} superfícies, {assets['preloaded']} pré-carregadas, "
+                     f"{assets['bytes'] / 1024:.0f} KiB")
+        scenes = self.scene_manager
+        lines.append(f"Simulação: {scenes.ticks} passos, {scenes.last_steps} neste frame, "
+                     f"{scenes.dropped_time:.2f} s descartados")
+        capture = self.input_manager.capture_stats()
+        if capture is not None:
+            lines.append(f"Câmera: {capture['fps']:.1f} fps, {capture['dropped']}/{capture['captured']} "
+                         f"frames descartados, idade {capture['age'] * 1000:.1f} ms")
+        if self.quality is not None:
+            quality = self.quality
+            lines.append(f"Qualidade: nível {quality.level}/{len(quality.levels) - 1} ({quality.current.name}), "
+                         f"frame p95 {quality.last_p95 * 1000:.1f} ms")
+        lines.append(f"Tela: {self.full_flips} flips, {self.partial_updates} parciais, "
+                     f"{self.skipped_updates} sem mudança")
+        y = 10
+        for line in lines:
+            surf = render_text(self.overlay_font, line, True, settings.WHITE, settings.BLACK)
+            self.screen.blit(surf, (settings.SCREEN_WIDTH - surf.get_width() - 10, y))
+            y += surf.get_height() + 2
+
     def quit(self):
         print("Encerrando Aetheria...")
+        self.scene_manager.shutdown()
+        # Fechar a janela durante a inicialização: nenhuma etapa nova começa, e a que está
+        # rodando termina antes do stop() (senão ela religaria a câmera/microfone depois)
+        self.initializer.cancel()
+        self.initializer.wait(5.0)  # Cada etapa espera o dispositivo no máximo 3 s
         self.input_manager.stop()
+        self.profile_manager.close()
+        assets = asset_manager.stats()
+        print(f"Cache de imagens: {assets['entries']} superfícies, {assets['hits']} acertos, "
+              f"{assets['misses']} carregamentos, {assets['bytes'] / 1024:.0f} KiB")
+        if self.quality is not None and self.quality.changes:
+            times = self.quality.time_at_levels()
+            spent = ", ".join(f"{level.name} {seconds:.0f} s" for level, seconds in zip(self.quality.levels, times)
+                              if seconds >= 0.5)
+            print(f"Qualidade: {len(self.quality.changes)} mudanças de nível ({spent})")
+        latency = self.input_manager.latency
+        if settings.LATENCY_REPORT_PATH and latency.report():
+            latency.export(settings.LATENCY_REPORT_PATH)
+            for line in latency.format_lines():
+                print(line)
+            print(f"Relatório de latência salvo em {settings.LATENCY_REPORT_PATH}")
         pygame.quit()
 
 if __name__ == '__main__':
@@ -0,0 +1,232 @@
+# motion_detector.py
+# Motores de detecção de movimento. Todos recebem frames BGR e retornam uma
+# intensidade de 0 a 100 (None enquanto ainda não têm referência), então podem
+# ser trocados sem mexer no InputManager nem no limiar de sensibilidade.
+import cv2
+import numpy as np
+
+
+class MotionEngine:
+    """Base dos motores: cuida da conversão para cinza e da resolução de processamento"""
+
+    name = None
+
+    def __init__(self, processing_width=None):
+        # None ou 0 = resolução original da câmera
+        self.processing_width = processing_width
+        self.scale = 1.0
+
+    def _prepare(self, frame):
+        """Converte para cinza na resolução de processamento"""
+        height, width = frame.shape[:2]
+        if self.processing_width and width > self.processing_width:
+            self.scale = self.processing_width / width
+            size = (self.processing_width, max(1, int(round(height * self.scale))))
+            # Reduzir antes de converter as cores processa menos pixels
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        else:
+            self.scale = 1.0
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    def process(self, frame):
+        """Retorna a intensidade do movimento (0-100), ou None sem frame de referência"""
+        raise NotImplementedError
+
+    def set_processing_width(self, processing_width):
+        """Troca a resolução de processamento (a referência do motor recomeça)"""
+        if processing_width != self.processing_width:
+            self.processing_width = processing_width
+            self.reset()
+
+    def reset(self):
+        pass
+
+
+def _odd(value):
+    value = max(1, int(round(value)))
+    return value if value % 2 else value + 1
+
+
+def _area_intensity(mask):
+    """Converte uma máscara binária em intensidade (mesma escala do detector original)"""
+    ratio = cv2.countNonZero(mask) / float(mask.shape[0] * mask.shape[1])
+    return min(100.0, ratio * 10000)
+
+
+class FrameDiffEngine(MotionEngine):
+    """Diferença entre frames + contornos (o método original do jogo)"""
+
+    name = 'diff'
+
+    def __init__(self, processing_width=None, min_contour_area=500):
+        super().__init__(processing_width)
+        self.min_contour_area = min_contour_area  # Em pixels da resolução original
+        self.prev_frame = None
+
+    def process(self, frame):
+        gray = self._prepare(frame)
+        # Blur e área mínima acompanham a escala para manter o comportamento em resolução reduzida
+        kernel = _odd(21 * self.scale)
+        gray = cv2.GaussianBlur(gray, (kernel, kernel), 0)
+
+        if self.prev_frame is None or self.prev_frame.shape != gray.shape:
+            self.prev_frame = gray
+            return None
+
+        # Calcula diferença entre frames
+        frame_delta = cv2.absdiff(self.prev_frame, gray)
+        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
+
+        # Dilata para preencher buracos
+        thresh = cv2.dilate(thresh, None, iterations=2)
+
+        # Encontra contornos
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # Calcula intensidade do movimento
+        min_area = self.min_contour_area * self.scale * self.scale
+        motion_area = 0
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area > min_area:  # Filtra ruído
+                motion_area += area
+
+        # Atualiza frame anterior
+        self.prev_frame = gray
+
+        # Normaliza a intensidade do movimento
+        frame_area = gray.shape[0] * gray.shape[1]
+        return min(100.0, (motion_area / frame_area) * 10000)
+
+    def reset(self):
+        self.prev_frame = None
+
+
+class PyramidDiffEngine(MotionEngine):
+    """Diferença entre frames em uma pirâmide reduzida, sem contornos (área de pixels alterados)"""
+
+    name = 'pyramid'
+
+    def __init__(self, processing_width=None, levels=2):
+        super().__init__(processing_width)
+        self.levels = levels  # Cada nível divide a resolução por 2
+        self.prev_frame = None
+
+    def process(self, frame):
+        gray = self._prepare(frame)
+        for _ in range(self.levels):
+            gray = cv2.pyrDown(gray)  # pyrDown já suaviza (gaussiano 5x5)
+
+        if self.prev_frame is None or self.prev_frame.shape != gray.shape:
+            self.prev_frame = gray
+            return None
+
+        frame_delta = cv2.absdiff(self.prev_frame, gray)
+        self.prev_frame = gray
+        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
+        thresh = cv2.dilate(thresh, None, iterations=1)
+        return _area_intensity(thresh)
+
+    def reset(self):
+        self.prev_frame = None
+
+
+class MOG2Engine(MotionEngine):
+    """Subtração de fundo MOG2: robusta a ruído de sensor, mas absorve quem fica parado"""
+
+    name = 'mog2'
+
+    def __init__(self, processing_width=320, history=300, var_threshold=25, learning_rate=-1):
+        super().__init__(processing_width)
+        self.history = history
+        self.var_threshold = var_threshold
+        self.learning_rate = learning_rate
+        self._kernel = np.ones((3, 3), dtype=np.uint8)
+        self.subtractor = None
+        self.frames_seen = 0
+        self.reset()
+
+    def process(self, frame):
+        gray = self._prepare(frame)
+        mask = self.subtractor.apply(gray, learningRate=self.learning_rate)
+        self.frames_seen += 1
+        if self.frames_seen < 2:
+            return None
+        # Abertura morfológica remove pixels isolados de ruído
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
+        return _area_intensity(mask)
+
+    def reset(self):
+        self.subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=self.history, varThreshold=self.var_threshold, detectShadows=False)
+        self.frames_seen = 0
+
+
+class OpticalFlowEngine(MotionEngine):
+    """Fluxo óptico esparso (Lucas-Kanade): fração dos pontos rastreados que se moveram"""
+
+    name = 'flow'
+
+    def __init__(self, processing_width=320, max_points=150, min_displacement=1.5, redetect_every=15):
+        super().__init__(processing_width)
+        self.max_points = max_points
+        self.min_displacement = min_displacement  # Em pixels da resolução de processamento
+        self.redetect_every = redetect_every
+        self.prev_frame = None
+        self.points = None
+        self._frames_since_detect = 0
+
+    def _detect(self, gray):
+        self.points = cv2.goodFeaturesToTrack(gray, self.max_points, 0.01, 7)
+        self._frames_since_detect = 0
+
+    def process(self, frame):
+        gray = self._prepare(frame)
+        if self.prev_frame is None or self.prev_frame.shape != gray.shape:
+            self.prev_frame = gray
+            self._detect(gray)
+            return None
+
+        if self.points is None or len(self.points) < 8 or self._frames_since_detect >= self.redetect_every:
+            self._detect(self.prev_frame)
+        if self.points is None:
+            self.prev_frame = gray
+            return 0.0
+
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_frame, gray, self.points, None,
+                                                         winSize=(15, 15), maxLevel=2)
+        self.prev_frame = gray
+        self._frames_since_detect += 1
+
+        tracked = status.reshape(-1) == 1
+        if not tracked.any():
+            self.points = None
+            return 0.0
+        displacement = np.linalg.norm((new_points - self.points).reshape(-1, 2)[tracked], axis=1)
+        moving = np.count_nonzero(displacement > self.min_displacement)
+        self.points = new_points[tracked].reshape(-1, 1, 2)
+        return min(100.0, moving / float(tracked.sum()) * 100.0)
+
+    def reset(self):
+        self.prev_frame = None
+        self.points = None
+
+
+MOTION_ENGINES = {
+    FrameDiffEngine.name: FrameDiffEngine,
+    PyramidDiffEngine.name: PyramidDiffEngine,
+    MOG2Engine.name: MOG2Engine,
+    OpticalFlowEngine.name: OpticalFlowEngine,
+}
+
+
+def create_motion_engine(name='diff', processing_width=None, **options):
+    """Cria um motor pelo nome ('diff', 'pyramid', 'mog2', 'flow')"""
+    try:
+        engine_class = MOTION_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Motor de movimento desconhecido: {name} "
+                         f"(opções: {', '.join(MOTION_ENGINES)})") from None
+    if processing_width is not None:
+        options['processing_width'] = processing_width
+    return engine_class(**options)
@@ -0,0 +1,310 @@
+# motion_worker.py
+# Processo separado para captura da câmera e detecção de movimento.
+# O processo do jogo só lê os resultados (e, quando pedido, o frame de prévia)
+# de um bloco de memória compartilhada, sem disputar o GIL com o loop do pygame.
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from frame_buffer import LatestFrameBuffer
+
+# Layout do cabeçalho (float64) no início da memória compartilhada
+_SEQ = 0  # Número de sequência (ímpar = escrita em andamento)
+_TIMESTAMP = 1  # perf_counter da captura do frame
+_INTENSITY = 2  # Intensidade do movimento (0-100)
+_HEARTBEAT = 3  # perf_counter da última iteração do worker
+_STATUS = 4
+_PREVIEW_UNTIL = 5  # Escrito pelo jogo: worker publica frames de prévia até este instante
+# CaptureStats da câmera (quando a fonte mede), copiados a cada frame
+_CAPTURE_FPS = 6
+_CAPTURED = 7
+_DROPPED = 8
+_FRAME_AGE = 9
+# Escritos pelo jogo (QualityGovernor): largura da detecção (0 = a configurada) e 1 de cada N frames
+_MOTION_WIDTH = 10
+_MOTION_STRIDE = 11
+_HEADER_SIZE = 16
+_HEADER_BYTES = _HEADER_SIZE * 8
+
+STATUS_STARTING = 0
+STATUS_RUNNING = 1
+STATUS_CAMERA_FAILED = 2
+STATUS_STOPPED = 3
+
+
+class SharedMotionState:
+    """Visão numpy sobre a memória compartilhada: cabeçalho + triple buffer de prévia"""
+
+    def __init__(self, shm, max_height, max_width, frame_lock, initialize=False):
+        self.shm = shm
+        self.header = np.ndarray((_HEADER_SIZE,), dtype=np.float64, buffer=shm.buf)
+        if initialize:
+            self.header[:] = 0.0
+        self.frames = LatestFrameBuffer.from_buffer(shm.buf, _HEADER_BYTES, max_height, max_width,
+                                                    frame_lock, initialize=initialize)
+
+    @staticmethod
+    def size(max_height, max_width):
+        return _HEADER_BYTES + LatestFrameBuffer.buffer_size(max_height, max_width)
+
+    def release(self):
+        # As views precisam sumir antes de fechar o mapeamento
+        self.header = None
+        self.frames.detach()
+        self.frames = None
+        self.shm.close()
+
+
+def _attach_shared_memory(name):
+    """Abre a memória criada pelo jogo; quem cria (o jogo) é quem apaga"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: o worker 'spawn' compartilha o resource_tracker do jogo,
+        # então o registro repetido não causa limpeza antecipada
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(shm_name, max_height, max_width, video_backend, stop_event, frame_lock,
+                 engine, processing_width):
+    """Loop do processo worker: captura, detecta e publica"""
+    import cv2
+    from motion_detector import create_motion_engine
+
+    state = SharedMotionState(_attach_shared_memory(shm_name), max_height, max_width, frame_lock)
+    header = state.header
+    detector = create_motion_engine(engine, processing_width)
+    default_width = detector.processing_width  # Largura 0 no cabeçalho = a configurada
+    frame_count = 0
+    try:
+        if not video_backend.open():
+            header[_STATUS] = STATUS_CAMERA_FAILED
+            return
+        header[_STATUS] = STATUS_RUNNING
+
+        while not stop_event.is_set():
+            header[_HEARTBEAT] = time.perf_counter()
+            ret, frame = video_backend.read()
+            if not ret:
+                if not video_backend.is_opened():
+                    break
+                time.sleep(0.001)
+                continue
+            captured_at = video_backend.captured_at or time.perf_counter()
+            stats = video_backend.stats
+            if stats is not None:
+                header[_CAPTURE_FPS] = stats.fps
+                header[_CAPTURED] = stats.captured
+                header[_DROPPED] = stats.dropped
+                header[_FRAME_AGE] = stats.frame_age
+
+            # Prévia só é publicada enquanto o jogo estiver pedindo (ex.: TestScene aberta)
+            if time.perf_counter() < header[_PREVIEW_UNTIL]:
+                height, width = frame.shape[:2]
+                if height > max_height or width > max_width:
+                    scale = min(max_height / height, max_width / width)
+                    preview = cv2.resize(frame, (int(width * scale), int(height * scale)),
+                                         interpolation=cv2.INTER_AREA)
+                else:
+                    preview = frame
+                state.frames.publish(preview, captured_at)
+
+            detector.set_processing_width(int(header[_MOTION_WIDTH]) or default_width)
+            frame_count += 1
+            if frame_count % max(1, int(header[_MOTION_STRIDE])):
+                continue
+            intensity = detector.process(frame)
+            if intensity is None:
+                continue
+
+            # Seqlock: sequência ímpar durante a escrita, par quando consistente
+            seq = header[_SEQ]
+            header[_SEQ] = seq + 1
+            header[_TIMESTAMP] = captured_at
+            header[_INTENSITY] = intensity
+            header[_SEQ] = seq + 2
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if header[_STATUS] == STATUS_RUNNING:
+            header[_STATUS] = STATUS_STOPPED
+        video_backend.release()
+        header = None
+        state.release()
+
+
+class MotionWorker:
+    """Gerencia o processo de detecção de movimento: início, parada e recuperação de falhas"""
+
+    def __init__(self, video_backend, max_height=480, max_width=640, engine='diff',
+                 processing_width=None, max_restarts=5, heartbeat_timeout=3.0):
+        self.video_backend = video_backend
+        self.engine = engine
+        self.processing_width = processing_width
+        self.max_height = max_height
+        self.max_width = max_width
+        self.max_restarts = max_restarts
+        self.heartbeat_timeout = heartbeat_timeout
+
+        # 'spawn' evita herdar o estado do SDL/threads do jogo via fork
+        self._context = mp.get_context('spawn')
+        self._shm = None
+        self._state = None
+        self._process = None
+        self._stop_event = None
+        self._frame_lock = self._context.Lock()
+        self._supervisor = None
+        # _running e _state mudam sob _lock: o supervisor não reinicia o worker nem lê o
+        # header depois que stop() começou. _stopping acorda o supervisor das esperas
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._running = False
+        self.restarts = 0
+        self.camera_failed = False
+
+        self._last_result = (0, 0.0, 0.0)
+
+    def start(self):
+        size = SharedMotionState.size(self.max_height, self.max_width)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._state = SharedMotionState(self._shm, self.max_height, self.max_width,
+                                        self._frame_lock, initialize=True)
+        self.set_motion_quality(self.processing_width, 1)
+        self._stopping.clear()
+        with self._lock:
+            self._running = True
+            self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+
+    def _spawn(self):
+        if self._process is not None:
+            # O worker anterior pode ter morrido no meio de uma troca de slots:
+            # recomeça o triple buffer com um lock novo
+            self._frame_lock = self._context.Lock()
+            self._state.frames.reset(self._frame_lock)
+        header = self._state.header
+        header[_STATUS] = STATUS_STARTING
+        header[_HEARTBEAT] = time.perf_counter()
+        self._stop_event = self._context.Event()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self._shm.name, self.max_height, self.max_width, self.video_backend,
+                  self._stop_event, self._frame_lock, self.engine, self.processing_width),
+            name="aetheria-motion-worker",
+            daemon=True,
+        )
+        self._process.start()
+
+    def _supervise(self):
+        """Reinicia o worker se ele morrer ou travar (sem heartbeat)"""
+        while not self._stopping.wait(0.5):
+            with self._lock:
+                if not self._running or self._state is None:
+                    break
+                header = self._state.header
+                status = header[_STATUS]
+                heartbeat = header[_HEARTBEAT]
+            if status == STATUS_CAMERA_FAILED:
+                if not self.camera_failed:
+                    print("Não foi possível abrir a câmera no processo de movimento")
+                self.camera_failed = True
+                break
+            if status == STATUS_STOPPED and not self._process.is_alive():
+                break  # A fonte terminou (ex.: replay de arquivo)
+
+            stalled = (status == STATUS_RUNNING and
+                       time.perf_counter() - heartbeat > self.heartbeat_timeout)
+            if self._process.is_alive() and not stalled:
+                continue
+
+            if self.restarts >= self.max_restarts:
+                print("Processo de movimento falhou repetidamente; detecção de movimento desativada")
+                break
+            self.restarts += 1
+            print(f"Processo de movimento parou (código {self._process.exitcode}); "
+                  f"reiniciando ({self.restarts}/{self.max_restarts})")
+            self._terminate_process()
+            # Espera crescente entre tentativas para não girar em falso com a câmera ocupada
+            if self._stopping.wait(min(2.0, 0.1 * 2 ** self.restarts)):
+                break
+            with self._lock:
+                # stop() pode ter começado durante a espera: não cria um processo que ninguém encerraria
+                if not self._running:
+                    break
+                self._spawn()
+
+    def _terminate_process(self):
+        if self._process is None:
+            return
+        self._stop_event.set()
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+
+    def stop(self):
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._stopping.set()
+        # O supervisor termina antes de encerrar o worker: nenhum reinício depois daqui
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=5.0)
+            self._supervisor = None
+        self._terminate_process()
+        with self._lock:
+            state, self._state = self._state, None
+        state.release()
+        self._shm.unlink()
+        self._shm = None
+
+    @property
+    def alive(self):
+        return self._running and self._process is not None and self._process.is_alive()
+
+    def read_result(self):
+        """Retorna (seq, timestamp, intensidade) consistentes, sem bloquear"""
+        if self._state is None:
+            return self._last_result
+        header = self._state.header
+        for _ in range(8):
+            seq = header[_SEQ]
+            if seq % 2:
+                continue
+            timestamp = header[_TIMESTAMP]
+            intensity = header[_INTENSITY]
+            if header[_SEQ] == seq:
+                self._last_result = (int(seq) // 2, timestamp, intensity)
+                break
+        # Se o worker estiver no meio de uma escrita, devolve o último resultado consistente
+        return self._last_result
+
+    def set_motion_quality(self, processing_width, stride):
+        """Largura e ritmo da detecção, lidos pelo worker a cada frame"""
+        if self._state is None:
+            return
+        self._state.header[_MOTION_WIDTH] = processing_width or 0
+        self._state.header[_MOTION_STRIDE] = stride
+
+    def capture_stats(self):
+        """Mesmo formato de CaptureStats.summary() (None se a fonte não mede)"""
+        if self._state is None or not self._state.header[_CAPTURED]:
+            return None
+        header = self._state.header
+        return {'fps': float(header[_CAPTURE_FPS]), 'captured': int(header[_CAPTURED]),
+                'dropped': int(header[_DROPPED]), 'age': float(header[_FRAME_AGE])}
+
+    def read_preview(self):
+        """Retorna (seq, timestamp, frame) da prévia mais nova e a mantém ativa por mais 1 s.
+
+        O frame é uma view da memória compartilhada, válida até a próxima chamada.
+        """
+        if self._state is None:
+            return 0, 0.0, None
+        self._state.header[_PREVIEW_UNTIL] = time.perf_counter() + 1.0
+        return self._state.frames.latest()
@@ -0,0 +1,149 @@
+# path_spline.py
+# Caminho como spline cúbica pré-calculada: altura, inclinação e curvatura
+# interpoladas em qualquer x, sem percorrer a lista de pontos a cada frame.
+import bisect
+
+import numpy as np
+
+
+class PathSpline:
+    """Spline cúbica monótona (PCHIP) pelos pontos (xs, ys), com xs crescente.
+
+    Os coeficientes de cada segmento ficam em arrays; a tangente de Fritsch-Carlson
+    não ultrapassa os pontos, então a curva respeita os limites usados na geração.
+    """
+
+    def __init__(self, xs, ys):
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.shape[0] < 2 or xs.shape != ys.shape:
+            raise ValueError("A spline precisa de pelo menos 2 pontos com x e y do mesmo tamanho")
+        if np.any(np.diff(xs) <= 0):
+            raise ValueError("Os x do caminho precisam ser estritamente crescentes")
+
+        h = np.diff(xs)
+        delta = np.diff(ys) / h
+
+        # Tangentes: média harmônica ponderada onde a inclinação não troca de sinal, 0 nos extremos locais
+        m = np.zeros_like(xs)
+        m[0] = delta[0]
+        m[-1] = delta[-1]
+        same_sign = delta[:-1] * delta[1:] > 0
+        w1 = 2.0 * h[1:] + h[:-1]
+        w2 = h[1:] + 2.0 * h[:-1]
+        inner = np.zeros_like(delta[:-1])
+        inner[same_sign] = (w1 + w2)[same_sign] / (w1[same_sign] / delta[:-1][same_sign] +
+                                                  w2[same_sign] / delta[1:][same_sign])
+        m[1:-1] = inner
+
+        # y(t) = a + b t + c t^2 + d t^3, com t = x - xs[i]
+        self.xs = xs
+        self.a = ys[:-1].copy()
+        self.b = m[:-1].copy()
+        self.c = (3.0 * delta - 2.0 * m[:-1] - m[1:]) / h
+        self.d = (m[:-1] + m[1:] - 2.0 * delta) / (h * h)
+
+        # Cópias em listas para as consultas escalares (indexar listas é mais rápido que arrays)
+        self._xs = xs.tolist()
+        self._coefficients = list(zip(self.a.tolist(), self.b.tolist(), self.c.tolist(), self.d.tolist()))
+        self._last_y = float(ys[-1])
+
+    @property
+    def start_x(self):
+        return self._xs[0]
+
+    @property
+    def end_x(self):
+        return self._xs[-1]
+
+    def __len__(self):
+        return len(self._xs)
+
+    def segment(self, x):
+        """Índice do segmento que contém x (busca binária)"""
+        index = bisect.bisect_right(self._xs, x) - 1
+        return min(max(index, 0), len(self._xs) - 2)
+
+    def evaluate(self, index, x):
+        """(altura, inclinação, derivada segunda) em x dentro do segmento index"""
+        if x <= self._xs[0]:
+            return self._coefficients[0][0], 0.0, 0.0
+        if x >= self._xs[-1]:
+            return self._last_y, 0.0, 0.0
+        a, b, c, d = self._coefficients[index]
+        t = x - self._xs[index]
+        return (a + t * (b + t * (c + t * d)),
+                b + t * (2.0 * c + t * 3.0 * d),
+                2.0 * c + 6.0 * d * t)
+
+    def height(self, x):
+        return self.evaluate(self.segment(x), x)[0]
+
+    def slope(self, x):
+        return self.evaluate(self.segment(x), x)[1]
+
+    def curvature(self, x):
+        _, dy, d2y = self.evaluate(self.segment(x), x)
+        return _curvature(dy, d2y)
+
+    def sample(self, xs):
+        """Alturas em vários x de uma vez (vetorizado, para desenhar o caminho)"""
+        xs = np.clip(np.asarray(xs, dtype=np.float64), self.xs[0], self.xs[-1])
+        index = np.clip(np.searchsorted(self.xs, xs, side='right') - 1, 0, len(self.xs) - 2)
+        t = xs - self.xs[index]
+        return self.a[index] + t * (self.b[index] + t * (self.c[index] + t * self.d[index]))
+
+    def cursor(self):
+        return PathCursor(self)
+
+
+def _curvature(dy, d2y):
+    return d2y / (1.0 + dy * dy) ** 1.5
+
+
+class PathCursor:
+    """Posição em uma PathSpline que acompanha um x que anda aos poucos.
+
+    Entre frames o barco avança no máximo alguns pixels, então o segmento
+    muda no máximo um ou dois índices: a consulta é O(1). Saltos maiores
+    (reinício, replay com seek) caem na busca binária.
+    """
+
+    MAX_STEPS = 4
+
+    def __init__(self, spline):
+        self.spline = spline
+        self.index = 0
+
+    def seek(self, x):
+        xs = self.spline._xs
+        last = len(xs) - 2
+        index = self.index
+        steps = 0
+        while index < last and x >= xs[index + 1]:
+            index += 1
+            steps += 1
+            if steps > self.MAX_STEPS:
+                index = self.spline.segment(x)
+                break
+        while index > 0 and x < xs[index]:
+            index -= 1
+            steps += 1
+            if steps > self.MAX_STEPS:
+                index = self.spline.segment(x)
+                break
+        self.index = index
+        return index
+
+    def evaluate(self, x):
+        return self.spline.evaluate(self.seek(x), x)
+
+    def height(self, x):
+        return self.evaluate(x)[0]
+
+    def slope(self, x):
+        return self.evaluate(x)[1]
+
+    def curvature(self, x):
+        _, dy, d2y = self.evaluate(x)
+        return _curvature(dy, d2y)
@@ -0,0 +1,89 @@
+# pickup_field.py
+# Coletáveis (moedas e, no futuro, outros itens ou obstáculos) guardados como
+# arrays NumPy ordenados por x. Colisão, recorte de visibilidade e contagem
+# olham só a janela de índices perto do intervalo pedido (busca binária),
+# então o custo por frame não cresce com o total de itens na fase.
+import numpy as np
+
+
+class PickupField:
+    """Estrutura de arrays: x, y, raio e máscara de coletados, em ordem de x"""
+
+    def __init__(self, xs, ys, radii):
+        xs = np.asarray(xs, dtype=np.float64)
+        order = np.argsort(xs, kind='stable')
+        self.x = xs[order]
+        self.y = np.asarray(ys, dtype=np.float64)[order]
+        self.radius = np.broadcast_to(np.asarray(radii, dtype=np.float64), xs.shape)[order].copy()
+        self.collected = np.zeros(xs.shape[0], dtype=bool)
+        # Maior raio: margem da janela para itens cujo centro está fora do intervalo mas a borda não
+        self.max_radius = float(self.radius.max()) if xs.shape[0] else 0.0
+        self.collected_count = 0
+
+    def __len__(self):
+        return self.x.shape[0]
+
+    @property
+    def remaining(self):
+        return len(self) - self.collected_count
+
+    def window(self, left, right):
+        """Fatia [start, stop) dos itens cuja extensão horizontal cruza [left, right]"""
+        start = int(np.searchsorted(self.x, left - self.max_radius, side='left'))
+        stop = int(np.searchsorted(self.x, right + self.max_radius, side='right'))
+        return start, stop
+
+    def visible(self, left, right):
+        """Índices dos itens não coletados que aparecem em [left, right]"""
+        start, stop = self.window(left, right)
+        x = self.x[start:stop]
+        radius = self.radius[start:stop]
+        mask = ~self.collected[start:stop]
+        mask &= x + radius >= left
+        mask &= x - radius <= right
+        return np.flatnonzero(mask) + start
+
+    def count_in(self, left, right, collected=False):
+        """Quantos itens (coletados ou não) estão com o centro em [left, right]"""
+        start = int(np.searchsorted(self.x, left, side='left'))
+        stop = int(np.searchsorted(self.x, right, side='right'))
+        taken = int(np.count_nonzero(self.collected[start:stop]))
+        return taken if collected else (stop - start) - taken
+
+    def collide_rect(self, left, top, width, height):
+        """Marca como coletados os itens cujo quadrado envolvente cruza o retângulo.
+
+        Mesmo teste de pygame.Rect.colliderect (bordas encostadas não colidem).
+        Retorna os índices coletados neste teste.
+        """
+        right = left + width
+        bottom = top + height
+        start, stop = self.window(left, right)
+        if start == stop:
+            return np.empty(0, dtype=np.intp)
+        x = self.x[start:stop]
+        y = self.y[start:stop]
+        radius = self.radius[start:stop]
+        hit = ~self.collected[start:stop]
+        hit &= x - radius < right
+        hit &= x + radius > left
+        hit &= y - radius < bottom
+        hit &= y + radius > top
+        indices = np.flatnonzero(hit) + start
+        if indices.shape[0]:
+            self.collected[indices] = True
+            self.collected_count += indices.shape[0]
+        return indices
+
+    def reset(self):
+        self.collected[:] = False
+        self.collected_count = 0
+
+    def collected_indices(self):
+        return np.flatnonzero(self.collected)
+
+    def restore(self, indices):
+        """Volta ao estado em que exatamente estas moedas foram coletadas"""
+        self.reset()
+        self.collected[np.asarray(indices, dtype=np.intp)] = True
+        self.collected_count = len(indices)
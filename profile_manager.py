@@ -1,10 +1,13 @@
 # profile_manager.py
-import json
-import os
+import settings
+from profile_store import ProfileStore
 
 class Profile:
-    def __init__(self, name):
+    FIELDS = ('name', 'is_calibrated', 'calibration_data', 'progress')
+
+    def __init__(self, name, store=None):
         self.name = name
+        self.store = store
         self.is_calibrated = False
         self.calibration_data = {
             'max_breath_rms': 1.0,
@@ -14,46 +17,49 @@ class Profile:
             'achievements': []
         }
 
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
     def save(self):
-        profile_path = f"profile_{self.name}.json"
-        with open(profile_path, "w") as f:
-            json.dump(self.__dict__, f, indent=4)
+        # Só enfileira: a gravação acontece na thread do ProfileStore
+        self.store.save(self.name, self.to_dict())
         print(f"Perfil '{self.name}' salvo.")
 
     @staticmethod
-    def load(name):
-        profile_path = f"profile_{name}.json"
-        if not os.path.exists(profile_path):
-            return None
-        try:
-            with open(profile_path, "r") as f:
-                data = json.load(f)
-                profile = Profile(name)
-                profile.__dict__.update(data)
-                print(f"Perfil '{name}' carregado.")
-                return profile
-        except (json.JSONDecodeError, KeyError):
-            print(f"Erro ao carregar o perfil '{name}'. Arquivo corrompido.")
+    def load(name, store):
+        data = store.load(name)
+        if data is None:
             return None
+        profile = Profile(name, store)
+        for field in Profile.FIELDS:
+            if field in data:
+                setattr(profile, field, data[field])
+        print(f"Perfil '{name}' carregado.")
+        return profile
 
 class ProfileManager:
-    def __init__(self):
+    def __init__(self, store=None):
+        self.store = store or ProfileStore(settings.PROFILE_DB_PATH)
         self.current_profile = None
 
     def create_profile(self, name):
         if not name.isalnum(): # Nomes simples para evitar problemas com nome de arquivo
             print("Nome de perfil inválido. Use apenas letras e números.")
             return False
-        self.current_profile = Profile(name)
+        self.current_profile = Profile(name, self.store)
         self.current_profile.save()
         return True
 
     def load_profile(self, name):
-        profile = Profile.load(name)
+        profile = Profile.load(name, self.store)
         if profile:
             self.current_profile = profile
             return True
         return False
 
     def get_current_profile(self):
-        return self.current_profile
\ No newline at end of file
+        return self.current_profile
+
+    def close(self):
+        """Grava os perfis pendentes (chamado ao sair do jogo); False se algum ficou sem gravar"""
+        return self.store.close()
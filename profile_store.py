@@ -0,0 +1,159 @@
+# profile_store.py
+# Perfis em um único banco SQLite indexado pelo nome. As gravações vão para uma
+# fila e são feitas por uma thread própria, em transações (atômicas: um crash no
+# meio da escrita não corrompe o perfil), sem travar o loop do jogo.
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+
+class ProfileStore:
+    """Banco de perfis: load() é uma busca pela chave primária, save() só enfileira.
+
+    Gravações seguidas do mesmo perfil são agrupadas (vale a mais recente), e
+    load() enxerga o que ainda está na fila. Uma gravação que falha (banco
+    travado, disco cheio) é tentada de novo com espera crescente e, se ainda
+    falhar, volta junto com a próxima; close() informa o que não foi gravado. Perfis antigos em profile_{nome}.json
+    são importados na primeira vez em que são pedidos.
+    """
+
+    def __init__(self, path, legacy_dir=".", write_retries=3, retry_delay=0.1):
+        self.path = path
+        self.legacy_dir = legacy_dir
+        self._pending = {}  # nome -> JSON ainda não gravado
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self.write_retries = write_retries
+        self.retry_delay = retry_delay
+        self._failed = set()  # Nomes cuja gravação falhou; vão junto na próxima transação
+        self.writes = 0
+        self.write_time = 0.0
+
+        self._conn = self._connect()
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    name TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0)
+        # WAL: leituras não esperam a thread de escrita; NORMAL basta para não corromper
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def load(self, name):
+        """Dados do perfil (dict) ou None se não existir"""
+        with self._lock:
+            data = self._pending.get(name)
+            if data is None:
+                row = self._conn.execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+                data = row[0] if row else None
+        if data is None:
+            return self._import_legacy(name)
+        return json.loads(data)
+
+    def save(self, name, data):
+        """Enfileira a gravação e retorna na hora"""
+        with self._lock:
+            self._pending[name] = json.dumps(data)
+        self._queue.put(name)
+
+    def names(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM profiles ORDER BY name").fetchall()
+            return sorted({row[0] for row in rows} | set(self._pending))
+
+    def _import_legacy(self, name):
+        """Migra um profile_{nome}.json da versão antiga para o banco"""
+        legacy_path = os.path.join(self.legacy_dir, f"profile_{name}.json")
+        if not os.path.exists(legacy_path):
+            return None
+        try:
+            with open(legacy_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"Erro ao importar o perfil '{name}'. Arquivo corrompido.")
+            return None
+        self.save(name, data)
+        print(f"Perfil '{name}' importado de {legacy_path}.")
+        return data
+
+    def _write_loop(self):
+        conn = self._connect()
+        closing = False
+        while not closing:
+            name = self._queue.get()
+            # No close() ainda tenta uma última vez o que falhou antes
+            closing = name is None
+            names = set() if closing else {name}
+            # Junta o que mais estiver na fila em uma transação só
+            while not closing:
+                try:
+                    name = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if name is None:
+                    closing = True
+                    break
+                names.add(name)
+            names |= self._failed
+            self._failed = set()
+            self._write(conn, names)
+        conn.close()
+
+    def _write(self, conn, names):
+        with self._lock:
+            rows = [(name, self._pending[name], time.time()) for name in names if name in self._pending]
+        if not rows:
+            return
+        start = time.perf_counter()
+        for attempt in range(self.write_retries + 1):
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO profiles (name, data, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                        rows)
+                break
+            except sqlite3.Error as e:
+                print(f"Erro ao salvar perfis ({', '.join(row[0] for row in rows)}): {e}")
+                if attempt < self.write_retries:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+        else:
+            # Continua em _pending (load() ainda vê os dados); tenta de novo na próxima gravação ou no close()
+            self._failed.update(row[0] for row in rows)
+            return
+        with self._lock:
+            # Só sai da fila o que foi gravado (e não mudou de novo enquanto isso)
+            for name, data, _ in rows:
+                if self._pending.get(name) is data:
+                    del self._pending[name]
+        self.writes += len(rows)
+        self.write_time += time.perf_counter() - start
+
+    def flush(self, timeout=5.0):
+        """Espera a fila de gravação esvaziar"""
+        deadline = time.perf_counter() + timeout
+        while self._pending and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        return not self._pending
+
+    def close(self):
+        """Grava o que falta e fecha o banco; retorna False se algum perfil não foi gravado"""
+        self._queue.put(None)
+        self._writer.join(5.0)
+        with self._lock:
+            unsaved = sorted(self._pending)
+            self._conn.close()
+        if unsaved:
+            print(f"Perfis não gravados: {', '.join(unsaved)}")
+        return not unsaved
@@ -0,0 +1,153 @@
+# quality_governor.py
+# Mantém o jogo no fps alvo em máquinas mais fracas: acompanha os percentis do tempo
+# de trabalho de cada frame e desliga trabalho caro numa ordem fixa (detecção de
+# movimento, prévia da câmera, efeitos visuais, ritmo da tela), religando quando
+# sobra folga. Cada mudança é mostrada no console e registrada em QUALITY_LOG_PATH.
+import dataclasses
+import json
+import platform
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from breath_processor import RingBuffer
+
+
+@dataclass(frozen=True, slots=True)
+class QualityLevel:
+    """O que fica ligado em um nível (trocado de uma vez só, como os snapshots de entrada)"""
+
+    name: str = "máxima"
+    motion_width: int | None = None  # Largura máxima da detecção (None = a configurada)
+    motion_stride: int = 1  # Detecta movimento em 1 de cada N frames da câmera
+    camera_preview: bool = True
+    effects: bool = True  # Nuvens, guia do caminho e contorno das moedas
+    render_divisor: int = 1  # O loop roda a FPS / render_divisor (a física continua a SIMULATION_HZ)
+
+
+def build_levels(motion_width=320, motion_stride=2, render_divisor=2):
+    """Níveis do melhor ao mais leve; cada um mantém as reduções do anterior"""
+    full = QualityLevel()
+    motion = dataclasses.replace(full, name="movimento reduzido", motion_width=motion_width,
+                                 motion_stride=motion_stride)
+    preview = dataclasses.replace(motion, name="sem prévia da câmera", camera_preview=False)
+    effects = dataclasses.replace(preview, name="sem efeitos visuais", effects=False)
+    render = dataclasses.replace(effects, name=f"tela a 1/{render_divisor} do fps", render_divisor=render_divisor)
+    return (full, motion, preview, effects, render)
+
+
+class QualityGovernor:
+    """Decide o nível de qualidade a partir do tempo de trabalho dos frames.
+
+    O orçamento de um frame acompanha o fps efetivo do nível (render_divisor / fps).
+    O p95 da janela acima de downgrade_at x orçamento do nível atual desce um nível;
+    abaixo de upgrade_at x orçamento do nível de cima, depois de recover_seconds no
+    nível atual, sobe um (comparar com o orçamento folgado do nível de tela reduzida
+    faria o governador subir e descer sem parar). Após cada mudança a janela recomeça, para o próximo passo só olhar
+    frames do nível novo. Se um nível volta a estourar logo depois de religado,
+    a espera para tentar de novo dobra (sem oscilar a cada poucos segundos).
+    """
+
+    def __init__(self, target_fps, levels=None, window=120, downgrade_at=0.9, upgrade_at=0.6,
+                 recover_seconds=5.0, check_every=30, log_path=None):
+        self.target_fps = target_fps
+        self.levels = levels or build_levels()
+        self.level = 0
+        self.window = window
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.check_every = check_every
+        self.log_path = log_path
+        self.last_p95 = 0.0
+        self.changes = []  # (segundos desde o início, nível de, nível para, p95)
+        self._frame_times = RingBuffer(window)
+        self._frames = 0
+        self._recover_delays = [recover_seconds] * len(self.levels)
+        self._max_recover = recover_seconds * 16
+        self._last_upgrade = None  # (instante, nível de onde saiu)
+        self._started_at = None
+        self._changed_at = None
+        self._time_at_level = [0.0] * len(self.levels)
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    @property
+    def budget(self):
+        """Orçamento de um frame no nível atual"""
+        return self.budget_for(self.level)
+
+    def budget_for(self, level):
+        """Segundos por frame no nível (o loop roda a target_fps / render_divisor)"""
+        return self.levels[level].render_divisor / self.target_fps
+
+    def record(self, seconds, now=None):
+        """Registra o trabalho de um frame; retorna o QualityLevel novo quando o nível muda"""
+        now = time.perf_counter() if now is None else now
+        if self._started_at is None:
+            self._started_at = self._changed_at = now
+        self._frame_times.push(seconds)
+        self._frames += 1
+        if len(self._frame_times) < self.window or self._frames % self.check_every:
+            return None
+
+        p95 = float(np.percentile(self._frame_times.values(), 95))
+        self.last_p95 = p95
+        if p95 > self.budget * self.downgrade_at and self.level < len(self.levels) - 1:
+            return self._change(self.level + 1, p95, now)
+        if (self.level > 0 and p95 < self.budget_for(self.level - 1) * self.upgrade_at
+                and now - self._changed_at >= self._recover_delays[self.level]):
+            return self._change(self.level - 1, p95, now)
+        return None
+
+    def _change(self, level, p95, now):
+        previous = self.level
+        budget = self.budget_for(previous)
+        if level > previous and self._last_upgrade is not None:
+            upgraded_at, upgraded_from = self._last_upgrade
+            if upgraded_from == level and now - upgraded_at < self._recover_delays[level] * 2:
+                # Religar não se sustentou: espera mais antes da próxima tentativa
+                self._recover_delays[level] = min(self._recover_delays[level] * 2, self._max_recover)
+        if level < previous:
+            self._last_upgrade = (now, previous)
+
+        self._time_at_level[previous] += now - self._changed_at
+        self._changed_at = now
+        self.level = level
+        self._frame_times.clear()
+        self._frames = 0
+        elapsed = now - self._started_at
+        self.changes.append((elapsed, previous, level, p95))
+        print(f"Qualidade: {self.levels[previous].name} -> {self.levels[level].name} "
+              f"(frame p95 {p95 * 1000:.1f} ms, orçamento {budget * 1000:.1f} ms)")
+        if self.log_path:
+            self._log(elapsed, previous, level, p95, budget)
+        return self.current
+
+    def _log(self, elapsed, previous, level, p95, budget):
+        entry = {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'host': platform.node(),
+            'platform': platform.platform(),
+            'elapsed': round(elapsed, 3),
+            'from': self.levels[previous].name,
+            'to': self.levels[level].name,
+            'level': level,
+            'p95_ms': round(p95 * 1000, 2),
+            'budget_ms': round(budget * 1000, 2),
+        }
+        try:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Não foi possível gravar o registro de qualidade: {e}")
+
+    def time_at_levels(self, now=None):
+        """Segundos passados em cada nível até agora"""
+        now = time.perf_counter() if now is None else now
+        times = list(self._time_at_level)
+        if self._changed_at is not None:
+            times[self.level] += now - self._changed_at
+        return times
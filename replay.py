@@ -0,0 +1,217 @@
+# replay.py
+# Replay determinístico da Travessia dos Ventos. A fase sai da semente e a física
+# só depende do esforço de cada passo, então gravar (semente, parâmetros, esforço
+# por passo) basta para refazer a partida bit a bit. Keyframes periódicos com o
+# estado completo permitem pular direto para qualquer ponto de uma sessão longa.
+# Uso: python replay.py replays/<sessão>                  # assiste (←/→ pulam 10 s)
+#      python replay.py replays/<sessão> --seek 120       # começa em 120 s
+#      python replay.py replays/<sessão> --headless       # refaz sem tela e confere os keyframes
+import argparse
+import bisect
+import dataclasses
+import json
+import os
+import time
+from array import array
+
+import numpy as np
+
+import settings
+from scenes.boat_simulation import BoatParams, BoatSimulation
+
+REPLAY_FILE = "replay.json"
+INPUTS_FILE = "inputs.bin"  # float64 por passo: o esforço exato passado a BoatSimulation.step
+KEYFRAMES_FILE = "keyframes.jsonl"  # um snapshot() por linha
+
+
+class ReplayRecorder:
+    """Grava uma partida enquanto ela acontece.
+
+    record() só acrescenta um float a um array; a cada keyframe o trecho
+    acumulado vai para o disco (alguns KB), então um crash perde no máximo
+    um intervalo de keyframe.
+    """
+
+    def __init__(self, path, simulation, metadata=None, keyframe_interval=600):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self.ticks = simulation.tick
+        self._inputs = array('d')
+        self._inputs_file = open(os.path.join(path, INPUTS_FILE), "ab")
+        self._keyframes_file = open(os.path.join(path, KEYFRAMES_FILE), "a")
+        self.closed = False
+
+        params = dataclasses.asdict(simulation.params)
+        self.header = {
+            'seed': simulation.level.seed,
+            'length': simulation.finish_line_x,
+            'chunk_width': simulation.level.chunk_width,
+            'params': params,
+            'simulation_hz': settings.SIMULATION_HZ,
+            'keyframe_interval': keyframe_interval,
+            'metadata': dict(metadata or {}),
+        }
+        self._write_header()
+        self._keyframe(simulation)
+
+    def record(self, effort, simulation):
+        """Chamado logo depois de simulation.step(effort)"""
+        self._inputs.append(effort)
+        self.ticks = simulation.tick
+        if simulation.tick % self.keyframe_interval == 0:
+            self._flush()
+            self._keyframe(simulation)
+
+    def _keyframe(self, simulation):
+        # json grava floats com repr: a releitura devolve exatamente o mesmo valor
+        self._keyframes_file.write(json.dumps(simulation.snapshot()) + "\n")
+        self._keyframes_file.flush()
+
+    def _flush(self):
+        self._inputs.tofile(self._inputs_file)
+        self._inputs_file.flush()
+        del self._inputs[:]
+
+    def _write_header(self):
+        tmp_path = os.path.join(self.path, REPLAY_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.header, f, indent=4)
+        os.replace(tmp_path, os.path.join(self.path, REPLAY_FILE))
+
+    def close(self, simulation):
+        """Grava o que falta e um keyframe do estado final"""
+        if self.closed:
+            return
+        self.closed = True
+        self._flush()
+        if simulation.tick % self.keyframe_interval != 0:
+            self._keyframe(simulation)
+        self._inputs_file.close()
+        self._keyframes_file.close()
+        self.header['ticks'] = self.ticks
+        self._write_header()
+
+
+class ReplaySession:
+    """Uma partida gravada: refaz a simulação em qualquer passo"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, REPLAY_FILE), "r") as f:
+            self.header = json.load(f)
+        # tolist() devolve os mesmos float64 que a cena passou para step()
+        self.efforts = np.fromfile(os.path.join(path, INPUTS_FILE), dtype=np.float64).tolist()
+        self.keyframes = []
+        with open(os.path.join(path, KEYFRAMES_FILE), "r") as f:
+            for line in f:
+                try:
+                    self.keyframes.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # Última linha cortada por um crash
+        # Keyframes além das entradas gravadas (crash entre os dois arquivos) não servem
+        self.keyframes = [keyframe for keyframe in self.keyframes if keyframe['tick'] <= len(self.efforts)]
+        self._keyframe_ticks = [keyframe['tick'] for keyframe in self.keyframes]
+        self.hz = self.header['simulation_hz']
+
+    @property
+    def ticks(self):
+        return len(self.efforts)
+
+    @property
+    def duration(self):
+        return self.ticks / self.hz
+
+    @property
+    def metadata(self):
+        return self.header['metadata']
+
+    def params(self):
+        params = dict(self.header['params'])
+        # Chaves de dict viram texto no JSON
+        params['phase_requirements'] = {int(phase): req for phase, req in params['phase_requirements'].items()}
+        return BoatParams(**params)
+
+    def new_simulation(self):
+        return BoatSimulation(self.params(), length=self.header['length'], seed=self.header['seed'],
+                              chunk_width=self.header['chunk_width'])
+
+    def effort(self, tick):
+        """Esforço do passo que leva de tick a tick + 1 (None no fim da gravação)"""
+        return self.efforts[tick] if tick < len(self.efforts) else None
+
+    def simulation_at(self, tick):
+        """Simulação no passo tick: restaura o keyframe anterior mais próximo e avança a partir dele"""
+        tick = max(0, min(tick, self.ticks))
+        simulation = self.new_simulation()
+        index = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        if index >= 0:
+            simulation.restore(self.keyframes[index])
+        self.advance(simulation, tick)
+        return simulation
+
+    def advance(self, simulation, tick):
+        """Avança até o passo tick (sem tela, o mais rápido possível)"""
+        efforts = self.efforts
+        while simulation.tick < tick:
+            simulation.step(efforts[simulation.tick])
+
+    def verify(self):
+        """Refaz a partida inteira desde o início e compara com cada keyframe gravado"""
+        simulation = self.new_simulation()
+        mismatches = []
+        for keyframe in self.keyframes:
+            self.advance(simulation, keyframe['tick'])
+            if simulation.snapshot() != keyframe:
+                mismatches.append(keyframe['tick'])
+        self.advance(simulation, self.ticks)
+        return simulation, mismatches
+
+
+def watch(session, start_tick):
+    """Abre o jogo direto na BoatScene refazendo a sessão em tempo normal"""
+    from main import Game
+
+    game = Game()
+    scene_manager = game.scene_manager
+    boat_scene = scene_manager.get_scene('BoatScene')
+    boat_scene.replay = session
+    boat_scene.replay_start = start_tick
+    scene_manager.go_to_scene('BoatScene')
+    game.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de uma partida da Travessia dos Ventos")
+    parser.add_argument('session', help="Pasta da sessão (dentro de REPLAY_DIR)")
+    parser.add_argument('--seek', type=float, default=0.0, help="Começa neste tempo (s)")
+    parser.add_argument('--headless', action='store_true', help="Refaz sem tela e confere os keyframes")
+    args = parser.parse_args()
+
+    session = ReplaySession(args.session)
+    print(f"Sessão {args.session}: {session.ticks} passos ({session.duration:.1f} s), "
+          f"{len(session.keyframes)} keyframes, semente {session.header['seed']}")
+
+    if args.headless:
+        start = time.perf_counter()
+        simulation, mismatches = session.verify()
+        elapsed = time.perf_counter() - start
+        print(f"Refeita em {elapsed * 1000:.0f} ms ({session.ticks / max(elapsed, 1e-9):.0f} passos/s): "
+              f"{simulation.coins_collected}/{simulation.total_coins} moedas, fase {simulation.current_phase}, "
+              f"{'chegou' if simulation.finished else 'não chegou'}")
+        if mismatches:
+            print(f"Divergência nos keyframes dos passos: {mismatches}")
+        else:
+            print("Todos os keyframes conferem (bit a bit)")
+        if args.seek:
+            start = time.perf_counter()
+            simulation = session.simulation_at(int(args.seek * session.hz))
+            print(f"Seek para {args.seek:.1f} s em {(time.perf_counter() - start) * 1000:.1f} ms "
+                  f"(x = {simulation.boat_pos_x:.1f})")
+        return
+
+    watch(session, int(args.seek * session.hz))
+
+
+if __name__ == '__main__':
+    main()
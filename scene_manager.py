@@ -1,65 +1,156 @@
 # scene_manager.py
-from scenes.login_scene import LoginScene
-from scenes.calibration_scene import CalibrationScene
-from scenes.world_map_scene import WorldMapScene
-from scenes.boat_scene import BoatScene
-from scenes.test_scene import TestScene
+import importlib
+import threading
+import settings
+from asset_manager import preload_scene
+from quality_governor import QualityLevel
+
+
+class SceneFactory:
+    """Fábrica que só importa o módulo da cena quando ela é usada pela primeira vez"""
+
+    def __init__(self, module_name, class_name):
+        self.module_name = module_name
+        self.class_name = class_name
+
+    @property
+    def scene_class(self):
+        return getattr(importlib.import_module(self.module_name), self.class_name)
+
+    def __call__(self, scene_manager):
+        return self.scene_class(scene_manager)
+
+
+# Registro de cenas: nome -> fábrica (qualquer chamável que recebe o SceneManager).
+# As cenas só são construídas no primeiro uso e depois reaproveitadas com reset().
+SCENE_FACTORIES = {
+    'LoginScene': SceneFactory('scenes.login_scene', 'LoginScene'),
+    'CalibrationScene': SceneFactory('scenes.calibration_scene', 'CalibrationScene'),
+    'WorldMapScene': SceneFactory('scenes.world_map_scene', 'WorldMapScene'),
+    'BoatScene': SceneFactory('scenes.boat_scene', 'BoatScene'),
+    'TestScene': SceneFactory('scenes.test_scene', 'TestScene'),
+}
 
 class SceneManager:
-    def __init__(self, input_manager, profile_manager):
+    def __init__(self, input_manager, profile_manager, initial_scene='LoginScene'):
         self.input_manager = input_manager
         self.profile_manager = profile_manager
-        self.initializing = True
-        
-        # Create scenes dictionary first
-        self.scenes = {}
         
-        # Then create each scene
-        self.scenes['LoginScene'] = LoginScene(self)
-        self.scenes['CalibrationScene'] = CalibrationScene(self)
-        self.scenes['WorldMapScene'] = WorldMapScene(self)
-        self.scenes['BoatScene'] = BoatScene(self)
-        self.scenes['TestScene'] = TestScene(self)
+        # Simulação em passo fixo (ver BaseScene.fixed_timestep)
+        self.timestep = 1.0 / settings.SIMULATION_HZ
+        self.max_steps = settings.MAX_SIMULATION_STEPS
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.last_steps = 0
+        self.dropped_time = 0.0  # Tempo descartado quando o jogo não consegue acompanhar
+        # Nível de qualidade atual (trocado pelo QualityGovernor do jogo; as cenas só leem)
+        self.quality = QualityLevel()
         
-        self.current_scene_name = 'LoginScene'
-        self.current_scene = self.scenes[self.current_scene_name]
+        self.factories = dict(SCENE_FACTORIES)
+        self.scenes = {}  # Cenas já construídas
+        self.current_scene_name = None
+        self.current_scene = None
         self.running = True
-        self.initializing = False
+        self.go_to_scene(initial_scene)
+
+    def register_scene(self, scene_name, factory):
+        """Adiciona (ou substitui) uma cena no registro"""
+        self.factories[scene_name] = factory
+        self.scenes.pop(scene_name, None)
+
+    def get_scene(self, scene_name):
+        """Cena pelo nome, construída na primeira vez que é pedida"""
+        scene = self.scenes.get(scene_name)
+        if scene is None:
+            scene = self.factories[scene_name](self)
+            self.scenes[scene_name] = scene
+        return scene
 
     def go_to_scene(self, scene_name):
-        if self.initializing:
-            # Defer scene transition until after initialization
-            self.current_scene_name = scene_name
-            self.current_scene = self.scenes[scene_name]
+        if scene_name not in self.factories:
+            print(f"Erro: Cena '{scene_name}' não encontrada.")
             return
-            
-        if scene_name in self.scenes:
-            self.current_scene_name = scene_name
-            # Recriamos a cena para garantir que ela reinicie seu estado
-            # Isso é importante para os minigames
-            if scene_name == 'LoginScene':
-                self.scenes[scene_name] = LoginScene(self)
-            elif scene_name == 'CalibrationScene':
-                self.scenes[scene_name] = CalibrationScene(self)
-            elif scene_name == 'WorldMapScene':
-                self.scenes[scene_name] = WorldMapScene(self)
-            elif scene_name == 'BoatScene':
-                self.scenes[scene_name] = BoatScene(self)
-            elif scene_name == 'TestScene':
-                self.scenes[scene_name] = TestScene(self)
-            self.current_scene = self.scenes[scene_name]
+        
+        previous = self.current_scene
+        if previous is not None:
+            previous.on_exit()
+        
+        # Reiniciamos a cena para garantir que ela recomece do zero
+        # Isso é importante para os minigames
+        built = scene_name in self.scenes
+        scene = self.get_scene(scene_name)
+        if built:
+            scene.reset()
+        self.current_scene_name = scene_name
+        self.current_scene = scene
+        self.accumulator = 0.0
+        if previous is not None:
             print(f"Transicionando para a cena: {scene_name}")
-        else:
-            print(f"Erro: Cena '{scene_name}' não encontrada.")
-            
+        
+        scene.on_enter()
+        if self.current_scene is scene:
+            self._preload_next(scene_name)
+
+    def _preload_next(self, scene_name):
+        """Importa em segundo plano as cenas que podem vir depois desta e lê suas imagens"""
+        factories = [self.factories[name] for name in getattr(self.current_scene, 'next_scenes', ())
+                     if name in self.factories]
+        if factories:
+            threading.Thread(target=self._preload_worker, args=(factories,), daemon=True).start()
+
+    def _preload_worker(self, factories):
+        for factory in factories:
+            # Fábricas de SceneFactory importam o módulo aqui, fora da thread principal
+            preload_scene(getattr(factory, 'scene_class', factory))
+
     def handle_events(self, events):
         self.current_scene.handle_events(events)
         
-    def update(self):
-        self.current_scene.update()
+    def update(self, frame_time=None):
+        """Avança a cena atual pelo tempo real do frame (segundos)"""
+        scene = self.current_scene
+        if not scene.fixed_timestep or frame_time is None:
+            scene.update()
+            scene.render_alpha = 1.0
+            self.last_steps = 1
+            return
+        
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.timestep:
+            if steps == self.max_steps:
+                # Sobrecarga: descarta o atraso em vez de acumular passos para sempre.
+                # O jogo fica mais lento, mas cada passo continua igual (determinístico)
+                dropped = self.accumulator - self.accumulator % self.timestep
+                self.dropped_time += dropped
+                self.accumulator -= dropped
+                break
+            scene.update()
+            self.accumulator -= self.timestep
+            self.ticks += 1
+            steps += 1
+            if self.current_scene is not scene:
+                return  # A cena trocou no meio dos passos; a nova começa do zero
+        self.last_steps = steps
+        scene.render_alpha = self.accumulator / self.timestep
         
     def draw(self, screen):
         self.current_scene.draw(screen)
 
+    def supports_dirty_rects(self):
+        return self.current_scene.supports_dirty_rects
+
+    def mark_dirty(self, rect=None):
+        self.current_scene.mark_dirty(rect)
+
+    def consume_dirty_rects(self):
+        return self.current_scene.consume_dirty_rects()
+
     def quit_game(self):
-        self.running = False
\ No newline at end of file
+        self.running = False
+
+    def shutdown(self):
+        """Sai da cena atual ao fechar o jogo (ela libera o que abriu em on_enter)"""
+        if self.current_scene is not None:
+            self.current_scene.on_exit()
+            self.current_scene = None
@@ -1,7 +1,38 @@
 # scenes/base_scene.py
 class BaseScene:
+    # Cenas com supports_dirty_rects = True só redesenham o que mudou e informam
+    # as regiões alteradas via mark_dirty; as demais são redesenhadas inteiras a cada frame
+    supports_dirty_rects = False
+
+    # Cenas com fixed_timestep = True têm update() chamado em passos fixos de
+    # 1 / SIMULATION_HZ s (zero, um ou vários por frame, conforme o tempo real);
+    # em draw, render_alpha (0-1) diz quanto do próximo passo já passou, para interpolar
+    fixed_timestep = False
+
+    # Imagens usadas pela cena, como (caminho, alfa, tamanho), e cenas que podem vir
+    # depois dela: ao entrar em uma cena, o SceneManager pré-carrega os assets das próximas
+    assets = ()
+    next_scenes = ()
+
     def __init__(self, scene_manager):
         self.scene_manager = scene_manager
+        self.render_alpha = 1.0
+        self._dirty_rects = []
+        self._full_redraw = True
+
+    def reset(self):
+        """Volta ao estado inicial (o SceneManager reaproveita a cena em vez de recriá-la)"""
+        self._dirty_rects = []
+        self._full_redraw = True
+        self.render_alpha = 1.0
+
+    def on_enter(self):
+        """Chamado sempre que a cena se torna a atual (depois do reset)"""
+        pass
+
+    def on_exit(self):
+        """Chamado quando o jogo sai da cena"""
+        pass
 
     def handle_events(self, events):
         raise NotImplementedError
@@ -10,4 +41,21 @@ class BaseScene:
         raise NotImplementedError
 
     def draw(self, screen):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def mark_dirty(self, rect=None):
+        """Marca uma região para atualizar na tela (None = a tela inteira)"""
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(rect)
+
+    def consume_dirty_rects(self):
+        """Retorna as regiões alteradas desde o último frame (None = tela inteira) e limpa a lista"""
+        if self._full_redraw or not self.supports_dirty_rects:
+            self._full_redraw = False
+            self._dirty_rects.clear()
+            return None
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        return rects
@@ -0,0 +1,113 @@
+# scenes/boat_level.py
+# Conteúdo da Travessia dos Ventos: decoração gerada em blocos de largura fixa
+# (só os blocos perto do barco ficam carregados), o caminho como uma spline
+# pré-calculada e as moedas em arrays ordenados por x, então o custo por frame
+# não depende do comprimento da fase.
+import math
+import random
+
+import numpy as np
+
+import settings
+from path_spline import PathSpline
+from pickup_field import PickupField
+
+# Mesma grade da versão original: pontos do caminho a cada 50 px a partir de x=100
+# e moedas a cada 60 px a partir de x=150
+PATH_START_X = 100
+PATH_STEP = 50
+COIN_START_X = 150
+COIN_STEP = 60
+COIN_RADIUS = 15
+
+
+class LevelChunk:
+    """Um bloco da fase: conteúdo entre start_x (inclusive) e end_x (exclusive)"""
+
+    __slots__ = ('index', 'start_x', 'end_x', 'clouds')
+
+    def __init__(self, index, start_x, end_x):
+        self.index = index
+        self.start_x = start_x
+        self.end_x = end_x
+        self.clouds = []  # [(x, y, largura, altura)]
+
+
+class BoatLevel:
+    def __init__(self, length, min_y, max_y, chunk_width=400, seed=None, load_ahead=2, keep_behind=1):
+        self.finish_line_x = length
+        self.min_y = min_y
+        self.max_y = max_y
+        self.chunk_width = chunk_width
+        # A mesma semente gera sempre a mesma fase, mesmo descarregando e recarregando blocos
+        self.seed = random.randrange(1 << 30) if seed is None else seed
+        self.load_ahead = load_ahead  # Blocos carregados à frente da área visível
+        self.keep_behind = keep_behind  # Blocos mantidos atrás antes de descarregar
+
+        self.chunks = {}  # índice -> LevelChunk
+        self.chunk_count = int(math.ceil(length / chunk_width))
+        self.chunks_generated = 0
+
+        # O caminho não depende da semente: vira uma spline única para a fase inteira
+        # (alguns KB mesmo em fases de centenas de telas)
+        path_xs = range(PATH_START_X, length, PATH_STEP)
+        self.path = PathSpline(path_xs, [self._path_y(x) for x in path_xs])
+
+        # Moedas: poucos bytes cada, geradas de uma vez em arrays (dezenas de milhares cabem fácil)
+        self.coins = self._generate_coins()
+        self.total_coins = len(self.coins)
+
+    def chunk_index(self, x):
+        return int(x // self.chunk_width)
+
+    def update(self, left_x, right_x):
+        """Carrega os blocos à frente de [left_x, right_x] e descarrega os que ficaram para trás"""
+        first = max(0, self.chunk_index(left_x) - self.keep_behind)
+        last = min(self.chunk_count - 1, self.chunk_index(right_x) + self.load_ahead)
+
+        for index in [index for index in self.chunks if index < first or index > last]:
+            del self.chunks[index]
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                self.chunks[index] = self._generate_chunk(index)
+
+    def chunks_in(self, left_x, right_x):
+        """Blocos carregados que cruzam o intervalo, em ordem de x"""
+        first = max(0, self.chunk_index(left_x))
+        last = min(self.chunk_count - 1, self.chunk_index(right_x))
+        for index in range(first, last + 1):
+            chunk = self.chunks.get(index)
+            if chunk is not None:
+                yield chunk
+
+    def _path_y(self, x):
+        # Altura base (meio da tela) com variações suaves no caminho
+        base_y = settings.SCREEN_HEIGHT - 200
+        variation = math.sin((x - PATH_START_X) * 0.01) * 100  # Variação senoidal
+        # Garante que não saia dos limites
+        return max(self.min_y + 50, min(self.max_y - 50, base_y + variation))
+
+    def _generate_coins(self):
+        """Moedas em posições estratégicas ao redor do caminho"""
+        xs = np.arange(COIN_START_X, self.finish_line_x - 50, COIN_STEP, dtype=np.float64)
+        rng = np.random.default_rng(self.seed)
+        base_y = settings.SCREEN_HEIGHT - 200
+        variation = np.sin((xs - COIN_START_X) * 0.01) * 80
+        ys = base_y + variation + rng.integers(-40, 41, xs.shape[0])  # Variação maior
+        # Garante que a moeda esteja em uma posição válida
+        np.clip(ys, self.min_y + 20, self.max_y - 20, out=ys)
+        return PickupField(xs, ys, COIN_RADIUS)
+
+    def _generate_chunk(self, index):
+        start_x = index * self.chunk_width
+        chunk = LevelChunk(index, start_x, min(start_x + self.chunk_width, self.finish_line_x))
+        rng = random.Random(self.seed * 100003 + index)
+        self.chunks_generated += 1
+
+        # Decoração: algumas nuvens por bloco
+        for _ in range(rng.randint(0, 2)):
+            width = rng.randint(80, 160)
+            chunk.clouds.append((start_x + rng.randint(0, self.chunk_width), rng.randint(30, 220),
+                                 width, width // 3))
+
+        return chunk
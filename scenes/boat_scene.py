@@ -2,231 +2,207 @@
 import pygame
 from scenes.base_scene import BaseScene
 import settings
-import math
-import random
+from text_cache import get_font, render_text
+from asset_manager import load_image
+import numpy as np
+import time
+from viewport import Viewport
+from telemetry import TelemetryRecorder, EVENT_FLAGS, session_dir
+from replay import ReplayRecorder
+from breath_calibration import blended_max_breath
+from scenes.boat_simulation import (BoatSimulation, BoatParams, BOAT_WIDTH, BOAT_HEIGHT,
+                                    EVENT_COIN, EVENT_PHASE, EVENT_ALL_PHASES, EVENT_FINISH)
 
 class BoatScene(BaseScene):
+    # A física roda em passos fixos (update = um passo de 1 / SIMULATION_HZ s)
+    fixed_timestep = True
+    
+    # (caminho, alfa, tamanho) pré-carregados antes de entrar na cena
+    assets = (('assets/images/boat.png', True, (BOAT_WIDTH, BOAT_HEIGHT)),)
+    next_scenes = ('WorldMapScene',)
+
     def __init__(self, scene_manager):
         super().__init__(scene_manager)
         self.input_manager = self.scene_manager.input_manager
-        self.profile = self.scene_manager.profile_manager.get_current_profile()
         
-        if not self.profile or not self.profile.is_calibrated:
+        # Imagem do barco (carregada e redimensionada uma vez, compartilhada entre partidas)
+        self.boat_image = load_image('assets/images/boat.png', True, (BOAT_WIDTH, BOAT_HEIGHT), settings.WHITE)
+        self.telemetry = None
+        self.recorder = None
+        # Replay em vez do microfone (ver replay.py): definidos antes de entrar na cena
+        self.replay = None
+        self.replay_start = 0
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.profile = self.scene_manager.profile_manager.get_current_profile()
+        self.simulation = None
+        if self.replay is not None:
+            # A partida gravada, a partir do keyframe mais próximo de replay_start
+            self.max_calibrated_breath = self.replay.metadata.get('max_breath_rms', 1.0)
+            self.simulation = self.replay.simulation_at(self.replay_start)
+        elif not self.profile or not self.profile.is_calibrated:
+            return  # on_enter manda de volta para o login
+        else:
+            self.max_calibrated_breath = self.profile.calibration_data.get('max_breath_rms', 1.0)
+            # Blocos de sopro até a estimativa contínua substituir a da CalibrationScene
+            self.confident_breath_blocks = settings.BREATH_CONFIDENT_SECONDS * (
+                self.input_manager.mic_samplerate / self.input_manager.mic_blocksize)
+            
+            # Física, moedas e fases (a mesma lógica roda sem tela no simulator.py)
+            self.simulation = BoatSimulation(BoatParams(), length=settings.BOAT_LEVEL_LENGTH,
+                                             seed=settings.BOAT_LEVEL_SEED, chunk_width=settings.BOAT_CHUNK_WIDTH)
+        self.level = self.simulation.level
+        
+        # Posição no passo anterior, para interpolar o desenho entre dois passos
+        self.prev_boat_pos_x = self.simulation.boat_pos_x
+        self.prev_boat_pos_y = self.simulation.boat_pos_y
+        
+        # Câmera que acompanha o barco (o mundo vai até um pouco depois da linha de chegada)
+        self.viewport = Viewport(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT,
+                                 world_width=self.simulation.finish_line_x + 200,
+                                 anchor_x=self.simulation.boat_pos_x)
+        self._update_view()
+
+    def on_enter(self):
+        if self.simulation is None:
             self.scene_manager.go_to_scene('LoginScene')
             return
+        if self.replay is not None:
+            return  # Replays não são gravados de novo
+        # Retoma o piso de ruído e os sopros das sessões anteriores deste perfil
+        self.input_manager.calibrator.load(self.profile.calibration_data)
+        if settings.REPLAY_DIR:
+            self.recorder = ReplayRecorder(
+                session_dir(settings.REPLAY_DIR, self.profile.name), self.simulation,
+                metadata={
+                    'profile': self.profile.name,
+                    'max_breath_rms': self.max_calibrated_breath,
+                    'started_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                keyframe_interval=settings.REPLAY_KEYFRAME_INTERVAL)
+        if settings.TELEMETRY_DIR:
+            self.telemetry = TelemetryRecorder(
+                session_dir(settings.TELEMETRY_DIR, self.profile.name),
+                metadata={
+                    'profile': self.profile.name,
+                    'max_breath_rms': self.max_calibrated_breath,
+                    'simulation_hz': settings.SIMULATION_HZ,
+                    'level_length': self.simulation.finish_line_x,
+                    'level_seed': self.level.seed,
+                    'started_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                chunk_records=settings.TELEMETRY_CHUNK_RECORDS)
 
-        self.max_calibrated_breath = self.profile.calibration_data.get('max_breath_rms', 1.0)
-        
-        # Posição do barco
-        self.boat_pos_x = 100
-        self.boat_pos_y = settings.SCREEN_HEIGHT - 150  # Posição Y inicial
-        self.finish_line_x = settings.SCREEN_WIDTH + 300  # Mapa maior - linha mais distante
-        
-        # Limites do barco (definir ANTES de gerar o caminho)
-        self.min_y = 50  # Altura mínima (topo da tela)
-        self.max_y = settings.SCREEN_HEIGHT - 150  # Altura máxima (chão)
-        
-        # Caminho pré-definido (como na primeira versão)
-        self.path_points = self._generate_path()
-        self.current_path_index = 0
-        
-        # Física do barco
-        self.boat_velocity_y = 0.0  # Velocidade vertical
-        self.gravity = 0.8  # Força da gravidade
-        self.lift_force = 0.0  # Força de elevação do sopro
-        self.normalized_effort = 0.0
-        
-        # Sistema de moedas
-        self.coins = []
-        self.coins_collected = 0
-        self.total_coins = 0
-        self._generate_coins()
-        
-        # Sistema de fases
-        self.current_phase = 1
-        self.phases_completed = 0
-        self.phase_requirements = {
-            1: {"coins": 4, "distance": 0.25},  # Ajustado para mapa maior
-            2: {"coins": 7, "distance": 0.55},  # Ajustado para mapa maior
-            3: {"coins": 10, "distance": 1.0}   # Ajustado para mapa maior
-        }
-        
-        # Carregar imagem do barco
-        try:
-            self.boat_image = pygame.image.load('assets/images/boat.png').convert_alpha()
-            self.boat_image = pygame.transform.scale(self.boat_image, (100, 80))
-        except pygame.error:
-            self.boat_image = pygame.Surface((100, 80))
-            self.boat_image.fill(settings.WHITE)
-    
-    def _generate_path(self):
-        """Gera pontos do caminho que o barco deve seguir"""
-        path = []
-        start_x = 100
-        end_x = self.finish_line_x
-        
-        # Gera pontos ao longo do caminho com variações de altura
-        for x in range(start_x, end_x, 50):
-            # Altura base (meio da tela)
-            base_y = settings.SCREEN_HEIGHT - 200
-            
-            # Adiciona variações suaves no caminho
-            variation = math.sin((x - start_x) * 0.01) * 100  # Variação senoidal
-            y = base_y + variation
-            
-            # Garante que não saia dos limites
-            y = max(self.min_y + 50, min(self.max_y - 50, y))
-            
-            path.append((x, y))
-        
-        return path
+    def on_exit(self):
+        if self.simulation is not None and self.replay is None:
+            self._save_calibration()
+        if self.recorder is not None:
+            self.recorder.close(self.simulation)
+            print(f"Replay: {self.recorder.ticks} passos em {self.recorder.path}")
+            self.recorder = None
+        if self.telemetry is not None:
+            self.telemetry.close()
+            stats = self.telemetry.stats()
+            print(f"Telemetria: {stats['written']} registros em {self.telemetry.path}"
+                  + (f" ({stats['dropped']} descartados)" if stats['dropped'] else ""))
+            self.telemetry = None
     
-    def _generate_coins(self):
-        """Gera moedas ao longo do caminho"""
-        self.coins = []
-        start_x = 150
-        end_x = self.finish_line_x - 50
-        
-        # Gera moedas em posições estratégicas (mais moedas para mapa maior)
-        for x in range(start_x, end_x, 60):  # Distância menor entre moedas
-            # Altura baseada no caminho
-            base_y = settings.SCREEN_HEIGHT - 200
-            variation = math.sin((x - start_x) * 0.01) * 80
-            y = base_y + variation + random.randint(-40, 40)  # Variação maior
-            
-            # Garante que a moeda esteja em uma posição válida
-            y = max(self.min_y + 20, min(self.max_y - 20, y))
-            
-            self.coins.append({
-                'x': x,
-                'y': y,
-                'collected': False,
-                'radius': 15
-            })
-        
-        self.total_coins = len(self.coins)
-    
-    def _get_target_y(self):
-        """Retorna a altura alvo baseada na posição X atual"""
-        if self.current_path_index >= len(self.path_points):
-            return self.path_points[-1][1]
-        
-        # Encontra o ponto do caminho mais próximo da posição X atual
-        for i, (x, y) in enumerate(self.path_points):
-            if x >= self.boat_pos_x:
-                self.current_path_index = i
-                return y
-        
-        return self.path_points[-1][1]
-    
-    def _check_coin_collision(self):
-        """Verifica colisão com moedas"""
-        boat_rect = pygame.Rect(self.boat_pos_x, self.boat_pos_y, 100, 80)
-        
-        for coin in self.coins:
-            if not coin['collected']:
-                coin_rect = pygame.Rect(coin['x'] - coin['radius'], coin['y'] - coin['radius'], 
-                                      coin['radius'] * 2, coin['radius'] * 2)
-                
-                if boat_rect.colliderect(coin_rect):
-                    coin['collected'] = True
-                    self.coins_collected += 1
-                    print(f"Moeda coletada! Total: {self.coins_collected}/{self.total_coins}")
-    
-    def _check_phase_completion(self):
-        """Verifica se completou a fase atual"""
-        current_phase = self.phase_requirements.get(self.current_phase)
-        if current_phase:
-            progress = self.boat_pos_x / self.finish_line_x
-            
-            if (self.coins_collected >= current_phase["coins"] and 
-                progress >= current_phase["distance"]):
-                
-                self.phases_completed += 1
-                if self.current_phase < 3:
-                    self.current_phase += 1
-                    print(f"Fase {self.current_phase} desbloqueada!")
-                else:
-                    print("Todas as fases completadas!")
+    def _normalization(self):
+        """Sopro que vale 100% de esforço: a calibração salva, ajustada pela estimativa contínua"""
+        return blended_max_breath(self.max_calibrated_breath, self.input_manager.calibration,
+                                  self.input_manager.breath_multiplier, self.confident_breath_blocks)
+
+    def _save_calibration(self):
+        """Leva as estimativas da sessão para o perfil (gravado em segundo plano)"""
+        calibration = self.profile.calibration_data
+        calibration.update(self.input_manager.calibrator.calibration_data())
+        if self.input_manager.calibration.breath_count > 0:
+            calibration['max_breath_rms'] = self._normalization()
+        self.profile.save()
+
+    def _update_view(self):
+        """Move a câmera até o barco e carrega/descarrega os blocos da fase"""
+        self.viewport.follow(self.simulation.boat_pos_x)
+        self.level.update(*self.viewport.visible_range())
         
     def handle_events(self, events):
         for event in events:
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if self.replay is not None:
+                if event.key == pygame.K_ESCAPE:
+                    self.scene_manager.quit_game()
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    # Pula 10 s a partir do keyframe mais próximo
+                    step = 10 * self.replay.hz * (1 if event.key == pygame.K_RIGHT else -1)
+                    self._seek(self.simulation.tick + step)
+            elif event.key == pygame.K_ESCAPE:
                 self.scene_manager.go_to_scene('WorldMapScene')
 
+    def _seek(self, tick):
+        self.simulation = self.replay.simulation_at(tick)
+        self.level = self.simulation.level
+        self.prev_boat_pos_x = self.simulation.boat_pos_x
+        self.prev_boat_pos_y = self.simulation.boat_pos_y
+        self._update_view()
+
     def update(self):
-        # Obtém a intensidade do sopro
-        breath = self.input_manager.get_breath_intensity()
+        simulation = self.simulation
+        self.prev_boat_pos_x = simulation.boat_pos_x
+        self.prev_boat_pos_y = simulation.boat_pos_y
         
-        # Normaliza o esforço baseado na calibração
-        if self.max_calibrated_breath > 0.1:
-            self.normalized_effort = breath / self.max_calibrated_breath
-        else:
-            self.normalized_effort = 0.0
+        if self.replay is not None:
+            self._update_replay()
+            return
         
-        # Obtém a altura alvo do caminho
-        target_y = self._get_target_y()
+        # Leitura única e consistente das entradas neste tick
+        snapshot = self.input_manager.get_snapshot()
+        self.input_manager.latency.mark_consumed(snapshot)
+        breath = snapshot.breath_intensity if snapshot.mic_ok else 0.0
         
-        # Calcula a força de elevação baseada no sopro
-        if self.normalized_effort > 0.15:  # Limiar aumentado para menos sensibilidade
-            # A força de elevação é proporcional ao sopro (reduzida)
-            self.lift_force = self.normalized_effort * 10.0  # Reduzido de 15.0 para 10.0
+        # Normaliza o esforço baseado na calibração (acompanha a estimativa contínua do sopro)
+        max_breath = self._normalization()
+        if max_breath > 0.1:
+            normalized_effort = breath / max_breath
         else:
-            # Sem sopro, a força de elevação diminui gradualmente
-            self.lift_force = max(0, self.lift_force - 1.5)  # Reduzido de 2.0 para 1.5
-        
-        # Aplica a física do barco
-        self._update_boat_physics(target_y)
-        
-        # Verifica colisões com moedas
-        self._check_coin_collision()
-        
-        # Verifica conclusão de fases
-        self._check_phase_completion()
-        
-        # Verifica se chegou à linha de chegada
-        if self.boat_pos_x > self.finish_line_x:
-            print(f"Vitória! Fases completadas: {self.phases_completed}")
-            self.scene_manager.go_to_scene('WorldMapScene')
+            normalized_effort = 0.0
+        
+        events = simulation.step(normalized_effort)
+        self._update_view()
+        
+        if self.recorder is not None:
+            self.recorder.record(normalized_effort, simulation)
+        if self.telemetry is not None:
+            flags = 0
+            for event, _ in events:
+                flags |= EVENT_FLAGS[event]
+            self.telemetry.record(simulation.tick, snapshot.timestamp, breath, normalized_effort,
+                                  snapshot.motion_intensity, simulation.boat_pos_x, simulation.boat_pos_y,
+                                  simulation.boat_pos_x - self.prev_boat_pos_x, simulation.boat_velocity_y,
+                                  simulation.coins_collected, simulation.current_phase, flags)
+        
+        for event, value in events:
+            if event == EVENT_COIN:
+                print(f"Moeda coletada! Total: {value}/{simulation.total_coins}")
+            elif event == EVENT_PHASE:
+                print(f"Fase {value} desbloqueada!")
+            elif event == EVENT_ALL_PHASES:
+                print("Todas as fases completadas!")
+            elif event == EVENT_FINISH:
+                print(f"Vitória! Fases completadas: {value}")
+                self.scene_manager.go_to_scene('WorldMapScene')
 
-    def _update_boat_physics(self, target_y):
-        """Atualiza a física do barco (posição, velocidade, etc.)"""
-        # Calcula a diferença entre a posição atual e a alvo
-        y_diff = target_y - self.boat_pos_y
-        
-        # Aplica a força de elevação (para cima) baseada no sopro
-        self.boat_velocity_y -= self.lift_force
-        
-        # Aplica a gravidade (para baixo)
-        self.boat_velocity_y += self.gravity
-        
-        # Adiciona força para seguir o caminho (quando não está assoprando)
-        if self.normalized_effort < 0.1:
-            # Força suave para seguir o caminho
-            path_force = y_diff * 0.02
-            self.boat_velocity_y += path_force
-        
-        # Aplica resistência do ar (amortecimento)
-        self.boat_velocity_y *= 0.95
-        
-        # Atualiza a posição Y do barco
-        self.boat_pos_y += self.boat_velocity_y
-        
-        # Limita a posição Y do barco
-        if self.boat_pos_y < self.min_y:
-            self.boat_pos_y = self.min_y
-            self.boat_velocity_y = 0  # Para o movimento para cima
-        elif self.boat_pos_y > self.max_y:
-            self.boat_pos_y = self.max_y
-            self.boat_velocity_y = 0  # Para o movimento para baixo
-        
-        # Movimento horizontal suave baseado no sopro
-        if self.normalized_effort > 0.25:  # Limiar aumentado para menos sensibilidade
-            # Acelera para a direita quando assopra (mais suave)
-            self.boat_pos_x += 2.5  # Reduzido de 3.0 para 2.5
-        else:
-            # Movimento mais lento quando não assopra
-            self.boat_pos_x += 0.8  # Reduzido de 1.0 para 0.8
+    def _update_replay(self):
+        """Um passo da partida gravada (o esforço vem do arquivo, não do microfone)"""
+        effort = self.replay.effort(self.simulation.tick)
+        if effort is None:
+            print("Fim do replay.")
+            self.scene_manager.quit_game()
+            return
+        self.simulation.step(effort)
+        self._update_view()
 
     def draw(self, screen):
         # Fundo azul (céu)
@@ -236,17 +212,47 @@ class BoatScene(BaseScene):
         water_rect = pygame.Rect(0, settings.SCREEN_HEIGHT - 100, settings.SCREEN_WIDTH, 100)
         pygame.draw.rect(screen, (0, 100, 200), water_rect)
         
-        # Desenha a linha de chegada
-        pygame.draw.line(screen, settings.WHITE, (self.finish_line_x, 0), (self.finish_line_x, settings.SCREEN_HEIGHT), 5)
+        # Posição interpolada entre os dois últimos passos da física
+        simulation = self.simulation
+        alpha = self.render_alpha
+        boat_x = self.prev_boat_pos_x + (simulation.boat_pos_x - self.prev_boat_pos_x) * alpha
+        boat_y = self.prev_boat_pos_y + (simulation.boat_pos_y - self.prev_boat_pos_y) * alpha
+        
+        view = self.viewport
+        view.follow(boat_x)
+        # Efeitos decorativos são os primeiros desenhos cortados pelo QualityGovernor
+        effects = self.scene_manager.quality.effects
+        
+        if effects:
+            # Nuvens (decoração)
+            left, right = view.visible_range(margin=200)
+            for chunk in self.level.chunks_in(left, right):
+                for x, y, width, height in chunk.clouds:
+                    if view.is_visible(x + width / 2, width / 2):
+                        pygame.draw.ellipse(screen, (225, 240, 255), (view.to_screen_x(x), y, width, height))
+            
+            # Guia do caminho (amostrado da spline só na área visível)
+            guide_xs = np.arange(view.left - view.left % 25, view.right, 25.0)
+            for x, y in zip(guide_xs.tolist(), self.level.path.sample(guide_xs).tolist()):
+                if self.level.path.start_x <= x <= self.level.path.end_x:
+                    pygame.draw.circle(screen, (120, 190, 255), (view.to_screen_x(x), y + 40), 3)
         
-        # Desenha as moedas
-        for coin in self.coins:
-            if not coin['collected']:
-                pygame.draw.circle(screen, (255, 215, 0), (coin['x'], coin['y']), coin['radius'])
-                pygame.draw.circle(screen, (255, 165, 0), (coin['x'], coin['y']), coin['radius'], 3)
+        # Desenha a linha de chegada
+        if view.is_visible(self.simulation.finish_line_x, 5):
+            finish_x = view.to_screen_x(self.simulation.finish_line_x)
+            pygame.draw.line(screen, settings.WHITE, (finish_x, 0), (finish_x, settings.SCREEN_HEIGHT), 5)
+        
+        # Desenha as moedas (só as visíveis e não coletadas)
+        coins = self.level.coins
+        visible = coins.visible(view.left, view.right)
+        screen_xs = (coins.x[visible] - view.x).tolist()
+        for x, y, radius in zip(screen_xs, coins.y[visible].tolist(), coins.radius[visible].tolist()):
+            pygame.draw.circle(screen, (255, 215, 0), (x, y), radius)
+            if effects:
+                pygame.draw.circle(screen, (255, 165, 0), (x, y), radius, 3)
         
         # Desenha o barco na posição calculada
-        screen.blit(self.boat_image, (self.boat_pos_x, self.boat_pos_y))
+        screen.blit(self.boat_image, view.to_screen(boat_x, boat_y))
         
         # UI - Linha de controle de respiração
         self._draw_breath_control(screen)
@@ -267,14 +273,15 @@ class BoatScene(BaseScene):
         pygame.draw.rect(screen, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height), 2, border_radius=10)
         
         # Preenche a barra baseado no esforço
-        if self.normalized_effort > 0:
-            fill_width = min(self.normalized_effort * bar_width, bar_width)
+        normalized_effort = self.simulation.normalized_effort
+        if normalized_effort > 0:
+            fill_width = min(normalized_effort * bar_width, bar_width)
             fill_rect = pygame.Rect(bar_x, bar_y, fill_width, bar_height)
             
             # Cor baseada na intensidade
-            if self.normalized_effort > 0.7:
+            if normalized_effort > 0.7:
                 color = (255, 100, 100)  # Vermelho para sopro forte
-            elif self.normalized_effort > 0.4:
+            elif normalized_effort > 0.4:
                 color = (255, 200, 100)  # Laranja para sopro médio
             else:
                 color = (100, 255, 100)  # Verde para sopro suave
@@ -282,34 +289,40 @@ class BoatScene(BaseScene):
             pygame.draw.rect(screen, color, fill_rect, border_radius=10)
         
         # Texto da barra
-        font = pygame.font.Font(settings.FONT_PATH, 16)
-        breath_text = f"Respiração: {int(self.normalized_effort * 100)}%"
-        text_surf = font.render(breath_text, True, (255, 255, 255))
+        font = get_font(16)
+        breath_text = f"Respiração: {int(normalized_effort * 100)}%"
+        text_surf = render_text(font, breath_text, True, (255, 255, 255))
         screen.blit(text_surf, (bar_x, bar_y + bar_height + 5))
     
     def _draw_game_info(self, screen):
         """Desenha informações do jogo"""
-        font = pygame.font.Font(settings.FONT_PATH, 18)
+        font = get_font(18)
+        simulation = self.simulation
+        
+        if self.replay is not None:
+            replay_text = f"Replay {simulation.tick / self.replay.hz:.0f}/{self.replay.duration:.0f} s  (←/→ 10 s, Esc sai)"
+            replay_surf = render_text(font, replay_text, True, (255, 255, 255))
+            screen.blit(replay_surf, (settings.SCREEN_WIDTH - replay_surf.get_width() - 20, 20))
         
         # Moedas coletadas
-        coins_text = f"Moedas: {self.coins_collected}/{self.total_coins}"
-        coins_surf = font.render(coins_text, True, (255, 215, 0))
+        coins_text = f"Moedas: {simulation.coins_collected}/{simulation.total_coins}"
+        coins_surf = render_text(font, coins_text, True, (255, 215, 0))
         screen.blit(coins_surf, (20, 80))
         
         # Fase atual
-        phase_text = f"Fase: {self.current_phase}/3"
-        phase_surf = font.render(phase_text, True, (255, 255, 255))
+        phase_text = f"Fase: {simulation.current_phase}/{simulation.final_phase}"
+        phase_surf = render_text(font, phase_text, True, (255, 255, 255))
         screen.blit(phase_surf, (20, 110))
         
         # Progresso da distância
-        progress = self.boat_pos_x / self.finish_line_x
+        progress = simulation.progress
         progress_text = f"Progresso: {int(progress * 100)}%"
-        progress_surf = font.render(progress_text, True, (255, 255, 255))
+        progress_surf = render_text(font, progress_text, True, (255, 255, 255))
         screen.blit(progress_surf, (20, 140))
         
         # Requisitos da fase atual
-        current_phase = self.phase_requirements.get(self.current_phase)
-        if current_phase:
+        current_phase = simulation.phase_requirements.get(simulation.current_phase)
+        if current_phase and not simulation.all_phases_completed:
             req_text = f"Objetivo: {current_phase['coins']} moedas + {int(current_phase['distance'] * 100)}% distância"
-            req_surf = font.render(req_text, True, (100, 255, 100))
+            req_surf = render_text(font, req_text, True, (100, 255, 100))
             screen.blit(req_surf, (20, 170))
\ No newline at end of file
@@ -0,0 +1,197 @@
+# scenes/boat_simulation.py
+# Lógica da Travessia dos Ventos sem pygame: física do barco, moedas e fases.
+# A BoatScene desenha e lê o microfone; o simulador (simulator.py) usa a mesma
+# classe sem tela, com curvas de sopro roteirizadas, para ajustar os parâmetros.
+from dataclasses import dataclass, field
+
+import settings
+from scenes.boat_level import BoatLevel
+
+BOAT_WIDTH = 100
+BOAT_HEIGHT = 80
+
+# Eventos retornados por BoatSimulation.step como (evento, valor)
+EVENT_COIN = "coin"  # valor: total de moedas coletadas
+EVENT_PHASE = "phase"  # valor: fase desbloqueada
+EVENT_ALL_PHASES = "all_phases"  # valor: fases completadas
+EVENT_FINISH = "finish"  # valor: fases completadas
+
+
+def default_phase_requirements():
+    return {
+        1: {"coins": 4, "distance": 0.25},  # Ajustado para mapa maior
+        2: {"coins": 7, "distance": 0.55},  # Ajustado para mapa maior
+        3: {"coins": 10, "distance": 1.0}   # Ajustado para mapa maior
+    }
+
+
+@dataclass
+class BoatParams:
+    """Parâmetros ajustáveis da física (valores por passo de simulação, a 60 passos/s)"""
+
+    gravity: float = 0.8  # Força da gravidade
+    lift_scale: float = 10.0  # Elevação = esforço normalizado * lift_scale (reduzido de 15.0)
+    lift_decay: float = 1.5  # Queda da elevação por passo sem sopro (reduzido de 2.0)
+    lift_threshold: float = 0.15  # Esforço mínimo para gerar elevação
+    move_threshold: float = 0.25  # Esforço mínimo para acelerar para a direita
+    path_follow_threshold: float = 0.1  # Abaixo deste esforço o barco volta ao caminho
+    path_force: float = 0.02  # Força suave para seguir o caminho
+    damping: float = 0.95  # Resistência do ar
+    fast_speed: float = 2.5  # px/passo assoprando (reduzido de 3.0)
+    slow_speed: float = 0.8  # px/passo sem assoprar (reduzido de 1.0)
+    phase_requirements: dict = field(default_factory=default_phase_requirements)
+
+
+class BoatSimulation:
+    """Estado do minigame do barco, avançado um passo de simulação por vez"""
+
+    # Estado que muda a cada passo (o resto é refeito a partir de params, length e seed)
+    STATE_FIELDS = ('tick', 'finished', 'boat_pos_x', 'boat_pos_y', 'boat_velocity_y', 'lift_force',
+                    'normalized_effort', 'coins_collected', 'current_phase', 'phases_completed',
+                    'all_phases_completed')
+
+    def __init__(self, params=None, length=None, seed=None, chunk_width=400):
+        self.params = params or BoatParams()
+        self.phase_requirements = self.params.phase_requirements
+        self.final_phase = max(self.phase_requirements)
+
+        # Posição do barco
+        self.boat_pos_x = 100
+        self.boat_pos_y = settings.SCREEN_HEIGHT - 150  # Posição Y inicial
+        self.finish_line_x = length or settings.SCREEN_WIDTH + 300  # Mapa maior - linha mais distante
+
+        # Limites do barco (definir ANTES de gerar o caminho)
+        self.min_y = 50  # Altura mínima (topo da tela)
+        self.max_y = settings.SCREEN_HEIGHT - 150  # Altura máxima (chão)
+
+        # Caminho, moedas e decoração
+        self.level = BoatLevel(self.finish_line_x, self.min_y, self.max_y,
+                               chunk_width=chunk_width, seed=seed)
+        # Cursor no caminho: acompanha o barco sem buscar desde o começo a cada passo
+        self.path_cursor = self.level.path.cursor()
+
+        # Física do barco
+        self.boat_velocity_y = 0.0  # Velocidade vertical
+        self.lift_force = 0.0  # Força de elevação do sopro
+        self.normalized_effort = 0.0
+
+        # Sistema de moedas
+        self.coins_collected = 0
+        self.total_coins = self.level.total_coins
+
+        # Sistema de fases
+        self.current_phase = 1
+        self.phases_completed = 0
+        self.all_phases_completed = False
+
+        self.tick = 0
+        self.finished = False
+
+    @property
+    def progress(self):
+        return self.boat_pos_x / self.finish_line_x
+
+    def snapshot(self):
+        """Estado atual como dict serializável em JSON (keyframe do replay)"""
+        state = {name: getattr(self, name) for name in self.STATE_FIELDS}
+        state['path_index'] = self.path_cursor.index
+        state['collected'] = self.level.coins.collected_indices().tolist()
+        return state
+
+    def restore(self, state):
+        """Volta exatamente ao estado de snapshot() (mesmos params, length e seed)"""
+        for name in self.STATE_FIELDS:
+            setattr(self, name, state[name])
+        self.path_cursor.index = state['path_index']
+        self.level.coins.restore(state['collected'])
+
+    def step(self, normalized_effort):
+        """Avança um passo com o esforço do jogador (sopro / sopro máximo calibrado)"""
+        params = self.params
+        self.tick += 1
+        self.normalized_effort = normalized_effort
+        events = []
+
+        # Obtém a altura alvo do caminho
+        target_y = self.path_cursor.height(self.boat_pos_x)
+
+        # Calcula a força de elevação baseada no sopro
+        if normalized_effort > params.lift_threshold:
+            # A força de elevação é proporcional ao sopro
+            self.lift_force = normalized_effort * params.lift_scale
+        else:
+            # Sem sopro, a força de elevação diminui gradualmente
+            self.lift_force = max(0, self.lift_force - params.lift_decay)
+
+        # Aplica a física do barco
+        self._update_boat_physics(target_y)
+
+        # Verifica colisões com moedas (teste vetorizado só na janela perto do barco)
+        collected = self.level.coins.collide_rect(self.boat_pos_x, self.boat_pos_y, BOAT_WIDTH, BOAT_HEIGHT)
+        for _ in range(len(collected)):
+            self.coins_collected += 1
+            events.append((EVENT_COIN, self.coins_collected))
+
+        # Verifica conclusão de fases
+        self._check_phase_completion(events)
+
+        # Verifica se chegou à linha de chegada
+        if self.boat_pos_x > self.finish_line_x and not self.finished:
+            self.finished = True
+            events.append((EVENT_FINISH, self.phases_completed))
+        return events
+
+    def _check_phase_completion(self, events):
+        """Verifica se completou a fase atual"""
+        current_phase = self.phase_requirements.get(self.current_phase)
+        if current_phase and not self.all_phases_completed:
+            if (self.coins_collected >= current_phase["coins"] and
+                    self.progress >= current_phase["distance"]):
+
+                self.phases_completed += 1
+                if self.current_phase < self.final_phase:
+                    self.current_phase += 1
+                    events.append((EVENT_PHASE, self.current_phase))
+                else:
+                    # A última fase só conta uma vez (antes somava a cada frame depois de completa)
+                    self.all_phases_completed = True
+                    events.append((EVENT_ALL_PHASES, self.phases_completed))
+
+    def _update_boat_physics(self, target_y):
+        """Atualiza a física do barco (posição, velocidade, etc.)"""
+        params = self.params
+        # Calcula a diferença entre a posição atual e a alvo
+        y_diff = target_y - self.boat_pos_y
+
+        # Aplica a força de elevação (para cima) baseada no sopro
+        self.boat_velocity_y -= self.lift_force
+
+        # Aplica a gravidade (para baixo)
+        self.boat_velocity_y += params.gravity
+
+        # Adiciona força para seguir o caminho (quando não está assoprando)
+        if self.normalized_effort < params.path_follow_threshold:
+            # Força suave para seguir o caminho
+            self.boat_velocity_y += y_diff * params.path_force
+
+        # Aplica resistência do ar (amortecimento)
+        self.boat_velocity_y *= params.damping
+
+        # Atualiza a posição Y do barco
+        self.boat_pos_y += self.boat_velocity_y
+
+        # Limita a posição Y do barco
+        if self.boat_pos_y < self.min_y:
+            self.boat_pos_y = self.min_y
+            self.boat_velocity_y = 0  # Para o movimento para cima
+        elif self.boat_pos_y > self.max_y:
+            self.boat_pos_y = self.max_y
+            self.boat_velocity_y = 0  # Para o movimento para baixo
+
+        # Movimento horizontal suave baseado no sopro
+        if self.normalized_effort > params.move_threshold:
+            # Acelera para a direita quando assopra (mais suave)
+            self.boat_pos_x += params.fast_speed
+        else:
+            # Movimento mais lento quando não assopra
+            self.boat_pos_x += params.slow_speed
@@ -2,21 +2,33 @@
 import pygame
 from scenes.base_scene import BaseScene
 import settings
+from text_cache import get_font, render_text
+from breath_calibration import DecayingHistogram
 import time
 
 class CalibrationScene(BaseScene):
+    next_scenes = ('WorldMapScene',)
+
     def __init__(self, scene_manager):
         super().__init__(scene_manager)
-        self.profile = self.scene_manager.profile_manager.get_current_profile()
         self.input_manager = self.scene_manager.input_manager
-        self.font = pygame.font.Font(settings.FONT_PATH, settings.DEFAULT_FONT_SIZE)
-        
+        self.font = get_font(settings.DEFAULT_FONT_SIZE)
+        self.small_font = get_font(24)
+        self.listen_duration = 4 # segundos
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.profile = self.scene_manager.profile_manager.get_current_profile()
         self.state = "INSTRUCTIONS" # INSTRUCTIONS, LISTENING, DONE
         self.instruction_text = "Vamos calibrar seu Sopro Mágico!"
         self.countdown = 3
-        self.listen_duration = 4 # segundos
         self.start_time = 0
         self.max_rms_detected = 0.0
+        # Percentil alto em vez do máximo: um único bloco fora da curva não decide a calibração.
+        # Guarda o RMS bruto (as faixas do histograma vão até 10) e aplica a sensibilidade no fim
+        self.breath_levels = DecayingHistogram()
+        self.last_breath_seq = 0
 
     def handle_events(self, events):
         for event in events:
@@ -33,26 +45,47 @@ class CalibrationScene(BaseScene):
         if self.state == "LISTENING":
             elapsed_time = time.time() - self.start_time
             if elapsed_time <= self.listen_duration:
-                current_breath = self.input_manager.get_breath_intensity()
-                if current_breath > self.max_rms_detected:
-                    self.max_rms_detected = current_breath
+                snapshot = self.input_manager.get_snapshot()
+                if snapshot.breath_seq != self.last_breath_seq:
+                    self.last_breath_seq = snapshot.breath_seq
+                    if snapshot.breath_raw > 0:
+                        self.breath_levels.add(snapshot.breath_raw)
+                self.max_rms_detected = self.peak_breath(self.breath_levels, self.input_manager.breath_multiplier)
                 self.instruction_text = f"Continue... {int(self.listen_duration - elapsed_time) + 1}"
             else:
                 self.state = "DONE"
                 self.instruction_text = "Calibração concluída! Pressione Enter para continuar."
 
+    @staticmethod
+    def peak_breath(levels, multiplier):
+        """Força máxima do sopro na escala de breath_intensity (p95 do RMS bruto x sensibilidade)"""
+        peak = levels.quantile(0.95)
+        return peak * multiplier if peak else 0.0
+
     def save_calibration(self):
         self.profile.calibration_data['max_breath_rms'] = self.max_rms_detected if self.max_rms_detected > 0.1 else 1.0
         self.profile.is_calibrated = True
+        # O piso de ruído medido até aqui vai junto; os sopros do jogo recomeçam desta calibração
+        calibrator = self.input_manager.calibrator
+        calibrator.reset_breath()
+        self.profile.calibration_data.update(calibrator.calibration_data(include_breath=False))
+        for key in ('breath_p50', 'breath_p95', 'breath_histogram'):
+            self.profile.calibration_data.pop(key, None)
         self.profile.save()
 
     def draw(self, screen):
         screen.fill(settings.BLUE)
-        msg_surf = self.font.render(self.instruction_text, True, settings.WHITE)
+        msg_surf = render_text(self.font, self.instruction_text, True, settings.WHITE)
         msg_rect = msg_surf.get_rect(center=(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2))
         screen.blit(msg_surf, msg_rect)
 
         if self.state == "INSTRUCTIONS":
-            start_surf = self.font.render("Pressione ESPAÇO para começar", True, settings.WHITE)
+            start_surf = render_text(self.font, "Pressione ESPAÇO para começar", True, settings.WHITE)
             start_rect = start_surf.get_rect(center=(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2 + 100))
-            screen.blit(start_surf, start_rect)
\ No newline at end of file
+            screen.blit(start_surf, start_rect)
+            
+            # Ruído da sala estimado continuamente pelo calibrador
+            estimate = self.input_manager.calibration
+            noise_text = f"Ruído do ambiente: {estimate.noise_floor:.3f}  (limiar {estimate.noise_threshold:.3f})"
+            noise_surf = render_text(self.small_font, noise_text, True, settings.WHITE)
+            screen.blit(noise_surf, noise_surf.get_rect(center=(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2 + 170)))
\ No newline at end of file
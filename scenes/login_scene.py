@@ -2,14 +2,26 @@
 import pygame
 from scenes.base_scene import BaseScene
 import settings
+from text_cache import get_font, render_text
 
 class LoginScene(BaseScene):
+    supports_dirty_rects = True
+    next_scenes = ('CalibrationScene', 'WorldMapScene')
+
     def __init__(self, scene_manager):
         super().__init__(scene_manager)
         self.profile_manager = self.scene_manager.profile_manager
-        self.font = pygame.font.Font(settings.FONT_PATH, settings.DEFAULT_FONT_SIZE)
-        self.input_text = ""
+        self.font = get_font(settings.DEFAULT_FONT_SIZE)
         self.message = "Digite seu nome de Guardião e pressione Enter"
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.input_text = ""
+        
+        # Último texto desenhado (para redesenhar só a caixa quando ele mudar)
+        self.drawn_text = None
+        self.drawn_text_rect = pygame.Rect(0, 0, 0, 0)
 
     def handle_events(self, events):
         for event in events:
@@ -35,16 +47,32 @@ class LoginScene(BaseScene):
         pass
 
     def draw(self, screen):
-        screen.fill(settings.NIGHT_SKY)
-        
-        # Mensagem de instrução
-        msg_surf = self.font.render(self.message, True, settings.WHITE)
-        msg_rect = msg_surf.get_rect(center=(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2 - 100))
-        screen.blit(msg_surf, msg_rect)
+        # Tela estática: só a caixa de texto muda, e só quando o jogador digita
+        if self._full_redraw:
+            screen.fill(settings.NIGHT_SKY)
+            
+            # Mensagem de instrução
+            msg_surf = render_text(self.font, self.message, True, settings.WHITE)
+            msg_rect = msg_surf.get_rect(center=(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2 - 100))
+            screen.blit(msg_surf, msg_rect)
+            self._draw_input(screen)
+        elif self.input_text != self.drawn_text:
+            self._draw_input(screen)
 
+    def _draw_input(self, screen):
+        """Redesenha a caixa de texto e marca a região alterada"""
         # Caixa de texto
         input_box = pygame.Rect(settings.SCREEN_WIDTH / 2 - 200, settings.SCREEN_HEIGHT / 2, 400, 50)
+        
+        text_surf = render_text(self.font, self.input_text, True, settings.WHITE)
+        text_rect = text_surf.get_rect(topleft=(input_box.x + 10, input_box.y + 5))
+        
+        # O texto pode passar da caixa: limpa a área do texto anterior também
+        area = input_box.union(text_rect).union(self.drawn_text_rect)
+        screen.fill(settings.NIGHT_SKY, area)
         pygame.draw.rect(screen, settings.WHITE, input_box, 2)
+        screen.blit(text_surf, text_rect)
         
-        text_surf = self.font.render(self.input_text, True, settings.WHITE)
-        screen.blit(text_surf, (input_box.x + 10, input_box.y + 5))
\ No newline at end of file
+        self.drawn_text = self.input_text
+        self.drawn_text_rect = text_rect
+        self.mark_dirty(area)
@@ -4,18 +4,16 @@ import cv2
 import numpy as np
 from scenes.base_scene import BaseScene
 import settings
+from text_cache import get_font, render_text
 
 class TestScene(BaseScene):
+    next_scenes = ('WorldMapScene',)
+
     def __init__(self, scene_manager):
         super().__init__(scene_manager)
         self.input_manager = self.scene_manager.input_manager
-        self.font = pygame.font.Font(settings.FONT_PATH, 24)
-        self.small_font = pygame.font.Font(settings.FONT_PATH, 18)
-        
-        # Controles de sensibilidade
-        self.breath_multiplier = 100.0
-        self.motion_threshold = 30
-        self.show_camera = True
+        self.font = get_font(24)
+        self.small_font = get_font(18)
         
         # Cores para UI
         self.colors = {
@@ -26,6 +24,18 @@ class TestScene(BaseScene):
             'success': (100, 255, 100),
             'warning': (255, 200, 100)
         }
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        # Controles de sensibilidade
+        self.breath_multiplier = 100.0
+        self.motion_threshold = 30
+        self.show_camera = True
+        
+        # Superfície da câmera reaproveitada enquanto não chega um frame novo
+        self.camera_surface = None
+        self.camera_frame_seq = 0
 
     def handle_events(self, events):
         for event in events:
@@ -60,13 +70,16 @@ class TestScene(BaseScene):
         pygame.draw.rect(screen, self.colors['highlight'], panel_rect, 3, border_radius=10)
         
         # Título
-        title = self.font.render("CENA DE TESTE - MICROFONE E CÂMARA", True, self.colors['text'])
+        title = render_text(self.font, "CENA DE TESTE - MICROFONE E CÂMARA", True, self.colors['text'])
         screen.blit(title, (30, 30))
         
+        # Leitura única das entradas para todo o desenho deste frame
+        snapshot = self.input_manager.get_snapshot()
+        
         # Informações do microfone
-        breath_intensity = self.input_manager.get_breath_intensity()
+        breath_intensity = snapshot.breath_intensity
         breath_text = f"Intensidade do Sopro: {breath_intensity:.1f}"
-        breath_surf = self.small_font.render(breath_text, True, self.colors['text'])
+        breath_surf = render_text(self.small_font, breath_text, True, self.colors['text'])
         screen.blit(breath_surf, (30, 80))
         
         # Barra de intensidade do sopro
@@ -82,20 +95,20 @@ class TestScene(BaseScene):
         
         # Controles de sensibilidade do microfone
         sensitivity_text = f"Sensibilidade MIC: {self.breath_multiplier:.1f}x"
-        sensitivity_surf = self.small_font.render(sensitivity_text, True, self.colors['text'])
+        sensitivity_surf = render_text(self.small_font, sensitivity_text, True, self.colors['text'])
         screen.blit(sensitivity_surf, (30, 160))
         
         # Informações de movimento
-        motion_detected = self.input_manager.get_motion_detected()
-        motion_intensity = self.input_manager.get_motion_intensity()
+        motion_detected = snapshot.motion_detected
+        motion_intensity = snapshot.motion_intensity
         
         motion_text = f"Movimento: {'SIM' if motion_detected else 'NÃO'}"
         motion_color = self.colors['success'] if motion_detected else self.colors['warning']
-        motion_surf = self.small_font.render(motion_text, True, motion_color)
+        motion_surf = render_text(self.small_font, motion_text, True, motion_color)
         screen.blit(motion_surf, (30, 200))
         
         motion_int_text = f"Intensidade Movimento: {motion_intensity:.1f}"
-        motion_int_surf = self.small_font.render(motion_int_text, True, self.colors['text'])
+        motion_int_surf = render_text(self.small_font, motion_int_text, True, self.colors['text'])
         screen.blit(motion_int_surf, (30, 230))
         
         # Barra de intensidade do movimento
@@ -110,7 +123,7 @@ class TestScene(BaseScene):
         
         # Controles de sensibilidade do movimento
         motion_sensitivity_text = f"Sensibilidade Movimento: {self.motion_threshold}"
-        motion_sensitivity_surf = self.small_font.render(motion_sensitivity_text, True, self.colors['text'])
+        motion_sensitivity_surf = render_text(self.small_font, motion_sensitivity_text, True, self.colors['text'])
         screen.blit(motion_sensitivity_surf, (30, 300))
         
         # Instruções
@@ -123,20 +136,23 @@ class TestScene(BaseScene):
         ]
         
         for i, instruction in enumerate(instructions):
-            inst_surf = self.small_font.render(instruction, True, self.colors['highlight'])
+            inst_surf = render_text(self.small_font, instruction, True, self.colors['highlight'])
             screen.blit(inst_surf, (30, 400 + i * 25))
         
-        # Câmera (lado direito)
-        if self.show_camera:
-            camera_frame = self.input_manager.get_camera_frame()
-            if camera_frame is not None:
-                # Converte frame OpenCV para Pygame
-                camera_surface = self._cv2_to_pygame(camera_frame)
-                
-                # Redimensiona para caber na tela
+        # Câmera (lado direito); a prévia é pausada pelo QualityGovernor em máquinas lentas
+        preview = self.show_camera and self.scene_manager.quality.camera_preview
+        if preview:
+            frame_seq, camera_frame = self.input_manager.get_latest_frame()
+            if camera_frame is not None and frame_seq != self.camera_frame_seq:
+                # Converte frame OpenCV para Pygame só quando chega um frame novo
+                self.camera_surface = self._cv2_to_pygame(camera_frame)
+                self.camera_frame_seq = frame_seq
+            
+            camera_surface = self.camera_surface
+            if camera_surface is not None:
+                # Tamanho da prévia (o frame já é redimensionado na conversão)
                 camera_width = 400
                 camera_height = 300
-                camera_surface = pygame.transform.scale(camera_surface, (camera_width, camera_height))
                 
                 # Desenha a câmera no lado direito
                 camera_rect = pygame.Rect(450, 20, camera_width, camera_height)
@@ -146,22 +162,33 @@ class TestScene(BaseScene):
                 pygame.draw.rect(screen, self.colors['highlight'], camera_rect, 3, border_radius=10)
                 
                 # Título da câmera
-                camera_title = self.small_font.render("CÂMARA - DETECÇÃO DE MOVIMENTO", True, self.colors['text'])
+                camera_title = render_text(self.small_font, "CÂMARA - DETECÇÃO DE MOVIMENTO", True, self.colors['text'])
                 screen.blit(camera_title, (450, 340))
         
         # Status da câmera
-        camera_status = "Câmera: ATIVA" if self.show_camera else "Câmera: DESATIVADA"
-        status_color = self.colors['success'] if self.show_camera else self.colors['warning']
-        status_surf = self.small_font.render(camera_status, True, status_color)
+        if preview:
+            camera_status = "Câmera: ATIVA"
+        elif self.show_camera:
+            camera_status = "Câmera: PRÉVIA PAUSADA (desempenho)"
+        else:
+            camera_status = "Câmera: DESATIVADA"
+        status_color = self.colors['success'] if preview else self.colors['warning']
+        status_surf = render_text(self.small_font, camera_status, True, status_color)
         screen.blit(status_surf, (450, 370))
+        
+        # Saúde dos dispositivos
+        devices_text = f"MIC: {snapshot.mic_status} | CAM: {snapshot.camera_status}"
+        devices_color = self.colors['success'] if snapshot.mic_ok and snapshot.camera_ok else self.colors['warning']
+        devices_surf = render_text(self.small_font, devices_text, True, devices_color)
+        screen.blit(devices_surf, (450, 395))
 
     def _cv2_to_pygame(self, cv2_frame):
         """Converte um frame OpenCV para uma superfície Pygame"""
-        # Converte BGR para RGB
-        rgb_frame = cv2.cvtColor(cv2_frame, cv2.COLOR_BGR2RGB)
+        # Redimensiona antes de converter as cores (menos pixels para converter)
+        small_frame = cv2.resize(cv2_frame, (400, 300))
         
-        # Redimensiona para melhor performance
-        rgb_frame = cv2.resize(rgb_frame, (400, 300))
+        # Converte BGR para RGB
+        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
         
         # Converte para Pygame
         pygame_surface = pygame.surfarray.make_surface(rgb_frame.swapaxes(0, 1))
@@ -2,25 +2,32 @@
 import pygame
 from scenes.base_scene import BaseScene
 import settings
+from text_cache import get_font, render_text
+from asset_manager import load_image
 
 class WorldMapScene(BaseScene):
+    supports_dirty_rects = True
+    assets = (('assets/images/world_map.png', False, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)),)
+    next_scenes = ('BoatScene', 'TestScene')
+
     def __init__(self, scene_manager):
         super().__init__(scene_manager)
-        self.profile = self.scene_manager.profile_manager.get_current_profile()
-        self.font = pygame.font.Font(settings.FONT_PATH, settings.DEFAULT_FONT_SIZE)
-        self.small_font = pygame.font.Font(settings.FONT_PATH, 20)
+        self.font = get_font(settings.DEFAULT_FONT_SIZE)
+        self.small_font = get_font(20)
         
-        try:
-            self.background = pygame.image.load('assets/images/world_map.png').convert()
-            self.background = pygame.transform.scale(self.background, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-        except pygame.error:
-            self.background = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-            self.background.fill(settings.GREEN)
+        # Sem o arquivo do mapa, um fundo verde
+        self.background = load_image('assets/images/world_map.png', False,
+                                     (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), settings.GREEN)
 
         self.locations = {
             "Travessia dos Ventos": {'pos': (300, 300), 'scene': 'BoatScene'},
             "Jardim Sussurrante": {'pos': (800, 450), 'scene': None}, # Em Breve
         }
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.profile = self.scene_manager.profile_manager.get_current_profile()
 
     def handle_events(self, events):
         for event in events:
@@ -40,8 +47,11 @@ class WorldMapScene(BaseScene):
         pass
 
     def draw(self, screen):
+        # O mapa é estático: só desenha quando a tela inteira precisa ser refeita
+        if not self._full_redraw:
+            return
         screen.blit(self.background, (0, 0))
-        title_surf = self.font.render(f"Bem-vindo, Guardião {self.profile.name}!", True, settings.BLACK)
+        title_surf = render_text(self.font, f"Bem-vindo, Guardião {self.profile.name}!", True, settings.BLACK)
         screen.blit(title_surf, (20, 20))
         
         # Desenha os locais do mapa
@@ -51,7 +61,7 @@ class WorldMapScene(BaseScene):
             pygame.draw.rect(screen, color, rect, border_radius=15)
             
             text = name if data['scene'] else f"{name} (Em Breve)"
-            text_surf = self.font.render(text, True, settings.WHITE)
+            text_surf = render_text(self.font, text, True, settings.WHITE)
             text_rect = text_surf.get_rect(center=rect.center)
             screen.blit(text_surf, text_rect)
         
@@ -60,6 +70,6 @@ class WorldMapScene(BaseScene):
         pygame.draw.rect(screen, settings.BLUE, test_button_rect, border_radius=10)
         pygame.draw.rect(screen, settings.WHITE, test_button_rect, 3, border_radius=10)
         
-        test_text = self.small_font.render("🧪 TESTE MIC/CÂMERA", True, settings.WHITE)
+        test_text = render_text(self.small_font, "🧪 TESTE MIC/CÂMERA", True, settings.WHITE)
         test_text_rect = test_text.get_rect(center=test_button_rect.center)
         screen.blit(test_text, test_text_rect)
\ No newline at end of file
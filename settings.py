@@ -1,10 +1,13 @@
 # settings.py
 # Configurações globais do jogo
+import os
 
 # Tela
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
+SIMULATION_HZ = 60  # Passos de física por segundo (a física do barco foi ajustada para 60)
+MAX_SIMULATION_STEPS = 5  # Máximo de passos por frame antes de descartar o atraso
 TITLE = "Aetheria: Guardiões do Sopro e do Gesto"
 
 # Cores (Padrão RGB)
@@ -18,11 +21,87 @@ GREY = (128, 128, 128)
 
 # Configurações do Microfone
 MIC_DEVICE_ID = None
-MIC_SAMPLE_RATE = 44100
+# Perfis de latência do microfone: taxa de amostragem, tamanho do bloco e dica de latência
+# do PortAudio ('low', 'high' ou segundos; None = padrão do sounddevice). downsample reduz a
+# taxa antes da análise (o sopro fica abaixo de ~4 kHz) e smoothing é a média móvel do RMS em s.
+AUDIO_LATENCY_PROFILES = {
+    'low': {'samplerate': 48000, 'blocksize': 512, 'latency': 'low', 'downsample': 4, 'smoothing': 0.1},  # 10.7 ms/bloco
+    'balanced': {'samplerate': 44100, 'blocksize': 1024, 'latency': None, 'downsample': 1, 'smoothing': 0.186},  # 23 ms/bloco
+    'power-save': {'samplerate': 44100, 'blocksize': 2048, 'latency': 'high', 'downsample': 2, 'smoothing': 0.186},  # 46 ms/bloco
+}
+AUDIO_LATENCY_PROFILE = os.environ.get("AETHERIA_AUDIO_PROFILE", "balanced")
+if AUDIO_LATENCY_PROFILE not in AUDIO_LATENCY_PROFILES:
+    print(f"Perfil de áudio desconhecido ({AUDIO_LATENCY_PROFILE}); usando 'balanced'. "
+          f"Opções: {', '.join(AUDIO_LATENCY_PROFILES)}")
+    AUDIO_LATENCY_PROFILE = "balanced"
+MIC_SAMPLE_RATE = AUDIO_LATENCY_PROFILES[AUDIO_LATENCY_PROFILE]['samplerate']
+MIC_BLOCK_SIZE = AUDIO_LATENCY_PROFILES[AUDIO_LATENCY_PROFILE]['blocksize']
+MIC_LATENCY = AUDIO_LATENCY_PROFILES[AUDIO_LATENCY_PROFILE]['latency']
+MIC_DOWNSAMPLE = AUDIO_LATENCY_PROFILES[AUDIO_LATENCY_PROFILE]['downsample']
+MIC_SMOOTHING = AUDIO_LATENCY_PROFILES[AUDIO_LATENCY_PROFILE]['smoothing']
+BREATH_SPECTRAL_GATE = True  # Ignora sons que não têm assinatura espectral de sopro (voz, palmas, ventilador)
+
+# Calibração contínua do sopro (ver breath_calibration.py)
+NOISE_GATE_MARGIN = 1.25  # Limiar = piso de ruído (quantil NOISE_QUANTILE dos blocos sem sopro) x margem;
+# margem curta porque o ruído que passa do limiar ainda é barrado pelo classificador espectral
+NOISE_GATE_RANGE = (0.05, 0.3)  # Limites do limiar de ruído (RMS); numa sala silenciosa fica no mínimo
+NOISE_HALF_LIFE = 2.0  # s: o piso de ruído acompanha a sala em poucos segundos (~4 s para um ventilador ligar)
+NOISE_QUANTILE = 0.25  # Quantil do ruído usado como piso: as pausas, mesmo com o paciente soprando 3/4 do tempo
+BREATH_HALF_LIFE = 120.0  # s: a força do sopro do paciente muda mais devagar
+BREATH_CONFIDENT_SECONDS = 5.0  # s de sopro até a normalização usar só a estimativa contínua
 
 # Configurações da Câmera
 CAM_DEVICE_ID = 0
+CAM_FRAME_WIDTH = 640  # Resolução pedida à câmera (e tamanho máximo da prévia)
+CAM_FRAME_HEIGHT = 480
+CAM_FPS = 30
+CAM_FOURCC = "MJPG"  # "MJPG" (comprimido, mais fps via USB 2), "YUYV" (sem compressão) ou None (padrão do driver)
+CAM_BUFFER_SIZE = 1  # Frames na fila do driver; a thread de captura descarta os velhos mesmo se ele ignorar
+MOTION_WORKER_PROCESS = False  # Detecta movimento em um processo separado (memória compartilhada)
+MOTION_ENGINE = "diff"  # "diff", "pyramid", "mog2" ou "flow" (compare com benchmarks/bench_motion.py)
+MOTION_PROCESSING_WIDTH = None  # Largura usada na detecção (None = resolução da câmera)
+
+# Fontes de entrada (ver input_backends.py)
+# Áudio: "device", "synthetic" ou caminho para .wav/.npy gravado
+# Vídeo: "device", "synthetic", "none" ou caminho para .npy/arquivo de vídeo
+AUDIO_BACKEND = os.environ.get("AETHERIA_AUDIO_BACKEND", "device")
+VIDEO_BACKEND = os.environ.get("AETHERIA_VIDEO_BACKEND", "device")
+INPUT_REPLAY_SPEED = float(os.environ.get("AETHERIA_REPLAY_SPEED", "1.0"))  # 0 = o mais rápido possível
+
+# Travessia dos Ventos (BoatScene)
+BOAT_LEVEL_LENGTH = None  # Posição da linha de chegada em px (None = SCREEN_WIDTH + 300)
+BOAT_CHUNK_WIDTH = 400  # Largura dos blocos de conteúdo carregados ao redor do barco
+BOAT_LEVEL_SEED = None  # Semente da geração da fase (None = uma nova a cada partida)
+
+# Telemetria das partidas (ver telemetry.py)
+TELEMETRY_DIR = "telemetry"  # Uma pasta por sessão aqui dentro; None para desativar
+TELEMETRY_CHUNK_RECORDS = 1024  # Registros por bloco gravado (~17 s a 60 passos/s)
+
+# Replays determinísticos (ver replay.py)
+REPLAY_DIR = "replays"  # Semente + esforço por passo de cada partida; None para desativar
+REPLAY_KEYFRAME_INTERVAL = 600  # Passos entre keyframes (10 s a 60 passos/s)
+
+# Renderização
+DIRTY_RECT_RENDERING = True  # Cenas estáticas atualizam só as regiões alteradas (display.update)
+DIRTY_RECT_MAX_COVERAGE = 0.5  # Acima desta fração da tela alterada, faz flip completo
+
+# Governador de qualidade (ver quality_governor.py): reduz, nesta ordem, a detecção de
+# movimento, a prévia da câmera, os efeitos visuais e o ritmo da tela quando o frame estoura
+QUALITY_GOVERNOR = True
+QUALITY_WINDOW_FRAMES = 120  # Janela dos percentis do tempo de trabalho do frame (2 s a 60 fps)
+QUALITY_DOWNGRADE_AT = 0.9  # Desce um nível quando o p95 passa desta fração do orçamento (1 / FPS)
+QUALITY_UPGRADE_AT = 0.6  # Sobe um nível quando o p95 fica abaixo desta fração
+QUALITY_RECOVER_SECONDS = 5.0  # Tempo mínimo num nível antes de subir (dobra se o nível voltar a estourar)
+QUALITY_MOTION_WIDTH = 320  # Largura da detecção de movimento nos níveis reduzidos
+QUALITY_MOTION_STRIDE = 2  # Detecta 1 de cada N frames da câmera nos níveis reduzidos
+QUALITY_RENDER_DIVISOR = 2  # No último nível o loop roda a FPS / divisor (a física não muda)
+QUALITY_LOG_PATH = "quality_log.jsonl"  # Uma linha por mudança de nível (com a máquina); None para desativar
+
+# Latência (captura -> tela)
+LATENCY_OVERLAY = False  # Mostra os percentis na tela (alterna com F3)
+LATENCY_REPORT_PATH = "latency_report.json"  # Exportado ao sair; None para desativar
 
 # Arquivos
+PROFILE_DB_PATH = "profiles.db"  # Banco SQLite dos perfis (profile_*.json antigos são importados ao entrar)
 DEFAULT_FONT_SIZE = 50
 FONT_PATH = None  # None para usar a fonte padrão do Pygame
\ No newline at end of file
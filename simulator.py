@@ -0,0 +1,216 @@
+# simulator.py
+# Simulador em lote da Travessia dos Ventos: roda a lógica da BoatScene sem tela,
+# com curvas de sopro roteirizadas, e varre grades de parâmetros em paralelo.
+# Uso: python simulator.py --gravity 0.6,0.8,1.0 --lift-scale 8,10,12 \
+#          --curve pulses:period=4,exhale=0.5,peak=0.8 --curve steady:peak=0.4 --workers 4
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import settings
+from input_backends import breath_envelope
+from scenes.boat_simulation import BoatParams, BoatSimulation, default_phase_requirements
+
+PHASE_PRESETS = {
+    'default': default_phase_requirements(),
+    'easy': {1: {"coins": 2, "distance": 0.25}, 2: {"coins": 4, "distance": 0.55},
+             3: {"coins": 6, "distance": 1.0}},
+    'hard': {1: {"coins": 6, "distance": 0.25}, 2: {"coins": 10, "distance": 0.55},
+             3: {"coins": 14, "distance": 1.0}},
+}
+
+
+def parse_curve(spec):
+    """'pulses:period=4,peak=0.8' -> ('pulses', {'period': 4.0, 'peak': 0.8})"""
+    name, _, options = spec.partition(':')
+    values = {}
+    for item in filter(None, options.split(',')):
+        key, _, value = item.partition('=')
+        values[key.strip()] = float(value)
+    if name not in BREATH_CURVES:
+        raise ValueError(f"Curva de sopro desconhecida: {name} (opções: {', '.join(BREATH_CURVES)})")
+    return name, values
+
+
+def _pulses(t, period=4.0, exhale=0.5, peak=0.8, ramp=0.15):
+    """Ciclos respiratórios regulares (o mesmo envelope do áudio sintético)"""
+    return breath_envelope(t, period, exhale, peak, ramp)
+
+
+def _steady(t, peak=0.4):
+    """Sopro contínuo e constante"""
+    return np.full_like(t, peak)
+
+
+def _fatigue(t, period=4.0, exhale=0.5, peak=1.0, ramp=0.15, half_life=60.0):
+    """Ciclos que enfraquecem com o tempo (meia-vida em segundos)"""
+    return breath_envelope(t, period, exhale, peak, ramp) * 0.5 ** (t / half_life)
+
+
+def _none(t):
+    """Nenhum sopro: o barco só anda na velocidade lenta"""
+    return np.zeros_like(t)
+
+
+BREATH_CURVES = {
+    'pulses': _pulses,
+    'steady': _steady,
+    'fatigue': _fatigue,
+    'none': _none,
+}
+
+
+def breath_curve(spec, ticks, hz):
+    """Esforço normalizado de cada passo (array com ticks valores)"""
+    name, options = parse_curve(spec)
+    t = np.arange(ticks, dtype=np.float64) / hz
+    return BREATH_CURVES[name](t, **options)
+
+
+def run_simulation(config):
+    """Roda uma partida até a linha de chegada (ou max_seconds) e resume o resultado"""
+    hz = config.get('hz', settings.SIMULATION_HZ)
+    max_ticks = int(config.get('max_seconds', 600) * hz)
+    params = BoatParams(**config.get('params', {}))
+    simulation = BoatSimulation(params, length=config.get('length'), seed=config.get('seed', 0))
+    efforts = breath_curve(config.get('curve', 'pulses'), max_ticks, hz).tolist()
+
+    phase_ticks = {}
+    start = time.perf_counter()
+    for effort in efforts:
+        simulation.step(effort)
+        if simulation.phases_completed not in phase_ticks:
+            phase_ticks[simulation.phases_completed] = simulation.tick
+        if simulation.finished:
+            break
+    elapsed = time.perf_counter() - start
+
+    return {
+        'config': config,
+        'finished': simulation.finished,
+        'completion_time': simulation.tick / hz if simulation.finished else None,
+        'ticks': simulation.tick,
+        'coins': simulation.coins_collected,
+        'total_coins': simulation.total_coins,
+        'phases': simulation.phases_completed,
+        'phase_times': {phase: tick / hz for phase, tick in phase_ticks.items() if phase > 0},
+        'ticks_per_second': simulation.tick / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def build_grid(args):
+    """Produto cartesiano dos valores pedidos na linha de comando"""
+    phases = []
+    for name in args.phases.split(','):
+        if name in PHASE_PRESETS:
+            phases.append((name, PHASE_PRESETS[name]))
+        else:
+            with open(name, "r") as f:
+                data = json.load(f)
+            phases.append((os.path.basename(name), {int(phase): req for phase, req in data.items()}))
+
+    configs = []
+    for gravity, lift_scale, lift_threshold, move_threshold, (phase_name, requirements), curve, seed in itertools.product(
+            _floats(args.gravity), _floats(args.lift_scale), _floats(args.lift_threshold),
+            _floats(args.move_threshold), phases, args.curve or ['pulses'], _ints(args.seeds)):
+        configs.append({
+            'params': {
+                'gravity': gravity,
+                'lift_scale': lift_scale,
+                'lift_threshold': lift_threshold,
+                'move_threshold': move_threshold,
+                'phase_requirements': requirements,
+            },
+            'phases_name': phase_name,
+            'curve': curve,
+            'seed': seed,
+            'length': args.length,
+            'max_seconds': args.max_seconds,
+        })
+    return configs
+
+
+def _floats(text):
+    return [float(value) for value in text.split(',')]
+
+
+def _ints(text):
+    return [int(value) for value in text.split(',')]
+
+
+def sweep(configs, workers=None):
+    """Avalia as configurações em paralelo (um processo por núcleo por padrão)"""
+    if workers == 1:
+        return [run_simulation(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_simulation, configs, chunksize=max(1, len(configs) // 32)))
+
+
+def print_results(results):
+    print(f"{'gravidade':>9} {'elevação':>8} {'lim.el.':>7} {'lim.mov':>7} {'fases':>8} {'curva':<36} "
+          f"{'seed':>4} {'tempo s':>8} {'moedas':>9} {'fases':>5}")
+    for result in results:
+        config = result['config']
+        params = config['params']
+        completion = f"{result['completion_time']:.1f}" if result['finished'] else "—"
+        print(f"{params['gravity']:>9.2f} {params['lift_scale']:>8.1f} {params['lift_threshold']:>7.2f} "
+              f"{params['move_threshold']:>7.2f} {config['phases_name']:>8} {config['curve']:<36} "
+              f"{config['seed']:>4} {completion:>8} {result['coins']:>4}/{result['total_coins']:<4} "
+              f"{result['phases']:>5}")
+
+
+def save_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(['gravity', 'lift_scale', 'lift_threshold', 'move_threshold', 'phases_preset', 'curve',
+                         'seed', 'finished', 'completion_time', 'coins', 'total_coins', 'phases', 'phase_times'])
+        for result in results:
+            config = result['config']
+            params = config['params']
+            writer.writerow([params['gravity'], params['lift_scale'], params['lift_threshold'],
+                             params['move_threshold'], config['phases_name'], config['curve'], config['seed'],
+                             result['finished'], result['completion_time'], result['coins'],
+                             result['total_coins'], result['phases'], json.dumps(result['phase_times'])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador em lote da Travessia dos Ventos")
+    parser.add_argument('--gravity', default='0.8', help="Valores separados por vírgula")
+    parser.add_argument('--lift-scale', default='10.0')
+    parser.add_argument('--lift-threshold', default='0.15')
+    parser.add_argument('--move-threshold', default='0.25')
+    parser.add_argument('--phases', default='default',
+                        help=f"Presets ({', '.join(PHASE_PRESETS)}) ou arquivos JSON, separados por vírgula")
+    parser.add_argument('--curve', action='append',
+                        help=f"Curva de sopro, pode repetir ({', '.join(BREATH_CURVES)}), ex.: pulses:period=4,peak=0.8")
+    parser.add_argument('--seeds', default='0', help="Sementes das fases (moedas)")
+    parser.add_argument('--length', type=int, default=settings.BOAT_LEVEL_LENGTH,
+                        help="Posição da linha de chegada (padrão: a do jogo)")
+    parser.add_argument('--max-seconds', type=float, default=600.0, help="Tempo máximo simulado por partida")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: um por núcleo)")
+    parser.add_argument('--csv', help="Salva os resultados em CSV")
+    args = parser.parse_args()
+
+    configs = build_grid(args)
+    print(f"Simulando {len(configs)} configurações...")
+    start = time.perf_counter()
+    results = sweep(configs, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print_results(results)
+    ticks = sum(result['ticks'] for result in results)
+    print(f"{ticks} passos em {elapsed:.2f} s ({ticks / elapsed:.0f} passos/s no total, "
+          f"{np.mean([r['ticks_per_second'] for r in results]):.0f} por processo)")
+    if args.csv:
+        save_csv(results, args.csv)
+        print(f"Resultados salvos em {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# startup.py
+# Inicialização em segundo plano: a janela e o login aparecem na hora, enquanto
+# OpenCV, microfone e câmera são preparados em uma thread com progresso visível.
+import threading
+import time
+
+
+class BackgroundInitializer:
+    """Executa etapas (rótulo, função) em ordem numa thread e registra o tempo de cada uma.
+
+    cancel() faz as etapas que ainda não começaram serem puladas (ao sair do jogo
+    durante a inicialização); a que está rodando termina normalmente.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.timings = {}  # rótulo -> segundos
+        self.errors = {}  # rótulo -> exceção
+        self.current = None
+        self.completed = 0
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for label, step in self.steps:
+            if self._cancelled.is_set():
+                break
+            self.current = label
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                # Uma etapa que falha (ex.: sem câmera) não impede as outras
+                print(f"Falha na inicialização ({label}): {e}")
+                self.errors[label] = e
+            self.timings[label] = time.perf_counter() - start
+            self.completed += 1
+        self.current = None
+        self.finished_at = time.perf_counter()
+        self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def progress(self):
+        """Fração concluída (0-1)"""
+        return self.completed / len(self.steps) if self.steps else 1.0
+
+    @property
+    def total_time(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Não começa mais nenhuma etapa"""
+        self._cancelled.set()
+
+    def run(self):
+        """Executa tudo na thread atual (scripts e benchmarks)"""
+        self.started_at = time.perf_counter()
+        self._run()
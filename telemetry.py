@@ -0,0 +1,184 @@
+# telemetry.py
+# Registro por tick da partida (sopro, esforço, movimento, barco, moedas) para
+# revisão clínica. A cena escreve em buffers NumPy pré-alocados; uma thread grava
+# os blocos cheios em arquivos colunares (um arquivo binário por campo), que
+# load_session abre com np.memmap sem ler tudo para a memória.
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+# Um registro por passo de simulação (tamanho fixo)
+RECORD_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('time', '<f8'),  # s desde o início da sessão
+    ('breath', '<f4'),  # Intensidade do sopro (com multiplicador)
+    ('effort', '<f4'),  # Sopro normalizado pela calibração
+    ('motion', '<f4'),
+    ('boat_x', '<f4'),
+    ('boat_y', '<f4'),
+    ('velocity_x', '<f4'),  # px/passo
+    ('velocity_y', '<f4'),
+    ('coins', '<u2'),  # Moedas coletadas até aqui
+    ('phase', '<u1'),
+    ('events', '<u1'),  # Máscara de EVENT_FLAGS
+])
+
+# Bits da coluna events
+EVENT_FLAGS = {
+    'coin': 1,
+    'phase': 2,
+    'all_phases': 4,
+    'finish': 8,
+}
+
+META_FILE = "meta.json"
+
+
+class TelemetryRecorder:
+    """Grava uma sessão em path/ (um diretório por sessão).
+
+    record() custa uma atribuição de linha num buffer pré-alocado. Quando o
+    buffer enche, ele vai para a fila da thread de escrita e o próximo buffer
+    livre do pool assume; se a escrita atrasar e o pool acabar, os registros
+    são descartados (e contados em dropped) em vez de travar o jogo.
+    """
+
+    def __init__(self, path, metadata=None, chunk_records=1024, buffers=8):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.metadata = dict(metadata or {})
+        self.chunk_records = chunk_records
+        self._free = queue.Queue()
+        for _ in range(buffers):
+            self._free.put(np.zeros(chunk_records, dtype=RECORD_DTYPE))
+        self._buffer = self._free.get_nowait()
+        self._count = 0  # Registros no buffer atual
+        self._queue = queue.Queue()
+        self._started = time.perf_counter()
+
+        self.records = 0
+        self.written = 0
+        self.dropped = 0
+        self.chunks = 0
+        self.write_time = 0.0
+        self.closed = False
+
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name in RECORD_DTYPE.names}
+        self._write_meta()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def record(self, tick, timestamp, breath, effort, motion, boat_x, boat_y,
+               velocity_x, velocity_y, coins, phase, events=0):
+        """Adiciona um registro (timestamp em perf_counter)"""
+        buffer = self._buffer
+        if buffer is None:
+            # Pool esgotado: tenta recuperar um buffer já gravado
+            try:
+                buffer = self._buffer = self._free.get_nowait()
+            except queue.Empty:
+                self.dropped += 1
+                return
+        buffer[self._count] = (tick, timestamp - self._started, breath, effort, motion, boat_x, boat_y,
+                               velocity_x, velocity_y, coins, phase, events)
+        self._count += 1
+        self.records += 1
+        if self._count == self.chunk_records:
+            self._submit()
+
+    def _submit(self):
+        self._queue.put((self._buffer, self._count))
+        self._count = 0
+        try:
+            self._buffer = self._free.get_nowait()
+        except queue.Empty:
+            self._buffer = None
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            buffer, count = item
+            start = time.perf_counter()
+            try:
+                for name, f in self._files.items():
+                    # Cada campo num arquivo próprio: leitura por coluna sem varrer o resto
+                    f.write(buffer[name][:count].tobytes())
+                    f.flush()
+                self.written += count
+                self.chunks += 1
+            except OSError as e:
+                print(f"Erro ao gravar telemetria em {self.path}: {e}")
+            self.write_time += time.perf_counter() - start
+            self._free.put(buffer)
+
+    def _write_meta(self):
+        meta = {
+            'fields': [[name, RECORD_DTYPE[name].str] for name in RECORD_DTYPE.names],
+            'event_flags': EVENT_FLAGS,
+            'records': self.written,
+            'dropped': self.dropped,
+            'metadata': self.metadata,
+        }
+        tmp_path = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=4)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+    def close(self):
+        """Grava o buffer parcial, espera a thread e atualiza meta.json"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._buffer is not None and self._count:
+            self._submit()
+        self._queue.put(None)
+        self._writer.join(10.0)
+        for f in self._files.values():
+            f.close()
+        self._write_meta()
+
+    def stats(self):
+        return {
+            'records': self.records,
+            'written': self.written,
+            'dropped': self.dropped,
+            'chunks': self.chunks,
+            'write_time': self.write_time,
+        }
+
+
+def load_session(path, mode='r'):
+    """(colunas, meta) de uma sessão: dict campo -> np.memmap, todos com o mesmo tamanho"""
+    with open(os.path.join(path, META_FILE), "r") as f:
+        meta = json.load(f)
+    fields = [(name, np.dtype(dtype)) for name, dtype in meta['fields']]
+    # Sessão interrompida: usa o menor arquivo (só registros completos em todas as colunas)
+    count = min(os.path.getsize(os.path.join(path, f"{name}.bin")) // dtype.itemsize for name, dtype in fields)
+    columns = {}
+    for name, dtype in fields:
+        if count:
+            columns[name] = np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode=mode, shape=(count,))
+        else:
+            columns[name] = np.zeros(0, dtype=dtype)
+    return columns, meta
+
+
+def session_dir(base_dir, profile_name):
+    """Diretório novo para uma sessão: base_dir/<perfil>_<data-hora>"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(base_dir, f"{profile_name}_{stamp}")
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(base_dir, f"{profile_name}_{stamp}_{suffix}")
+    return path
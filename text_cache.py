@@ -0,0 +1,91 @@
+# text_cache.py
+# Fontes compartilhadas e cache de textos renderizados.
+# Criar pygame.font.Font e chamar font.render a cada frame aloca superfícies novas;
+# como a maioria dos textos das cenas raramente muda, reaproveitamos as superfícies.
+from collections import OrderedDict
+
+import pygame
+
+import settings
+
+
+class FontRegistry:
+    """Uma instância de pygame.font.Font por (caminho, tamanho), criada na primeira vez"""
+
+    def __init__(self):
+        self._fonts = {}
+
+    def get(self, size, path=None):
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self._fonts[key] = font
+        return font
+
+    def __len__(self):
+        return len(self._fonts)
+
+
+class TextCache:
+    """Cache LRU de superfícies de texto, por (fonte, texto, cor, antialias, fundo).
+
+    As superfícies retornadas são compartilhadas: quem usa não deve desenhar nelas.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Mesma assinatura de font.render"""
+        key = (font, text, color, antialias, background)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        memory = sum(surface.get_bytesize() * surface.get_width() * surface.get_height()
+                     for surface in self._surfaces.values())
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'bytes': memory,
+        }
+
+
+font_registry = FontRegistry()
+text_cache = TextCache()
+
+
+def get_font(size=settings.DEFAULT_FONT_SIZE, path=settings.FONT_PATH):
+    """Fonte compartilhada para (caminho, tamanho)"""
+    return font_registry.get(size, path)
+
+
+def render_text(font, text, antialias, color, background=None):
+    """Renderiza um texto usando o cache global (mesmos argumentos de font.render)"""
+    return text_cache.render(font, text, antialias, color, background)
@@ -0,0 +1,43 @@
+# viewport.py
+# Câmera 2D com rolagem horizontal: converte coordenadas do mundo para a tela
+# e diz o que está visível, para as cenas não desenharem o que está fora dela.
+
+
+class Viewport:
+    """Janela de width x height sobre o mundo, que segue um alvo na horizontal"""
+
+    def __init__(self, width, height, world_width=None, anchor_x=100):
+        self.width = width
+        self.height = height
+        self.world_width = world_width  # None = mundo sem fim à direita
+        self.anchor_x = anchor_x  # Posição na tela onde o alvo fica enquanto a câmera rola
+        self.x = 0.0
+
+    def follow(self, target_x):
+        """Posiciona a câmera para manter target_x em anchor_x, sem sair do mundo"""
+        x = target_x - self.anchor_x
+        if self.world_width is not None:
+            x = min(x, self.world_width - self.width)
+        self.x = max(0.0, x)
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    def to_screen(self, x, y):
+        return (x - self.x, y)
+
+    def to_screen_x(self, x):
+        return x - self.x
+
+    def visible_range(self, margin=0):
+        """Intervalo horizontal do mundo visível, com margem para objetos com largura"""
+        return (self.x - margin, self.x + self.width + margin)
+
+    def is_visible(self, x, half_width=0):
+        """Um objeto centrado em x com essa meia largura aparece na tela?"""
+        return self.x - half_width <= x <= self.x + self.width + half_width